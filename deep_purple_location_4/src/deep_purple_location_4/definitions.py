@@ -1,17 +1,18 @@
 """
 Dagster definitions for code location 4.
-Contains approximately 1/5 of all assets (hash-based distribution) and sensors 30-39.
+Contains approximately 1/5 of all assets (hash-based distribution) and its share of the
+automation condition sensors (30-39 by default).
 """
 
 import dagster as dg
 
-from deep_purple_location_4.defs.assets import location_4_assets
-from deep_purple_location_4.defs.sensors import location_4_sensors
+from deep_purple_location_4.defs.assets import get_location_4_assets
+from deep_purple_location_4.defs.sensors import get_location_4_sensors
 
 
 @dg.definitions
 def defs():
     return dg.Definitions(
-        assets=location_4_assets,
-        sensors=location_4_sensors,
+        assets=get_location_4_assets(),
+        sensors=get_location_4_sensors(),
     )
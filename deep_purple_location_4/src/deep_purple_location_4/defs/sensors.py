@@ -1,29 +1,46 @@
 """
 Sensor definitions for code location 4.
-This location manages sensors 30-39 (10 sensors total).
+The sensor indexes this location manages come from its plan (``PERF_CONFIG.sensor_layout``; sensors
+30-39 with the default 50 sensors over 5 locations).
+
+Each sensor targets the explicit asset keys of its shard in this location's plan, so resolving
+its target doesn't scan the tags of every asset. Sensors are built on the first call to
+``get_location_4_sensors`` (from ``definitions.defs``), not at import time.
 """
 
-from dagster import AssetSelection, AutomationConditionSensorDefinition
+from functools import cache
 
-from deep_purple_shared.utils.performance_config import PERF_CONFIG
+from dagster import AutomationConditionSensorDefinition
 
-# This location handles sensors 30-39
-SENSOR_START_INDEX = 30
-SENSOR_END_INDEX = 39
+from deep_purple_location_4.defs.assets import CURRENT_LOCATION
+from deep_purple_shared.defs.sensors import (
+    generate_sensors_for_deep_purple_trigger_evaluation,
+    sensor_asset_keys,
+)
+from deep_purple_shared.utils.asset_planner import load_location_plan
 
 
-def generate_location_sensors():
+def generate_location_sensors() -> list[AutomationConditionSensorDefinition]:
     """Generate automation condition sensors for this location's assets."""
-    _sensors = []
-    for i in range(SENSOR_START_INDEX, SENSOR_END_INDEX + 1):
-        _sensor = AutomationConditionSensorDefinition(
-            f"deep_purple_eval_automation_sensor_{i}",
-            target=AssetSelection.tag("evaluation_trigger_sensor_index", str(i)),
-            default_status=PERF_CONFIG.sensor_default_status,
-        )
-        _sensors.append(_sensor)
+    plan = load_location_plan(CURRENT_LOCATION)
+    sensor_keys = sensor_asset_keys(
+        (*plan.source_assets, *plan.managed_assets), plan.sensor_indexes
+    )
+    return generate_sensors_for_deep_purple_trigger_evaluation(sensor_keys, plan.sensor_indexes)
+
+
+@cache
+def get_location_4_sensors() -> list[AutomationConditionSensorDefinition]:
+    """
+    Build this location's sensors once; later calls return the same sensors.
 
-    return _sensors
+    :return: Automation condition sensors for this location's sensor indexes.
+    """
+    return generate_location_sensors()
 
 
-location_4_sensors = generate_location_sensors()
+def __getattr__(name: str):
+    # ``location_4_sensors`` used to be built at import time; keep it available, built on access
+    if name == "location_4_sensors":
+        return get_location_4_sensors()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
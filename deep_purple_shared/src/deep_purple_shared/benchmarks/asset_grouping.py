@@ -0,0 +1,149 @@
+"""
+Effect of multi-asset grouping on a code location and its runs.
+
+For each ``DEEP_PURPLE_ASSET_GROUPING`` value, a fresh interpreter builds one location's assets and
+reports the op count, the asset and definitions build time, and the size and serialization time
+of the repository snapshot. It then launches ``--runs`` runs on an ephemeral instance. Each run
+materializes one partition of ``--run-assets`` assets that share a queue and a partitions
+definition. The run's wall time is split into execution, taken from the run stats, and launch
+overhead: job construction, execution plan and run bookkeeping.
+
+Usage::
+
+    python -m deep_purple_shared.benchmarks.asset_grouping --location 1 --run-assets 100
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+GROUPINGS = ("none", "multi_asset")
+# Keep the per-event debug output of every run off the console
+_RUN_CONFIG = {"loggers": {"console": {"config": {"log_level": "WARNING"}}}}
+
+
+def _measure(location: int, run_assets: int, runs: int) -> dict:
+    import dagster as dg
+    from dagster._core.remote_representation.external_data import RepositorySnap
+    from dagster._serdes import serialize_value
+
+    from deep_purple_shared.defs.assets import generate_location_assets
+    from deep_purple_shared.utils.constants import QUEUE_BINDING_TAG
+    from deep_purple_shared.utils.performance_config import PERF_CONFIG
+
+    started = time.perf_counter()
+    assets = generate_location_assets(location, PERF_CONFIG.start_date, PERF_CONFIG.end_date)
+    assets_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    repository = dg.Definitions(assets=assets).get_repository_def()
+    definitions_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    snapshot = serialize_value(RepositorySnap.from_def(repository))
+    snapshot_seconds = time.perf_counter() - started
+
+    # The largest set of managed assets sharing a queue and a partitions definition
+    candidates: dict[tuple, list] = {}
+    for assets_def in assets:
+        for key in assets_def.keys:
+            queue = assets_def.specs_by_key[key].tags.get(QUEUE_BINDING_TAG)
+            if queue and assets_def.partitions_def.get_num_partitions():
+                candidates.setdefault((queue, id(assets_def.partitions_def)), []).append(
+                    (key, assets_def.partitions_def)
+                )
+    selected = max(candidates.values(), key=len)[:run_assets]
+    partition_key = selected[0][1].get_last_partition_key()
+    selection = [key for key, _ in selected]
+
+    totals, executions, steps = [], [], 0
+    with dg.DagsterInstance.ephemeral() as instance:
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = dg.materialize(
+                assets,
+                selection=selection,
+                partition_key=partition_key,
+                instance=instance,
+                run_config=_RUN_CONFIG,
+            )
+            totals.append(time.perf_counter() - started)
+            stats = instance.get_run_stats(result.run_id)
+            executions.append(stats.end_time - stats.start_time)
+            steps = len(result.get_step_success_events())
+
+    return {
+        "grouping": PERF_CONFIG.asset_grouping.value,
+        "ops": len(assets),
+        "assets": sum(len(assets_def.keys) for assets_def in assets),
+        "assets_seconds": round(assets_seconds, 3),
+        "definitions_seconds": round(definitions_seconds, 3),
+        "snapshot_seconds": round(snapshot_seconds, 3),
+        "repository_snapshot_bytes": len(snapshot),
+        "run_assets": len(selection),
+        "run_steps": steps,
+        "run_seconds": round(statistics.median(totals), 3),
+        "run_execution_seconds": round(statistics.median(executions), 3),
+        "run_launch_overhead_seconds": round(
+            statistics.median(total - execution for total, execution in zip(totals, executions)), 3
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Effect of multi-asset grouping.")
+    parser.add_argument("--groupings", nargs="+", default=list(GROUPINGS))
+    parser.add_argument("--location", type=int, default=1)
+    parser.add_argument("--run-assets", type=int, default=100, help="Assets materialized per run")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(_measure(args.location, args.run_assets, args.runs)))
+        return
+
+    results = []
+    for grouping in args.groupings:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-W",
+                "ignore",
+                "-m",
+                __spec__.name,
+                "--measure",
+                "--location",
+                str(args.location),
+                "--run-assets",
+                str(args.run_assets),
+                "--runs",
+                str(args.runs),
+            ],
+            env={**os.environ, "DEEP_PURPLE_ASSET_GROUPING": grouping},
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(
+            f"{r['grouping']:>12}: {r['ops']} ops for {r['assets']} assets, "
+            f"assets {r['assets_seconds']:.2f}s, definitions {r['definitions_seconds']:.2f}s, "
+            f"snapshot {r['repository_snapshot_bytes'] / 2**20:.1f} MiB in {r['snapshot_seconds']:.2f}s; "
+            f"run of {r['run_assets']} assets in {r['run_steps']} steps: {r['run_seconds']:.2f}s "
+            f"({r['run_execution_seconds']:.2f}s executing, {r['run_launch_overhead_seconds']:.2f}s overhead)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Offline automation condition evaluation harness.
+
+Measures what a location's automation condition sensors cost per tick without a deployed daemon.
+Every case builds one location the way ``deep_purple_location_N.definitions`` does, in a fresh
+interpreter with the case's ``DEEP_PURPLE_*`` environment, on an ephemeral instance:
+
+- the oldest ``--seed-share`` of the partitions of the driven sensors' assets and their parents is
+  reported as materialized, so conditions see a mostly caught-up history with recent partitions
+  missing. Parents owned by other locations are unpartitioned stubs in a single location's graph
+  and are materialized once
+- each sensor is driven through ``--ticks`` ticks ``--tick-seconds`` apart, carrying its cursor
+  from tick to tick like the daemon does. The first tick only initializes the conditions' cursors;
+  before every later tick, the next ``--arrivals`` missing partitions of each upstream source land.
+  With ``--complete-requested``, requested partitions are also reported as materialized before the
+  next tick, as if their runs had succeeded
+- per sensor and tick, it records the evaluation latency, the requested asset partitions, the run
+  and backfill requests the daemon would submit, and memory (peak RSS, or the tick's tracemalloc
+  peak with ``--trace-memory``)
+
+Cases sweep the sensor sharding, the assets per sensor and ``n_days``; compare condition variants
+by running it under different environments. Results are written as JSON::
+
+    python -m deep_purple_shared.benchmarks.automation_eval --location 1 --sensors 2 --ticks 3
+    python -m deep_purple_shared.benchmarks.automation_eval --shardings round_robin cost \\
+        --assets-per-sensor 100 300
+"""
+
+import argparse
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+
+CASE_ENV = {
+    "sensor_sharding": "DEEP_PURPLE_SENSOR_SHARDING",
+    "assets_per_sensor": "DEEP_PURPLE_ASSETS_PER_SENSOR",
+    "n_days": "DEEP_PURPLE_N_DAYS",
+}
+
+
+def _partition_keys(asset_graph, key) -> list:
+    partitions_def = asset_graph.get(key).partitions_def
+    # Deps owned by other locations are unpartitioned stubs in a single location's graph
+    return partitions_def.get_partition_keys() if partitions_def is not None else [None]
+
+
+def seed_materializations(instance, asset_graph, asset_keys: set, share: float) -> dict:
+    """
+    Report materializations for the oldest ``share`` of each asset's partitions.
+
+    :param instance: The ``DagsterInstance``.
+    :param asset_graph: Asset graph of the location.
+    :param asset_keys: Keys of the assets to seed.
+    :param share: Fraction of every asset's partitions to mark as materialized; unpartitioned
+        assets are always materialized once.
+    :return: Mapping of asset key to its partition keys that are still missing, oldest first.
+    """
+    import dagster as dg
+
+    missing = {}
+    for key in asset_keys:
+        partition_keys = _partition_keys(asset_graph, key)
+        seeded = len(partition_keys) if partition_keys == [None] else int(len(partition_keys) * share)
+        for partition_key in partition_keys[:seeded]:
+            instance.report_runless_asset_event(
+                dg.AssetMaterialization(asset_key=key, partition=partition_key)
+            )
+        missing[key] = partition_keys[seeded:]
+    return missing
+
+
+def arrive_partitions(instance, missing: dict, asset_keys: set, count: int) -> int:
+    """
+    Report the next ``count`` missing partitions of each asset as materialized, like new data
+    landing upstream between ticks.
+
+    :param instance: The ``DagsterInstance``.
+    :param missing: Missing partition keys per asset, from ``seed_materializations``; consumed.
+    :param asset_keys: Keys of the assets receiving data.
+    :param count: Partitions per asset.
+    :return: Number of materializations reported.
+    """
+    import dagster as dg
+
+    arrived = 0
+    for key in asset_keys:
+        partition_keys, missing[key] = missing[key][:count], missing[key][count:]
+        for partition_key in partition_keys:
+            instance.report_runless_asset_event(
+                dg.AssetMaterialization(asset_key=key, partition=partition_key)
+            )
+        arrived += len(partition_keys)
+    return arrived
+
+
+def simulate_ticks(
+    definitions,
+    instance,
+    sensors: list,
+    ticks: int,
+    tick_seconds: int,
+    start_time,
+    arrivals: Callable[[], int] | None = None,
+    complete_requested: bool = False,
+    trace_memory: bool = False,
+) -> list[dict]:
+    """
+    Evaluate every sensor's automation conditions over consecutive ticks.
+
+    :param definitions: ``dg.Definitions`` holding the assets and sensors.
+    :param instance: The ``DagsterInstance`` to evaluate against.
+    :param sensors: ``AutomationConditionSensorDefinition`` shards to drive.
+    :param ticks: Number of ticks.
+    :param tick_seconds: Simulated time between ticks.
+    :param start_time: Evaluation time of the first tick.
+    :param arrivals: Called before every tick but the first to land new upstream data.
+    :param complete_requested: Report requested partitions as materialized after each tick.
+    :param trace_memory: Record each tick's tracemalloc peak instead of the process peak RSS.
+    :return: One record per sensor and tick.
+    """
+    import dagster as dg
+    from dagster._core.definitions.automation_tick_evaluation_context import build_run_requests
+    from dagster._core.definitions.partitions.context import partition_loading_context
+
+    asset_graph = definitions.resolve_asset_graph()
+    cursors = {}
+    records = []
+    for tick in range(ticks):
+        evaluation_time = start_time + timedelta(seconds=tick * tick_seconds)
+        if tick and arrivals is not None:
+            arrivals()
+        for sensor in sensors:
+            if trace_memory:
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            result = dg.evaluate_automation_conditions(
+                definitions,
+                instance,
+                asset_selection=sensor.asset_selection,
+                evaluation_time=evaluation_time,
+                cursor=cursors.get(sensor.name),
+            )
+            requested = [r.true_subset for r in result.results if not r.true_subset.is_empty]
+            with partition_loading_context(
+                effective_dt=evaluation_time, dynamic_partitions_store=instance
+            ):
+                run_requests = build_run_requests(
+                    requested, asset_graph, sensor.run_tags, sensor.emit_backfills
+                )
+                requested_partitions = sum(subset.size for subset in requested)
+            seconds = time.perf_counter() - started
+            peak_mb = (
+                tracemalloc.get_traced_memory()[1] / 2**20
+                if trace_memory
+                # ru_maxrss is in KiB on Linux
+                else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            )
+            cursors[sensor.name] = result.cursor
+
+            backfills = sum(1 for request in run_requests if request.requires_backfill_daemon())
+            records.append(
+                {
+                    "tick": tick,
+                    "sensor": sensor.name,
+                    "seconds": round(seconds, 4),
+                    "requested_assets": len(requested),
+                    "requested_partitions": requested_partitions,
+                    "runs": len(run_requests) - backfills,
+                    "backfills": backfills,
+                    "peak_mb": round(peak_mb, 1),
+                }
+            )
+
+            if complete_requested:
+                for subset in requested:
+                    for asset_partition in subset.expensively_compute_asset_partitions():
+                        instance.report_runless_asset_event(
+                            dg.AssetMaterialization(
+                                asset_key=asset_partition.asset_key,
+                                partition=asset_partition.partition_key,
+                            )
+                        )
+    return records
+
+
+def _measure(
+    location: int,
+    num_sensors: int | None,
+    ticks: int,
+    tick_seconds: int,
+    seed_share: float,
+    arrivals: int,
+    complete_requested: bool,
+    trace_memory: bool,
+) -> dict:
+    import dagster as dg
+
+    from deep_purple_shared.defs.assets import build_location_assets
+    from deep_purple_shared.defs.sensors import (
+        generate_sensors_for_deep_purple_trigger_evaluation,
+        sensor_asset_keys,
+    )
+    from deep_purple_shared.utils.asset_planner import load_location_plan
+    from deep_purple_shared.utils.performance_config import PERF_CONFIG
+
+    started = time.perf_counter()
+    plan = load_location_plan(location)
+    assets = build_location_assets(plan, PERF_CONFIG.start_date, PERF_CONFIG.end_date)
+    sensor_keys = sensor_asset_keys((*plan.source_assets, *plan.managed_assets), plan.sensor_indexes)
+    sensors = generate_sensors_for_deep_purple_trigger_evaluation(sensor_keys, plan.sensor_indexes)
+    definitions = dg.Definitions(assets=assets, sensors=sensors)
+    definitions.get_repository_def()
+    load_seconds = time.perf_counter() - started
+
+    # Only the driven shards are seeded, so a subset of sensors is quick to measure
+    sensors = sensors[:num_sensors]
+    driven_keys = {key for index in plan.sensor_indexes[: len(sensors)] for key in sensor_keys[index]}
+    asset_graph = definitions.resolve_asset_graph()
+    seed_keys = driven_keys.union(
+        *(asset_graph.get(key).parent_keys for key in driven_keys)
+    )
+    # Upstream data lands in the partitioned assets no automation condition requests
+    source_keys = {
+        key
+        for key in seed_keys
+        if asset_graph.get(key).automation_condition is None
+        and asset_graph.get(key).partitions_def is not None
+    }
+    condition = next(
+        spec.automation_condition.get_label()
+        for assets_def in assets
+        for spec in assets_def.specs
+        if spec.automation_condition is not None
+    )
+
+    if trace_memory:
+        tracemalloc.start()
+    with dg.DagsterInstance.ephemeral() as instance:
+        started = time.perf_counter()
+        missing = seed_materializations(instance, asset_graph, seed_keys, seed_share)
+        seed_seconds = time.perf_counter() - started
+        arrived = []
+        records = simulate_ticks(
+            definitions,
+            instance,
+            sensors,
+            ticks,
+            tick_seconds,
+            PERF_CONFIG.end_date,
+            lambda: arrived.append(arrive_partitions(instance, missing, source_keys, arrivals)),
+            complete_requested,
+            trace_memory,
+        )
+    if trace_memory:
+        tracemalloc.stop()
+
+    return {
+        "location": location,
+        "condition": condition,
+        "sensors": len(sensors),
+        "assets": len(driven_keys),
+        "load_seconds": round(load_seconds, 3),
+        "seeded_assets": len(seed_keys),
+        "seed_seconds": round(seed_seconds, 3),
+        "source_assets": len(source_keys),
+        "arrived_materializations": arrived,
+        "memory": "tracemalloc" if trace_memory else "rss",
+        "records": records,
+    }
+
+
+def summarize_ticks(records: list[dict]) -> list[dict]:
+    """
+    :param records: Per sensor and tick records from ``simulate_ticks``.
+    :return: Per tick totals: latency summed and worst over sensors, requests and peak memory.
+    """
+    summary = []
+    for tick, tick_records in itertools.groupby(records, key=lambda record: record["tick"]):
+        tick_records = list(tick_records)
+        seconds = [record["seconds"] for record in tick_records]
+        summary.append(
+            {
+                "tick": tick,
+                "seconds": round(sum(seconds), 3),
+                "median_sensor_seconds": round(statistics.median(seconds), 4),
+                "max_sensor_seconds": round(max(seconds), 4),
+                "requested_partitions": sum(r["requested_partitions"] for r in tick_records),
+                "runs": sum(r["runs"] for r in tick_records),
+                "backfills": sum(r["backfills"] for r in tick_records),
+                "peak_mb": max(r["peak_mb"] for r in tick_records),
+            }
+        )
+    return summary
+
+
+def _run_case(case: dict, args: argparse.Namespace) -> dict:
+    env = {**os.environ, **{CASE_ENV[key]: str(value) for key, value in case.items()}}
+    command = [
+        sys.executable,
+        "-W",
+        "ignore",
+        "-m",
+        __spec__.name,
+        "--measure",
+        "--location",
+        str(args.location),
+        "--ticks",
+        str(args.ticks),
+        "--tick-seconds",
+        str(args.tick_seconds),
+        "--seed-share",
+        str(args.seed_share),
+        "--arrivals",
+        str(args.arrivals),
+    ]
+    if args.sensors is not None:
+        command += ["--sensors", str(args.sensors)]
+    if args.complete_requested:
+        command.append("--complete-requested")
+    if args.trace_memory:
+        command.append("--trace-memory")
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return {"case": case, **json.loads(output.strip().splitlines()[-1])}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline automation condition evaluation.")
+    parser.add_argument("--location", type=int, default=1)
+    parser.add_argument("--sensors", type=int, default=None, help="Drive only the first N sensors")
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--tick-seconds", type=int, default=30, help="Simulated time between ticks")
+    parser.add_argument(
+        "--seed-share", type=float, default=0.9, help="Share of partitions materialized up front"
+    )
+    parser.add_argument(
+        "--arrivals", type=int, default=1, help="Source partitions landing before each later tick"
+    )
+    parser.add_argument(
+        "--complete-requested",
+        action="store_true",
+        help="Materialize requested partitions before the next tick",
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="Per-tick tracemalloc peak (slows evaluation)"
+    )
+    parser.add_argument("--shardings", nargs="+", default=[None], help="DEEP_PURPLE_SENSOR_SHARDING values")
+    parser.add_argument(
+        "--assets-per-sensor", type=int, nargs="+", default=[None], help="DEEP_PURPLE_ASSETS_PER_SENSOR values"
+    )
+    parser.add_argument("--n-days", type=int, nargs="+", default=[1])
+    parser.add_argument("--output", type=Path, default=Path("automation_eval.json"))
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        result = _measure(
+            args.location,
+            args.sensors,
+            args.ticks,
+            args.tick_seconds,
+            args.seed_share,
+            args.arrivals,
+            args.complete_requested,
+            args.trace_memory,
+        )
+        print(json.dumps(result))
+        return
+
+    results = []
+    for sharding, assets_per_sensor, n_days in itertools.product(
+        args.shardings, args.assets_per_sensor, args.n_days
+    ):
+        case = {"n_days": n_days}
+        if sharding is not None:
+            case["sensor_sharding"] = sharding
+        if assets_per_sensor is not None:
+            case["assets_per_sensor"] = assets_per_sensor
+        result = _run_case(case, args)
+        result["ticks"] = summarize_ticks(result["records"])
+        results.append(result)
+
+        print(
+            f"{json.dumps(case)}: {result['condition']}, {result['sensors']} sensors over "
+            f"{result['assets']} assets ({result['seeded_assets']} seeded in "
+            f"{result['seed_seconds']:.1f}s, {result['source_assets']} receiving data)"
+        )
+        for tick in result["ticks"]:
+            print(
+                f"  tick {tick['tick']}: {tick['seconds']:.2f}s (median sensor "
+                f"{tick['median_sensor_seconds']:.3f}s, max {tick['max_sensor_seconds']:.3f}s), "
+                f"{tick['requested_partitions']:,} partitions in {tick['runs']} runs and "
+                f"{tick['backfills']} backfills, peak {tick['peak_mb']} MB ({result['memory']})"
+            )
+
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
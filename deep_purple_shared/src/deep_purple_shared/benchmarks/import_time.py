@@ -0,0 +1,82 @@
+"""
+Import time of the configuration, sensor and definitions modules.
+
+Each module is imported ``--repeat`` times, every time in a fresh interpreter, and the median wall
+time is reported together with whether pandas ended up imported. The definitions modules of the
+code locations are included when their packages are importable.
+
+Usage::
+
+    python -m deep_purple_shared.benchmarks.import_time --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = (
+    "deep_purple_shared.utils.performance_config",
+    "deep_purple_shared.defs.sensors",
+    "deep_purple_shared.defs.assets",
+    *(f"deep_purple_location_{n}.definitions" for n in range(1, 6)),
+)
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - started, "pandas": "pandas" in sys.modules}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> dict | None:
+    """
+    :param module: Dotted module name.
+    :param repeat: Number of fresh interpreters to import it in.
+    :return: Median import time and whether pandas was imported, or None if the module isn't importable.
+    """
+    # Children see the same packages as this interpreter, including ones found through sys.path only
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, sys.path))}
+    samples = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", _PROBE.format(module=module)],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode:
+            if "ModuleNotFoundError" in completed.stderr:
+                return None
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {
+        "module": module,
+        "median_seconds": round(statistics.median(s["seconds"] for s in samples), 3),
+        "pandas_imported": samples[-1]["pandas"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import time of the project's modules.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=list(MODULES))
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    results = [r for r in (measure_import(m, args.repeat) for m in args.modules) if r is not None]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(
+            f"{r['module']:<48} {r['median_seconds']:>7.3f}s"
+            f"  pandas {'imported' if r['pandas_imported'] else 'not imported'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
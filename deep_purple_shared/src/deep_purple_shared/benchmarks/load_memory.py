@@ -0,0 +1,120 @@
+"""
+``tracemalloc`` report of peak memory while building a location's assets.
+
+Each mode runs in a fresh interpreter so imports and caches don't leak between measurements:
+
+- ``batch``: plan the whole DAG, then build every asset from the location's plan
+- ``streaming``: plan and build in chunks of DAG rows (``DEEP_PURPLE_STREAMING_CHUNK_SIZE``)
+
+Usage::
+
+    python -m deep_purple_shared.benchmarks.load_memory --location 1 --chunk-size 1000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+MODES = ("batch", "streaming")
+
+
+def _measure(location: int, mode: str, chunk_size: int, top: int) -> dict:
+    # Imports are measured separately from the build
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    from deep_purple_shared.defs.assets import build_location_assets, iter_location_assets
+    from deep_purple_shared.utils.asset_planner import load_location_plan
+    from deep_purple_shared.utils.performance_config import PERF_CONFIG
+
+    imports, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    start_date, end_date = PERF_CONFIG.start_date, PERF_CONFIG.end_date
+    if mode == "batch":
+        with tempfile.TemporaryDirectory() as cache_dir:
+            plan = load_location_plan(location, cache_dir=Path(cache_dir))
+        assets = build_location_assets(plan, start_date, end_date)
+        del plan
+    else:
+        assets = [
+            asset
+            for chunk in iter_location_assets(location, start_date, end_date, chunk_size)
+            for asset in chunk
+        ]
+
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    top_stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+    tracemalloc.stop()
+    return {
+        "mode": mode,
+        "location": location,
+        "assets": len(assets),
+        "seconds": round(elapsed, 3),
+        "imports_mb": round(imports / 2**20, 2),
+        "current_mb": round(current / 2**20, 2),
+        "peak_mb": round(peak / 2**20, 2),
+        "transient_mb": round((peak - current) / 2**20, 2),
+        "top_allocations": [str(stat) for stat in top_stats],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Peak memory of building a location's assets.")
+    parser.add_argument("--location", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--top", type=int, default=5, help="Top allocation sites to show")
+    parser.add_argument("--mode", choices=MODES, default=None, help="Measure a single mode in-process")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_measure(args.location, args.mode, args.chunk_size, args.top)))
+        return
+
+    results = []
+    for mode in MODES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-W",
+                "ignore",
+                "-m",
+                __spec__.name,
+                "--location",
+                str(args.location),
+                "--chunk-size",
+                str(args.chunk_size),
+                "--top",
+                str(args.top),
+                "--mode",
+                mode,
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        print(
+            f"{result['mode']:>9}: {result['assets']} assets in {result['seconds']}s, "
+            f"peak {result['peak_mb']} MiB (imports {result['imports_mb']} MiB, "
+            f"transient {result['transient_mb']} MiB), retained {result['current_mb']} MiB"
+        )
+        for stat in result["top_allocations"]:
+            print(f"           {stat}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Code location load benchmark across a configuration matrix.
+
+Every case builds one location in a fresh interpreter with the case's ``DEEP_PURPLE_*``
+environment, running the steps behind ``deep_purple_location_N.definitions`` one at a time so each
+phase can be timed:
+
+- ``imports``: dagster and the shared package
+- ``dag_read``: reading the DAG (memory-mapped snapshot, or CSV parse and grouping when no snapshot exists)
+- ``plan``: splitting the DAG into per-location plans, with the configured partition budget and sensor sharding
+- ``assets``: building the location's asset definitions
+- ``definitions``: building ``dg.Definitions`` and resolving its repository
+- ``snapshot``: serializing the repository snapshot the code server sends to the webserver
+
+It also reports peak RSS, the asset and op counts and the serialized repository snapshot size.
+
+Unlike a deployed location, a case always plans from scratch and builds in one batch:
+
+- the plan cache is bypassed, so ``plan`` is the cold-cache cost (a warm location reads one
+  cached plan instead)
+- ``DEEP_PURPLE_STREAMING_CHUNK_SIZE`` is ignored; ``load_memory`` compares streaming against batch
+- the location packages' ``defs()`` entry points and their modules are not imported; ``import_time``
+  covers those imports
+
+Cases sweep the partition mode, ``n_days``, the number of locations, the asset grouping, the
+partition budget of ``tps_budgeted`` cases and, with ``--dag-paths``, DAG files such as the
+synthetic ones from ``deep_purple_shared.utils.dag_generator``.
+Results are written as JSON; pass ``--baseline`` with an earlier results file to flag regressions::
+
+    python -m deep_purple_shared.benchmarks.load_suite --output load_benchmark.json
+    python -m deep_purple_shared.benchmarks.load_suite --baseline load_benchmark.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PHASES = ("imports", "dag_read", "plan", "assets", "definitions", "snapshot")
+CASE_ENV = {
+    "partition_mode": "DEEP_PURPLE_PARTITION_MODE",
+    "n_days": "DEEP_PURPLE_N_DAYS",
+    "num_locations": "DEEP_PURPLE_NUM_LOCATIONS",
+    "dag_path": "DEEP_PURPLE_DAG_PATH",
+    "asset_grouping": "DEEP_PURPLE_ASSET_GROUPING",
+    "partition_budget": "DEEP_PURPLE_PARTITION_BUDGET",
+}
+
+
+def _measure(location: int) -> dict:
+    timings = {}
+    started = time.perf_counter()
+
+    import dagster as dg
+    from dagster._core.remote_representation.external_data import RepositorySnap
+    from dagster._serdes import serialize_value
+
+    from deep_purple_shared.defs.assets import build_location_assets
+    from deep_purple_shared.defs.sensors import (
+        generate_sensors_for_deep_purple_trigger_evaluation,
+        sensor_asset_keys,
+    )
+    from deep_purple_shared.utils.asset_planner import plan_configured_locations
+    from deep_purple_shared.utils.dag_snapshot import load_dag, snapshot_path_for
+    from deep_purple_shared.utils.performance_config import PERF_CONFIG
+
+    def lap(phase: str) -> None:
+        nonlocal started
+        now = time.perf_counter()
+        timings[phase] = round(now - started, 4)
+        started = now
+
+    lap("imports")
+
+    dag_path = PERF_CONFIG.dag_path
+    dag = load_dag(dag_path)
+    dag_source = "snapshot" if snapshot_path_for(dag_path).exists() else "csv"
+    lap("dag_read")
+
+    plans = plan_configured_locations(dag, dag_path)
+    plan = plans[location]
+    del plans
+    lap("plan")
+
+    assets = build_location_assets(plan, PERF_CONFIG.start_date, PERF_CONFIG.end_date)
+    lap("assets")
+
+    sensors = generate_sensors_for_deep_purple_trigger_evaluation(
+        sensor_asset_keys((*plan.source_assets, *plan.managed_assets), plan.sensor_indexes),
+        plan.sensor_indexes,
+    )
+    repository = dg.Definitions(assets=assets, sensors=sensors).get_repository_def()
+    lap("definitions")
+
+    snapshot = serialize_value(RepositorySnap.from_def(repository))
+    lap("snapshot")
+
+    return {
+        "location": location,
+        "dag_source": dag_source,
+        "assets": sum(len(assets_def.keys) for assets_def in assets),
+        "ops": len(assets),
+        "phases": timings,
+        "total_seconds": round(sum(timings.values()), 4),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "repository_snapshot_bytes": len(snapshot),
+    }
+
+
+def _run_case(case: dict, location: int) -> dict:
+    env = {**os.environ, **{CASE_ENV[key]: str(value) for key, value in case.items()}}
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-m", __spec__.name, "--measure", str(location)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return {"case": case, **json.loads(output.strip().splitlines()[-1])}
+
+
+def _case_key(result: dict) -> str:
+    return json.dumps({**result["case"], "location": result["location"]}, sort_keys=True)
+
+
+def compare_to_baseline(
+    results: list[dict], baseline: list[dict], tolerance: float, min_seconds: float
+) -> list[str]:
+    """
+    Flag metrics that got worse than the baseline by more than ``tolerance``.
+
+    :param results: Current case results.
+    :param baseline: Case results of an earlier run.
+    :param tolerance: Allowed relative increase (0.2 = 20%).
+    :param min_seconds: Timing increases below this many seconds are treated as noise.
+    :return: One message per regression.
+    """
+    baseline_by_key = {_case_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = baseline_by_key.get(_case_key(result))
+        if before is None:
+            continue
+        metrics = [
+            (f"phases.{phase}", result["phases"][phase], before["phases"].get(phase), True)
+            for phase in PHASES
+        ]
+        metrics += [
+            ("total_seconds", result["total_seconds"], before.get("total_seconds"), True),
+            ("peak_rss_mb", result["peak_rss_mb"], before.get("peak_rss_mb"), False),
+            (
+                "repository_snapshot_bytes",
+                result["repository_snapshot_bytes"],
+                before.get("repository_snapshot_bytes"),
+                False,
+            ),
+        ]
+        for metric, value, previous, is_timing in metrics:
+            if not previous or value <= previous * (1 + tolerance):
+                continue
+            if is_timing and value - previous < min_seconds:
+                continue
+            regressions.append(
+                f"{_case_key(result)} {metric}: {previous} -> {value} (+{value / previous - 1:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark code location loading.")
+    parser.add_argument("--partition-modes", nargs="+", default=["daily", "tps_actual"])
+    parser.add_argument("--n-days", type=int, nargs="+", default=[3, 7])
+    parser.add_argument("--num-locations", type=int, nargs="+", default=[5])
+    parser.add_argument("--asset-groupings", nargs="+", default=["none"])
+    parser.add_argument(
+        "--partition-budgets",
+        type=int,
+        nargs="+",
+        default=[None],
+        help="DEEP_PURPLE_PARTITION_BUDGET values (tps_budgeted cases)",
+    )
+    parser.add_argument(
+        "--dag-paths", nargs="+", default=[None], help="DAG CSVs to load (default: DEEP_PURPLE_DAG_PATH)"
+    )
+    parser.add_argument("--location", type=int, default=1, help="Location to load in every case")
+    parser.add_argument("--output", type=Path, default=Path("load_benchmark.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--min-seconds", type=float, default=0.1, help="Ignore timing changes below this")
+    parser.add_argument("--measure", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        print(json.dumps(_measure(args.measure)))
+        return
+
+    # Read the baseline up front, it may be the file this run overwrites
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else None
+
+    cases = []
+    for dag_path, partition_mode, n_days, num_locations, asset_grouping in itertools.product(
+        args.dag_paths, args.partition_modes, args.n_days, args.num_locations, args.asset_groupings
+    ):
+        case = {"partition_mode": partition_mode, "n_days": n_days, "num_locations": num_locations}
+        if dag_path is not None:
+            case["dag_path"] = str(Path(dag_path).resolve())
+        # Only recorded when swept, so earlier results keep matching as baselines
+        if asset_grouping != "none":
+            case["asset_grouping"] = asset_grouping
+        # The budget only matters to tps_budgeted, which can't run without one
+        budgets = args.partition_budgets if partition_mode == "tps_budgeted" else [None]
+        for budget in budgets:
+            cases.append(case if budget is None else {**case, "partition_budget": budget})
+
+    results = []
+    for case in cases:
+        result = _run_case(case, args.location)
+        results.append(result)
+        print(
+            f"{Path(case['dag_path']).name + ' ' if 'dag_path' in case else ''}"
+            f"{case['partition_mode']:>12} n_days={case['n_days']:<3} locations={case['num_locations']:<2} "
+            f"{case['asset_grouping'] + ' ' if 'asset_grouping' in case else ''}"
+            f"{'budget=' + str(case['partition_budget']) + ' ' if 'partition_budget' in case else ''}"
+            f"{result['assets']} assets in {result['ops']} ops, {result['total_seconds']:.2f}s "
+            f"({', '.join(f'{phase} {seconds:.2f}' for phase, seconds in result['phases'].items())}), "
+            f"peak RSS {result['peak_rss_mb']} MB, snapshot {result['repository_snapshot_bytes'] / 2**20:.1f} MiB"
+        )
+
+    args.output.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Wrote {args.output}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
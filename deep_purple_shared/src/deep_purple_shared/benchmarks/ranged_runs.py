@@ -0,0 +1,128 @@
+"""
+Materialization throughput of ranged runs against one run per partition.
+
+A managed asset is built through ``build_location_assets`` like in the code locations and its whole
+window is materialized on an ephemeral instance, once per ``--max-partitions-per-run`` value: 1
+launches a run per partition, larger values launch ranged runs the way the asset's
+``BackfillPolicy.multi_run`` splits a backfill. Every layout must leave one materialization per
+partition, each with its own row count.
+
+Usage::
+
+    python -m deep_purple_shared.benchmarks.ranged_runs --n-days 3 --partition-seconds 3600 \\
+        --max-partitions-per-run 1 6 24
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+import dagster as dg
+
+from deep_purple_shared.defs.assets import build_location_assets
+from deep_purple_shared.utils.asset_planner import LocationPlan, ManagedAssetPlan
+from deep_purple_shared.utils.dates import days_before, start_of_day
+
+ASSET_NAME = "ranged_runs_benchmark_asset"
+# Keep the per-event debug output of every run off the console
+_RUN_CONFIG = {"loggers": {"console": {"config": {"log_level": "WARNING"}}}}
+
+
+def _benchmark_asset(
+    partition_seconds: int, max_partitions_per_run: int, start_date: datetime, end_date: datetime
+) -> dg.AssetsDefinition:
+    managed = ManagedAssetPlan(
+        name=ASSET_NAME,
+        deps=(),
+        tags={},
+        partition_seconds=partition_seconds,
+        max_contiguous_seconds=float(partition_seconds * max_partitions_per_run),
+        max_partitions_per_run=max_partitions_per_run,
+        start_date=start_date.date().isoformat(),
+        end_date=end_date.date().isoformat(),
+    )
+    plan = LocationPlan(location=1, source_assets=(), managed_assets=(managed,))
+    return build_location_assets(plan, start_date, end_date)[0]
+
+
+def materialize_window(asset: dg.AssetsDefinition, max_partitions_per_run: int) -> dict:
+    """
+    Materialize every partition of ``asset`` in runs of up to ``max_partitions_per_run`` partitions.
+
+    :param asset: A partitioned asset definition.
+    :param max_partitions_per_run: Partitions per run (1 launches a run per partition).
+    :return: Run count, timing and the materialization records left on the instance.
+    """
+    partition_keys = asset.partitions_def.get_partition_keys()
+    with dg.DagsterInstance.ephemeral() as instance:
+        started = time.perf_counter()
+        runs = 0
+        for first in range(0, len(partition_keys), max_partitions_per_run):
+            batch = partition_keys[first : first + max_partitions_per_run]
+            if len(batch) == 1:
+                result = dg.materialize(
+                    [asset], instance=instance, partition_key=batch[0], run_config=_RUN_CONFIG
+                )
+            else:
+                result = dg.materialize(
+                    [asset],
+                    instance=instance,
+                    run_config=_RUN_CONFIG,
+                    tags={
+                        "dagster/asset_partition_range_start": batch[0],
+                        "dagster/asset_partition_range_end": batch[-1],
+                    },
+                )
+            assert result.success
+            runs += 1
+        seconds = time.perf_counter() - started
+
+        records = instance.fetch_materializations(asset.key, limit=len(partition_keys) + 1).records
+        materialized = {record.partition_key for record in records}
+        row_counts = [
+            record.asset_materialization.metadata["dagster/row_count"].value for record in records
+        ]
+    return {
+        "max_partitions_per_run": max_partitions_per_run,
+        "partitions": len(partition_keys),
+        "runs": runs,
+        "seconds": round(seconds, 3),
+        "partitions_per_second": round(len(partition_keys) / seconds, 1),
+        "materializations": len(records),
+        "all_partitions_materialized": materialized == set(partition_keys),
+        "distinct_row_counts": len(set(row_counts)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of ranged runs vs one run per partition.")
+    parser.add_argument("--n-days", type=int, default=1)
+    parser.add_argument("--partition-seconds", type=int, default=3600)
+    parser.add_argument("--max-partitions-per-run", type=int, nargs="+", default=[1, 6, 24])
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    end_date = start_of_day()
+    start_date = days_before(end_date, args.n_days)
+    results = [
+        materialize_window(
+            _benchmark_asset(args.partition_seconds, per_run, start_date, end_date), per_run
+        )
+        for per_run in args.max_partitions_per_run
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'per run':>8} {'partitions':>11} {'runs':>5} {'seconds':>8} {'part/s':>8} {'records':>8}")
+    for r in results:
+        print(
+            f"{r['max_partitions_per_run']:>8} {r['partitions']:>11} {r['runs']:>5} {r['seconds']:>8} "
+            f"{r['partitions_per_second']:>8} {r['materializations']:>8}"
+            + ("" if r["all_partitions_materialized"] else "  MISSING PARTITIONS")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Cost of explicit key-set sensor selections against tag selections.
+
+One location's assets are built once; then, for each selection mode, its sensors are generated
+(``tag`` targets the sensor index tag, ``keys`` the asset keys of the location plan) and the
+definitions are loaded. Resolving a sensor's target against the asset graph is what the
+automation daemon does on every tick, so it is repeated ``--ticks`` times per sensor. Both modes
+must resolve every sensor to the same assets.
+
+Usage::
+
+    python -m deep_purple_shared.benchmarks.sensor_selection --location 1 --ticks 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+MODES = ("tag", "keys")
+
+
+def _measure(location: int, ticks: int) -> list[dict]:
+    import dagster as dg
+
+    from deep_purple_shared.defs.assets import build_location_assets
+    from deep_purple_shared.defs.sensors import (
+        generate_sensors_for_deep_purple_trigger_evaluation,
+        sensor_asset_keys,
+    )
+    from deep_purple_shared.utils.asset_planner import load_location_plan
+    from deep_purple_shared.utils.performance_config import PERF_CONFIG
+
+    plan = load_location_plan(location)
+    assets = build_location_assets(plan, PERF_CONFIG.start_date, PERF_CONFIG.end_date)
+    sensor_indexes = plan.sensor_indexes
+
+    results, resolved_by_mode = [], {}
+    for mode in MODES:
+        started = time.perf_counter()
+        sensor_keys = (
+            sensor_asset_keys((*plan.source_assets, *plan.managed_assets), sensor_indexes)
+            if mode == "keys"
+            else None
+        )
+        sensors = generate_sensors_for_deep_purple_trigger_evaluation(sensor_keys, sensor_indexes)
+        sensors_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        repository = dg.Definitions(assets=assets, sensors=sensors).get_repository_def()
+        asset_graph = repository.asset_graph
+        definitions_seconds = time.perf_counter() - started
+
+        tick_seconds = []
+        for _ in range(ticks):
+            started = time.perf_counter()
+            resolved = {sensor.name: sensor.asset_selection.resolve(asset_graph) for sensor in sensors}
+            tick_seconds.append(time.perf_counter() - started)
+        resolved_by_mode[mode] = resolved
+
+        results.append(
+            {
+                "mode": mode,
+                "sensors": len(sensors),
+                "targeted_assets": sum(len(keys) for keys in resolved.values()),
+                "sensors_seconds": round(sensors_seconds, 4),
+                "definitions_seconds": round(definitions_seconds, 3),
+                "tick_resolve_seconds": round(statistics.median(tick_seconds), 4),
+            }
+        )
+
+    same = resolved_by_mode["tag"] == resolved_by_mode["keys"]
+    for result in results:
+        result["same_selection"] = same
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cost of key-set vs tag sensor selections.")
+    parser.add_argument("--location", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=20, help="Selection resolutions per mode")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    results = _measure(args.location, args.ticks)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(
+            f"{r['mode']:>5}: {r['sensors']} sensors over {r['targeted_assets']} assets, "
+            f"sensors {r['sensors_seconds']:.3f}s, definitions {r['definitions_seconds']:.2f}s, "
+            f"per tick {r['tick_resolve_seconds'] * 1000:.1f}ms"
+            + ("" if r["same_selection"] else "  SELECTIONS DIFFER")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+How source-asset de-duplication scales with DAG size.
+
+Compares the original de-duplication (a list of already created sources searched with ``not in`` for
+every parent of every dataset) with ``SourceAssetIndex``, and times the full planner on the same DAG.
+Smaller DAGs are prefixes of the real one; larger ones tile it with renamed copies, so the number of
+distinct sources grows with the DAG.
+
+Usage::
+
+    python -m deep_purple_shared.benchmarks.source_dedup --scales 0.25 0.5 1 2 4 8
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import time
+
+import numpy as np
+
+from deep_purple_shared.utils.asset_planner import plan_locations
+from deep_purple_shared.utils.dag_snapshot import DagSnapshot, load_dag
+from deep_purple_shared.utils.location_utils import LocationAssignment
+from deep_purple_shared.utils.performance_config import PERF_CONFIG
+from deep_purple_shared.utils.source_index import SourceAssetIndex
+
+
+def _prefix(dag: DagSnapshot, num_datasets: int) -> DagSnapshot:
+    """The DAG made of its first ``num_datasets`` rows."""
+    parent_indptr = np.asarray(dag.parent_indptr[: num_datasets + 1])
+    return dataclasses.replace(
+        dag,
+        parent_indptr=parent_indptr,
+        parent_indices=np.asarray(dag.parent_indices[: parent_indptr[-1]]),
+        partition_seconds=np.asarray(dag.partition_seconds[:num_datasets]),
+        max_contiguous_seconds=np.asarray(dag.max_contiguous_seconds[:num_datasets]),
+        queue_binding=np.asarray(dag.queue_binding[:num_datasets]),
+        start_date=np.asarray(dag.start_date[:num_datasets]),
+        end_date=np.asarray(dag.end_date[:num_datasets]),
+    )
+
+
+def _tile(dag: DagSnapshot, copies: int) -> DagSnapshot:
+    """``copies`` renamed copies of the DAG, datasets first and parent-only names after them."""
+    names = np.asarray(dag.names)
+    num_datasets, num_names = dag.num_datasets, len(names)
+    num_parent_only = num_names - num_datasets
+    suffixes = [f"_copy{c}".encode() if c else b"" for c in range(copies)]
+
+    def renamed(part: np.ndarray) -> list[np.ndarray]:
+        return [np.char.add(part, suffix) for suffix in suffixes]
+
+    parent_indices = np.asarray(dag.parent_indices)
+    is_dataset = parent_indices < num_datasets
+    tiled_indices = []
+    for c in range(copies):
+        tiled_indices.append(
+            np.where(
+                is_dataset,
+                c * num_datasets + parent_indices,
+                copies * num_datasets + c * num_parent_only + parent_indices - num_datasets,
+            )
+        )
+    parent_indptr = np.asarray(dag.parent_indptr)
+    num_edges = parent_indptr[-1]
+    tiled_indptr = np.concatenate(
+        [parent_indptr[:-1] + c * num_edges for c in range(copies)] + [[copies * num_edges]]
+    )
+
+    def tiled(column) -> np.ndarray:
+        return np.tile(np.asarray(column), copies)
+
+    return dataclasses.replace(
+        dag,
+        names=np.concatenate(renamed(names[:num_datasets]) + renamed(names[num_datasets:])),
+        parent_indptr=tiled_indptr,
+        parent_indices=np.concatenate(tiled_indices).astype(parent_indices.dtype),
+        partition_seconds=tiled(dag.partition_seconds),
+        max_contiguous_seconds=tiled(dag.max_contiguous_seconds),
+        queue_binding=tiled(dag.queue_binding),
+        start_date=tiled(dag.start_date),
+        end_date=tiled(dag.end_date),
+    )
+
+
+def scaled_dag(dag: DagSnapshot, scale: float) -> DagSnapshot:
+    """
+    :param dag: The DAG snapshot.
+    :param scale: Size relative to ``dag``.
+    :return: A prefix of the DAG for ``scale < 1``, otherwise ``ceil(scale)`` tiled copies.
+    """
+    if scale < 1:
+        return _prefix(dag, max(1, int(dag.num_datasets * scale)))
+    return _tile(dag, math.ceil(scale))
+
+
+def _dedup_with_list(dag: DagSnapshot, location: int, assignment: LocationAssignment) -> int:
+    """The original de-duplication: sources created by the location, kept in a list."""
+    deps_with_assets_already = []
+    for i in range(dag.num_datasets):
+        for parent_dataset in dag.parents_of(i):
+            if (
+                parent_dataset not in deps_with_assets_already
+                and not parent_dataset.startswith("managed.")
+                and assignment.location(parent_dataset.replace(".", "_")) == location
+            ):
+                deps_with_assets_already.append(parent_dataset)
+    return len(deps_with_assets_already)
+
+
+def _dedup_with_index(dag: DagSnapshot, location: int, assignment: LocationAssignment) -> int:
+    """De-duplication through ``SourceAssetIndex``."""
+    names = dag.decoded_names
+    index = SourceAssetIndex.empty(dag)
+    for i in range(dag.num_datasets):
+        parents = dag.parent_indices[dag.parent_indptr[i] : dag.parent_indptr[i + 1]]
+        for parent_id in parents.tolist():
+            parent_dataset = names[parent_id]
+            if parent_dataset.startswith("managed.") or index.is_planned(parent_id):
+                continue
+            index.add(parent_id, assignment.location(parent_dataset.replace(".", "_")))
+    return index.counts().get(location, 0)
+
+
+def _timed(func, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scaling of source-asset de-duplication.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.25, 0.5, 1, 2, 4])
+    parser.add_argument("--location", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    full_dag = load_dag(PERF_CONFIG.dag_path)
+    assignment = LocationAssignment()
+    results = []
+    for scale in args.scales:
+        dag = scaled_dag(full_dag, scale)
+        list_seconds, list_sources = _timed(_dedup_with_list, dag, args.location, assignment)
+        index_seconds, index_sources = _timed(_dedup_with_index, dag, args.location, assignment)
+        assert list_sources == index_sources
+        plan_seconds, _ = _timed(plan_locations, dag, assignment)
+        results.append(
+            {
+                "scale": scale,
+                "datasets": dag.num_datasets,
+                "location_sources": index_sources,
+                "list_seconds": round(list_seconds, 3),
+                "index_seconds": round(index_seconds, 3),
+                "plan_seconds": round(plan_seconds, 3),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scale':>6} {'datasets':>9} {'sources':>8} {'list (s)':>9} {'index (s)':>10} {'plan (s)':>9}")
+    for r in results:
+        print(
+            f"{r['scale']:>6} {r['datasets']:>9} {r['location_sources']:>8} {r['list_seconds']:>9} "
+            f"{r['index_seconds']:>10} {r['plan_seconds']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+Asset factory shared by all code locations.
+Each location turns its own plan (see ``deep_purple_shared.utils.asset_planner``) into asset definitions.
+"""
+
+import random
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from functools import cache
+from graphlib import TopologicalSorter
+
+import dagster as dg
+
+from deep_purple_shared.defs.automation_conditions import eager_all_partitions
+from deep_purple_shared.defs.partitions import (
+    get_daily_partitions_definition,
+    get_time_window_partitions_definition,
+)
+from deep_purple_shared.utils.asset_planner import (
+    LocationPlan,
+    ManagedAssetPlan,
+    SourceAssetPlan,
+    iter_location_plan,
+    load_location_plan,
+)
+from deep_purple_shared.utils.constants import ASSET_TYPE, PARTITION_CRON_SCHEDULES, QUEUE_BINDING_TAG
+from deep_purple_shared.utils.dates import format_partition_date, intersect_window
+from deep_purple_shared.utils.performance_config import PERF_CONFIG, AssetGrouping, PartitionMode
+from deep_purple_shared.utils.queue_pools import pool_for_queue, queue_priority
+
+
+def create_partition_definition(
+    timeslice_duration_seconds: int, start_date_str: str, end_date_str: str
+) -> dg.PartitionsDefinition:
+    """
+    Create a partition definition based on timeslice duration using cron schedules.
+    Equal parameters return the same shared instance (see ``deep_purple_shared.defs.partitions``).
+
+    :param timeslice_duration_seconds: Duration of each partition in seconds.
+    :param start_date: Start date for partitions.
+    :param end_date: End date for partitions.
+    :return: Appropriate partition definition.
+    """
+    cron_schedule = PARTITION_CRON_SCHEDULES.get(
+        timeslice_duration_seconds, "0 0 * * *"
+    )  # Default to daily
+
+    return get_time_window_partitions_definition(cron_schedule, start_date_str, end_date_str)
+
+
+def _partitions_def_for(
+    partition_seconds: int, formatted_start: str, formatted_end: str
+) -> dg.PartitionsDefinition:
+    if PERF_CONFIG.partition_mode == PartitionMode.DAILY:
+        return get_daily_partitions_definition(formatted_start, formatted_end)
+    return create_partition_definition(partition_seconds, formatted_start, formatted_end)
+
+
+@cache
+def _dataset_window(
+    start_date: datetime, end_date: datetime, first_day: str, last_day: str
+) -> tuple[datetime, datetime, str, str]:
+    """The configured window narrowed to a dataset's START_DATE/END_DATE, with its formatted bounds."""
+    start, end = intersect_window(
+        start_date, end_date, date.fromisoformat(first_day), date.fromisoformat(last_day)
+    )
+    return start, end, format_partition_date(start), format_partition_date(end)
+
+
+def _materialize_partitions(
+    context: dg.AssetExecutionContext,
+    min_rows: int,
+    max_rows: int,
+    asset_key: dg.AssetKey | None = None,
+) -> dg.MaterializeResult:
+    """
+    Materialize all partitions of the run in one pass.
+
+    Ranged runs (see the assets' backfill policies) record one materialization per partition key,
+    each with its own row count, instead of a single count for the whole range.
+
+    :param context: The asset's execution context.
+    :param min_rows: Smallest simulated row count per partition.
+    :param max_rows: Largest simulated row count per partition.
+    :param asset_key: Asset to materialize, for multi-assets.
+    :return: The materialization of the run's partitions.
+    """
+    if not (context.has_partition_key or context.has_partition_key_range):
+        return dg.MaterializeResult(
+            asset_key=asset_key, metadata={"dagster/row_count": random.randint(min_rows, max_rows)}
+        )
+    for partition_key in context.partition_keys:
+        context.add_asset_metadata(
+            {"dagster/row_count": random.randint(min_rows, max_rows)},
+            asset_key=asset_key,
+            partition_key=partition_key,
+        )
+    return dg.MaterializeResult(asset_key=asset_key)
+
+
+def _queue_pool(managed: ManagedAssetPlan) -> tuple[str | None, dict[str, str] | None]:
+    """Concurrency pool and op tags of a managed asset (see ``deep_purple_shared.utils.queue_pools``)."""
+    if not PERF_CONFIG.queue_pools:
+        return None, None
+    queue = managed.tags.get(QUEUE_BINDING_TAG, "")
+    priority = queue_priority(queue)
+    return pool_for_queue(queue), None if priority is None else {"dagster/priority": str(priority)}
+
+
+def _managed_metadata(
+    managed: ManagedAssetPlan, start_date: datetime, end_date: datetime
+) -> dict[str, object]:
+    return {
+        "START_DATE": start_date,
+        "END_DATE": end_date,
+        "MAX_CONTIGUOUS_SECONDS": managed.max_contiguous_seconds,
+        "MAX_PARTITIONS_PER_RUN": managed.max_partitions_per_run,
+    }
+
+
+def _build_source_asset(
+    source: SourceAssetPlan, partitions_def: dg.PartitionsDefinition
+) -> dg.AssetsDefinition:
+    @dg.asset(
+        name=source.name,
+        tags=source.tags,
+        group_name=ASSET_TYPE,
+        kinds={"SourceDGP"},
+        partitions_def=partitions_def,
+        backfill_policy=dg.BackfillPolicy.multi_run(
+            max_partitions_per_run=source.max_partitions_per_run
+        ),
+    )
+    def _deep_purple_dgp_source_asset(context: dg.AssetExecutionContext):
+        return _materialize_partitions(context, 500, 2000)
+
+    return _deep_purple_dgp_source_asset
+
+
+def _build_managed_asset(
+    managed: ManagedAssetPlan,
+    partitions_def: dg.PartitionsDefinition,
+    start_date: datetime,
+    end_date: datetime,
+) -> dg.AssetsDefinition:
+    pool, op_tags = _queue_pool(managed)
+
+    @dg.asset(
+        name=managed.name,
+        deps=list(managed.deps),
+        tags=managed.tags,
+        group_name=ASSET_TYPE,
+        kinds={"ManagedDGP"},
+        partitions_def=partitions_def,
+        pool=pool,
+        op_tags=op_tags,
+        backfill_policy=dg.BackfillPolicy.multi_run(
+            max_partitions_per_run=managed.max_partitions_per_run
+        ),
+        automation_condition=eager_all_partitions,
+        metadata=_managed_metadata(managed, start_date, end_date),
+    )
+    def _deep_purple_dgp_asset(context: dg.AssetExecutionContext):
+        return _materialize_partitions(context, 2000, 10000)
+
+    return _deep_purple_dgp_asset
+
+
+def _build_multi_asset(
+    members: list[tuple[SourceAssetPlan | ManagedAssetPlan, datetime, datetime]],
+    partitions_def: dg.PartitionsDefinition,
+) -> dg.AssetsDefinition:
+    """
+    One subsettable multi-asset for planned assets of the same kind sharing partitions, queue and
+    backfill limit. Each asset keeps its own spec (deps, tags, metadata, automation condition).
+    """
+    first = members[0][0]
+    # Outputs must be yielded after the members they depend on
+    names = {planned.name for planned, _, _ in members}
+    order = TopologicalSorter(
+        {
+            planned.name: [dep for dep in getattr(planned, "deps", ()) if dep in names]
+            for planned, _, _ in members
+        }
+    ).static_order()
+    output_order = [dg.AssetKey(name) for name in order]
+
+    if isinstance(first, SourceAssetPlan):
+        specs = [
+            dg.AssetSpec(key=source.name, tags=source.tags, group_name=ASSET_TYPE, kinds={"SourceDGP"})
+            for source, _, _ in members
+        ]
+        pool, op_tags = None, None
+        min_rows, max_rows = 500, 2000
+    else:
+        specs = [
+            dg.AssetSpec(
+                key=managed.name,
+                deps=list(managed.deps),
+                tags=managed.tags,
+                group_name=ASSET_TYPE,
+                kinds={"ManagedDGP"},
+                automation_condition=eager_all_partitions,
+                metadata=_managed_metadata(managed, start_date, end_date),
+            )
+            for managed, start_date, end_date in members
+        ]
+        pool, op_tags = _queue_pool(first)
+        min_rows, max_rows = 2000, 10000
+
+    @dg.multi_asset(
+        name=f"{first.name}_group",
+        specs=specs,
+        partitions_def=partitions_def,
+        backfill_policy=dg.BackfillPolicy.multi_run(
+            max_partitions_per_run=first.max_partitions_per_run
+        ),
+        can_subset=True,
+        pool=pool,
+        op_tags=op_tags,
+    )
+    def _deep_purple_dgp_multi_asset(context: dg.AssetExecutionContext):
+        selected = context.selected_asset_keys
+        for asset_key in output_order:
+            if asset_key in selected:
+                yield _materialize_partitions(context, min_rows, max_rows, asset_key)
+
+    return _deep_purple_dgp_multi_asset
+
+
+def _partitioning(
+    planned: SourceAssetPlan | ManagedAssetPlan,
+    formatted_start: str,
+    formatted_end: str,
+    start_date: datetime,
+    end_date: datetime,
+) -> tuple[dg.PartitionsDefinition, datetime, datetime]:
+    """The asset's partitions definition and window."""
+    # Sources have no window of their own and keep the configured one
+    if (
+        isinstance(planned, ManagedAssetPlan)
+        and PERF_CONFIG.partition_mode == PartitionMode.TPS_EFFECTIVE
+    ):
+        start_date, end_date, formatted_start, formatted_end = _dataset_window(
+            start_date, end_date, planned.start_date, planned.end_date
+        )
+    partitions_def = _partitions_def_for(planned.partition_seconds, formatted_start, formatted_end)
+    return partitions_def, start_date, end_date
+
+
+def _build_asset(
+    planned: SourceAssetPlan | ManagedAssetPlan,
+    formatted_start: str,
+    formatted_end: str,
+    start_date: datetime,
+    end_date: datetime,
+) -> dg.AssetsDefinition:
+    partitions_def, start_date, end_date = _partitioning(
+        planned, formatted_start, formatted_end, start_date, end_date
+    )
+    if isinstance(planned, SourceAssetPlan):
+        return _build_source_asset(planned, partitions_def)
+    return _build_managed_asset(planned, partitions_def, start_date, end_date)
+
+
+def _build_assets(
+    planned_assets: Iterable[SourceAssetPlan | ManagedAssetPlan],
+    start_date: datetime,
+    end_date: datetime,
+) -> list[dg.AssetsDefinition]:
+    """
+    Build the definitions of planned assets: one per asset, or multi-assets with
+    ``AssetGrouping.MULTI_ASSET``.
+    """
+    formatted_start = format_partition_date(start_date)
+    formatted_end = format_partition_date(end_date)
+    if PERF_CONFIG.asset_grouping == AssetGrouping.NONE:
+        return [
+            _build_asset(planned, formatted_start, formatted_end, start_date, end_date)
+            for planned in planned_assets
+        ]
+
+    # Partitions definitions are interned, so equal definitions are the same object
+    groups: dict[tuple, tuple[dg.PartitionsDefinition, list]] = {}
+    for planned in planned_assets:
+        partitions_def, asset_start, asset_end = _partitioning(
+            planned, formatted_start, formatted_end, start_date, end_date
+        )
+        key = (
+            type(planned),
+            id(partitions_def),
+            planned.tags.get(QUEUE_BINDING_TAG, ""),
+            planned.max_partitions_per_run,
+        )
+        groups.setdefault(key, (partitions_def, []))[1].append((planned, asset_start, asset_end))
+
+    size = PERF_CONFIG.multi_asset_max_size
+    return [
+        _build_multi_asset(members[first : first + size], partitions_def)
+        for partitions_def, members in groups.values()
+        for first in range(0, len(members), size)
+    ]
+
+
+def build_location_assets(
+    plan: LocationPlan, start_date: datetime, end_date: datetime
+) -> list[dg.AssetsDefinition]:
+    """
+    Turn a location plan into asset definitions.
+
+    :param plan: The location's plan.
+    :param start_date: Start date for partitions.
+    :param end_date: End date for partitions.
+    :return: Source and managed asset definitions owned by the location.
+    """
+    return _build_assets((*plan.source_assets, *plan.managed_assets), start_date, end_date)
+
+
+def iter_location_assets(
+    current_location: int,
+    start_date: datetime,
+    end_date: datetime,
+    chunk_size: int,
+) -> Iterator[list[dg.AssetsDefinition]]:
+    """
+    Stream the asset definitions owned by a code location in chunks, planning the DAG
+    incrementally instead of holding the whole plan in memory.
+
+    :param current_location: The location number (1-5).
+    :param start_date: Start date for partitions.
+    :param end_date: End date for partitions.
+    :param chunk_size: Number of DAG rows planned per chunk.
+    :return: Iterator over chunks of asset definitions.
+    """
+    for planned_chunk in iter_location_plan(current_location, chunk_size):
+        yield _build_assets(planned_chunk, start_date, end_date)
+
+
+def generate_location_assets(
+    current_location: int, start_date: datetime, end_date: datetime
+) -> list[dg.AssetsDefinition]:
+    """
+    Build the asset definitions owned by a code location.
+
+    :param current_location: The location number (1-5).
+    :param start_date: Start date for partitions.
+    :param end_date: End date for partitions.
+    :return: Source and managed asset definitions owned by the location.
+    """
+    if PERF_CONFIG.streaming_chunk_size:
+        return [
+            asset
+            for chunk in iter_location_assets(
+                current_location, start_date, end_date, PERF_CONFIG.streaming_chunk_size
+            )
+            for asset in chunk
+        ]
+    return build_location_assets(load_location_plan(current_location), start_date, end_date)
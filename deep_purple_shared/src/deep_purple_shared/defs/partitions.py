@@ -0,0 +1,80 @@
+"""
+Interning registry for partitions definitions.
+
+There are only a handful of distinct (cron schedule, start, end) combinations across the DAG, so every
+asset with the same combination shares one canonical ``PartitionsDefinition`` instead of building its own.
+"""
+
+import dagster as dg
+
+from deep_purple_shared.utils.constants import DATETIME_FORMAT
+
+_partitions_definitions: dict[tuple[str, str, str], dg.PartitionsDefinition] = {}
+_lookups = 0
+
+
+def get_time_window_partitions_definition(
+    cron_schedule: str, start_date_str: str, end_date_str: str
+) -> dg.TimeWindowPartitionsDefinition:
+    """
+    Return the canonical UTC time window partitions definition for the given parameters.
+
+    :param cron_schedule: Cron schedule of the partitions.
+    :param start_date_str: Start date formatted with ``DATETIME_FORMAT``.
+    :param end_date_str: End date formatted with ``DATETIME_FORMAT``.
+    :return: Shared partitions definition.
+    """
+    global _lookups
+    _lookups += 1
+    key = (cron_schedule, start_date_str, end_date_str)
+    partitions_def = _partitions_definitions.get(key)
+    if partitions_def is None:
+        partitions_def = _partitions_definitions.setdefault(
+            key,
+            dg.TimeWindowPartitionsDefinition(
+                cron_schedule=cron_schedule,
+                start=start_date_str,
+                end=end_date_str,
+                fmt=DATETIME_FORMAT,
+                timezone="UTC",
+            ),
+        )
+    return partitions_def
+
+
+def get_daily_partitions_definition(
+    start_date_str: str, end_date_str: str
+) -> dg.DailyPartitionsDefinition:
+    """
+    Return the canonical daily partitions definition for the given window.
+
+    :param start_date_str: Start date formatted with ``DATETIME_FORMAT``.
+    :param end_date_str: End date formatted with ``DATETIME_FORMAT``.
+    :return: Shared partitions definition.
+    """
+    global _lookups
+    _lookups += 1
+    key = ("daily", start_date_str, end_date_str)
+    partitions_def = _partitions_definitions.get(key)
+    if partitions_def is None:
+        partitions_def = _partitions_definitions.setdefault(
+            key,
+            dg.DailyPartitionsDefinition(
+                start_date=start_date_str, end_date=end_date_str, fmt=DATETIME_FORMAT
+            ),
+        )
+    return partitions_def
+
+
+def live_partitions_definition_count() -> int:
+    """
+    :return: Number of unique partitions definitions held by the registry.
+    """
+    return len(_partitions_definitions)
+
+
+def partitions_registry_stats() -> dict[str, int]:
+    """
+    :return: Unique definitions and total lookups served by the registry.
+    """
+    return {"unique_definitions": len(_partitions_definitions), "lookups": _lookups}
@@ -1,16 +1,62 @@
-from dagster import AssetSelection, AutomationConditionSensorDefinition
+"""
+Automation condition sensors of the Full Deep Purple DAG.
 
+Each sensor evaluates the assets tagged with its ``evaluation_trigger_sensor_index``; the number of
+sensors and the range each location owns come from ``PERF_CONFIG.sensor_layout``. Sensors target
+the explicit asset keys of their shard, taken from the asset plan, so resolving a target is a set
+lookup instead of a scan over the tags of every asset in the graph. Without keys, the generators
+fall back to tag and group selections.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from functools import cache
+
+from dagster import AssetKey, AssetSelection, AutomationConditionSensorDefinition
+
+from deep_purple_shared.utils.constants import SENSOR_INDEX_TAG
 from deep_purple_shared.utils.performance_config import PERF_CONFIG
 
-DEEP_PURPLE_EVALUATION_SENSOR_COUNT = 50
 
+def sensor_asset_keys(
+    planned_assets: Iterable, sensor_indexes: Iterable[int]
+) -> dict[int, list[AssetKey]]:
+    """
+    Asset keys per sensor, straight from the plan's sensor index tags.
+
+    :param planned_assets: ``SourceAssetPlan`` / ``ManagedAssetPlan`` objects.
+    :param sensor_indexes: Sensor indexes to collect keys for; assets of other sensors are skipped.
+    :return: Mapping of sensor index to its sorted asset keys.
+    """
+    keys: dict[int, list[AssetKey]] = {index: [] for index in sensor_indexes}
+    for planned in planned_assets:
+        index = int(planned.tags[SENSOR_INDEX_TAG])
+        if index in keys:
+            keys[index].append(AssetKey(planned.name))
+    return {index: sorted(index_keys) for index, index_keys in keys.items()}
 
-def generate_sensors_for_deep_purple_trigger_evaluation():
+
+def generate_sensors_for_deep_purple_trigger_evaluation(
+    sensor_keys: Mapping[int, Sequence[AssetKey]] | None = None,
+    sensor_indexes: Iterable[int] | None = None,
+) -> list[AutomationConditionSensorDefinition]:
+    """
+    :param sensor_keys: Asset keys per sensor index (see ``sensor_asset_keys``); None targets
+        assets by their sensor index tag instead.
+    :param sensor_indexes: Sensor indexes to create sensors for (defaults to
+        ``PERF_CONFIG.sensor_count`` sensors).
+    :return: One automation condition sensor per index.
+    """
+    if sensor_indexes is None:
+        sensor_indexes = range(PERF_CONFIG.sensor_count)
     _sensors = []
-    for i in range(DEEP_PURPLE_EVALUATION_SENSOR_COUNT):
+    for i in sensor_indexes:
+        if sensor_keys is not None:
+            target = AssetSelection.assets(*sensor_keys.get(i, ()))
+        else:
+            target = AssetSelection.tag(SENSOR_INDEX_TAG, str(i))
         _sensor = AutomationConditionSensorDefinition(
             f"deep_purple_eval_automation_sensor_{i}",
-            target=AssetSelection.tag("evaluation_trigger_sensor_index", str(i)),
+            target=target,
             default_status=PERF_CONFIG.sensor_default_status,
         )
         _sensors.append(_sensor)
@@ -18,14 +64,67 @@ def generate_sensors_for_deep_purple_trigger_evaluation():
     return _sensors
 
 
-# Everything but the Full Deep Purple DAG assets
-deep_purple_eval_default_automation_sensor = AutomationConditionSensorDefinition(
-    "deep_purple_eval_automation_sensor_default",
-    target=AssetSelection.all()
-    - AssetSelection.groups("full_deep_purple_dummy_dag", include_sources=True),
-    default_status=PERF_CONFIG.sensor_default_status,
-    minimum_interval_seconds=120,
-)
+def generate_default_automation_sensor(
+    dag_asset_keys: Sequence[AssetKey] | None = None,
+) -> AutomationConditionSensorDefinition:
+    """
+    Sensor for everything but the Full Deep Purple DAG assets.
+
+    :param dag_asset_keys: Keys of the DAG assets; None excludes them by group instead.
+    :return: The default automation condition sensor.
+    """
+    if dag_asset_keys is not None:
+        dag_assets = AssetSelection.assets(*dag_asset_keys)
+    else:
+        dag_assets = AssetSelection.groups("full_deep_purple_dummy_dag", include_sources=True)
+    return AutomationConditionSensorDefinition(
+        "deep_purple_eval_automation_sensor_default",
+        target=AssetSelection.all() - dag_assets,
+        default_status=PERF_CONFIG.sensor_default_status,
+        minimum_interval_seconds=120,
+    )
+
+
+@cache
+def _location_plans() -> tuple:
+    from deep_purple_shared.utils.asset_planner import load_location_plan
+
+    return tuple(
+        load_location_plan(location) for location in range(1, PERF_CONFIG.num_locations + 1)
+    )
+
+
+def _planned_assets() -> Iterator:
+    for plan in _location_plans():
+        yield from plan.source_assets
+        yield from plan.managed_assets
+
+
+@cache
+def get_deep_purple_eval_sensors() -> list[AutomationConditionSensorDefinition]:
+    """
+    :return: The sensors of every location, targeting the keys of their plans.
+    """
+    sensor_indexes = [index for plan in _location_plans() for index in plan.sensor_indexes]
+    return generate_sensors_for_deep_purple_trigger_evaluation(
+        sensor_asset_keys(_planned_assets(), sensor_indexes), sensor_indexes
+    )
+
+
+@cache
+def get_deep_purple_eval_default_automation_sensor() -> AutomationConditionSensorDefinition:
+    """
+    :return: The default sensor, excluding the planned assets of every location by key.
+    """
+    return generate_default_automation_sensor(
+        sorted(AssetKey(planned.name) for planned in _planned_assets())
+    )
 
 
-deep_purple_eval_sensors = generate_sensors_for_deep_purple_trigger_evaluation()
+def __getattr__(name: str):
+    # These used to be built at import time; planning them needs the DAG, so build them on access
+    if name == "deep_purple_eval_sensors":
+        return get_deep_purple_eval_sensors()
+    if name == "deep_purple_eval_default_automation_sensor":
+        return get_deep_purple_eval_default_automation_sensor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
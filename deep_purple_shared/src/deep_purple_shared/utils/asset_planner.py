@@ -0,0 +1,730 @@
+"""
+Location-sharded asset planner.
+
+Walks the DAG once and emits one plan per code location, listing the managed and source assets the
+location owns together with their deps, tags and backfill limits. Plans are cached on disk keyed by
+the DAG CSV hash and the ``PerformanceConfig``, so a location only reads its own plan and never has
+to iterate the rest of the graph.
+"""
+
+import hashlib
+import json
+import math
+import os
+from collections.abc import Collection, Iterator
+from dataclasses import asdict, dataclass, replace
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+from dagster import get_dagster_logger
+
+from deep_purple_shared.utils.constants import (
+    ASSET_TYPE,
+    LOCATION_TABLE_PATH,
+    QUEUE_BINDING_TAG,
+    SENSOR_INDEX_TAG,
+)
+from deep_purple_shared.utils.dag_snapshot import DagSnapshot, file_sha256, load_dag
+from deep_purple_shared.utils.location_utils import AssignmentStrategy, LocationAssignment
+from deep_purple_shared.utils.partition_budget import apply_partition_budget
+from deep_purple_shared.utils.performance_config import (
+    PERF_CONFIG,
+    PartitionMode,
+    PerformanceConfig,
+    PlannerMode,
+    SensorSharding,
+)
+from deep_purple_shared.utils.sensor_layout import SensorLayout, round_robin_index
+from deep_purple_shared.utils.sensor_sharding import SECONDS_PER_DAY, apply_cost_sharding
+from deep_purple_shared.utils.source_index import SourceAssetIndex
+
+PLAN_FORMAT_VERSION = 4
+# Settings plan_configured_locations reads; everything else only matters when building definitions
+_PLAN_SETTINGS = {
+    "num_locations",
+    "location_strategy",
+    "virtual_nodes",
+    "location_weights",
+    "planner_mode",
+    "sensor_count",
+    "assets_per_sensor",
+    "sensor_sharding",
+}
+# Modules whose code shapes the plans; editing any of them invalidates cached plans
+_PLANNER_MODULES = (
+    "asset_planner",
+    "constants",
+    "dag_snapshot",
+    "location_utils",
+    "partition_budget",
+    "performance_config",
+    "sensor_layout",
+    "sensor_sharding",
+    "source_index",
+)
+
+
+@dataclass(frozen=True)
+class SourceAssetPlan:
+    """
+    An external source dataset owned by a location.
+
+    :param name: Asset name.
+    :param tags: Asset tags.
+    :param partition_seconds: PARTITION_SECONDS of the first dataset that depends on this source.
+    :param max_partitions_per_run: Backfill limit.
+    """
+
+    name: str
+    tags: dict[str, str]
+    partition_seconds: int
+    max_partitions_per_run: int = 1
+
+
+@dataclass(frozen=True)
+class ManagedAssetPlan:
+    """
+    A managed dataset owned by a location.
+
+    :param name: Asset name.
+    :param deps: Names of upstream assets, which may live in other locations.
+    :param tags: Asset tags.
+    :param partition_seconds: PARTITION_SECONDS of the dataset.
+    :param max_contiguous_seconds: MAX_CONTIGUOUS_SECONDS of the dataset (NaN when missing).
+    :param max_partitions_per_run: Backfill limit derived from MAX_CONTIGUOUS_SECONDS.
+    :param start_date: START_DATE of the dataset (ISO date).
+    :param end_date: END_DATE of the dataset (ISO date, inclusive).
+    """
+
+    name: str
+    deps: tuple[str, ...]
+    tags: dict[str, str]
+    partition_seconds: int
+    max_contiguous_seconds: float
+    max_partitions_per_run: int
+    start_date: str
+    end_date: str
+
+
+@dataclass(frozen=True)
+class LocationPlan:
+    """
+    Everything a code location needs to build its asset definitions.
+
+    :param location: Location number (1-5).
+    :param source_assets: Source assets owned by the location.
+    :param managed_assets: Managed assets owned by the location.
+    :param first_sensor_index: First sensor index owned by the location.
+    :param num_sensors: Number of sensors owned by the location.
+    """
+
+    location: int
+    source_assets: tuple[SourceAssetPlan, ...]
+    managed_assets: tuple[ManagedAssetPlan, ...]
+    first_sensor_index: int = 0
+    num_sensors: int = 0
+
+    @property
+    def sensor_indexes(self) -> range:
+        """Sensor indexes owned by the location."""
+        return range(self.first_sensor_index, self.first_sensor_index + self.num_sensors)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "LocationPlan":
+        return cls.from_dict(json.loads(payload))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LocationPlan":
+        return cls(
+            location=data["location"],
+            source_assets=tuple(SourceAssetPlan(**s) for s in data["source_assets"]),
+            managed_assets=tuple(
+                ManagedAssetPlan(**{**m, "deps": tuple(m["deps"])}) for m in data["managed_assets"]
+            ),
+            first_sensor_index=data["first_sensor_index"],
+            num_sensors=data["num_sensors"],
+        )
+
+
+def _max_partitions_per_run(partition_seconds: int, max_contiguous_seconds: float) -> int:
+    """
+    Calculate max_partitions_per_run for the backfill policy.
+
+    :param partition_seconds: Duration of each partition in seconds.
+    :param max_contiguous_seconds: Longest contiguous range a single run may cover.
+    :return: Number of partitions per run (at least 1).
+    """
+    if not math.isnan(max_contiguous_seconds) and partition_seconds > 0:
+        return max(1, int(max_contiguous_seconds / partition_seconds))
+    return 1
+
+
+def _source_tags(location: int, sensor_index: int) -> dict[str, str]:
+    return {
+        ASSET_TYPE: "",
+        "is_dgp_asset": "false",
+        SENSOR_INDEX_TAG: str(sensor_index),
+        "code_location": f"location_{location}",
+    }
+
+
+def _managed_tags(location: int, sensor_index: int, queue_binding: str) -> dict[str, str]:
+    return {
+        ASSET_TYPE: "",
+        "is_dgp_asset": "true",
+        SENSOR_INDEX_TAG: str(sensor_index),
+        QUEUE_BINDING_TAG: queue_binding,
+        "code_location": f"location_{location}",
+    }
+
+
+def _plan_locations_reference(
+    dag: DagSnapshot,
+    assignment: LocationAssignment,
+    source_index: SourceAssetIndex,
+    sensor_ranges: dict[int, range] | None,
+) -> dict[int, LocationPlan]:
+    """Row-by-row planner, kept as the reference the vectorized planner is checked against."""
+    num_locations = assignment.num_locations
+    names = dag.decoded_names
+    # Datasets that have their own rows (as children)
+    valid_datasets = set(names[: dag.num_datasets])
+
+    sources: dict[int, list[SourceAssetPlan]] = {loc: [] for loc in range(1, num_locations + 1)}
+    managed: dict[int, list[ManagedAssetPlan]] = {loc: [] for loc in range(1, num_locations + 1)}
+    assets_per_location = dict.fromkeys(sources, 0)
+
+    def next_sensor_index(location: int) -> int:
+        assets_per_location[location] += 1
+        if sensor_ranges is None:
+            return assets_per_location[location]
+        return round_robin_index(sensor_ranges[location], assets_per_location[location])
+
+    for i in range(dag.num_datasets):
+        partition_seconds = int(dag.partition_seconds[i])
+        max_contiguous_seconds = float(dag.max_contiguous_seconds[i])
+        asset_name = names[i].replace(".", "_")
+
+        dependency_assets = []
+        parents = dag.parent_indices[dag.parent_indptr[i] : dag.parent_indptr[i + 1]]
+        for parent_id in parents.tolist():
+            parent_dataset = names[parent_id]
+            is_managed = parent_dataset.startswith("managed.")
+            # Skip managed parents that don't have their own rows in the CSV
+            if is_managed and parent_dataset not in valid_datasets:
+                continue
+
+            parent_asset_name = parent_dataset.replace(".", "_")
+            dependency_assets.append(parent_asset_name)
+
+            # The first dataset to reference a source decides its partitioning
+            if is_managed or source_index.is_planned(parent_id):
+                continue
+
+            location = assignment.location(parent_asset_name)
+            source_index.add(parent_id, location)
+            sources[location].append(
+                SourceAssetPlan(
+                    name=parent_asset_name,
+                    tags=_source_tags(location, next_sensor_index(location)),
+                    partition_seconds=partition_seconds,
+                )
+            )
+
+        location = assignment.location(asset_name)
+        queue_code = int(dag.queue_binding[i])
+        managed[location].append(
+            ManagedAssetPlan(
+                name=asset_name,
+                deps=tuple(dependency_assets),
+                tags=_managed_tags(
+                    location,
+                    next_sensor_index(location),
+                    dag.queue_bindings[queue_code] if queue_code >= 0 else "",
+                ),
+                partition_seconds=partition_seconds,
+                max_contiguous_seconds=max_contiguous_seconds,
+                max_partitions_per_run=_max_partitions_per_run(
+                    partition_seconds, max_contiguous_seconds
+                ),
+                start_date=str(dag.start_date[i]),
+                end_date=str(dag.end_date[i]),
+            )
+        )
+
+    return {
+        loc: LocationPlan(
+            location=loc, source_assets=tuple(sources[loc]), managed_assets=tuple(managed[loc])
+        )
+        for loc in sources
+    }
+
+
+@dataclass
+class _PlannerState:
+    """
+    State carried between chunks of rows.
+
+    :param sources: Sources planned so far and their owning locations.
+    :param assets_per_location: Assets planned so far per location (index 0 unused).
+    """
+
+    sources: SourceAssetIndex
+    assets_per_location: np.ndarray
+
+    @classmethod
+    def empty(
+        cls, dag: DagSnapshot, num_locations: int, source_index: SourceAssetIndex | None = None
+    ) -> "_PlannerState":
+        return cls(
+            sources=source_index if source_index is not None else SourceAssetIndex.empty(dag),
+            assets_per_location=np.zeros(num_locations + 1, dtype=np.int64),
+        )
+
+
+def _to_asset_names(names: np.ndarray) -> list[str]:
+    # np.char.replace can't size its output for an empty array
+    if not len(names):
+        return []
+    return np.char.decode(np.char.replace(names, b".", b"_"), "utf-8").tolist()
+
+
+def _plan_rows(
+    dag: DagSnapshot,
+    assignment: LocationAssignment,
+    start: int,
+    stop: int,
+    state: _PlannerState,
+    location_table_path: Path | None,
+    locations_to_plan: Collection[int],
+    sensor_ranges: dict[int, range] | None,
+) -> dict[int, tuple[list[SourceAssetPlan], list[ManagedAssetPlan]]]:
+    """
+    Whole-column planning of dataset rows ``start:stop``; only the final plan objects are built
+    row by row. Planning all rows at once or in consecutive chunks gives the same result.
+
+    Assets are spread round-robin over their location's ``sensor_ranges``; without ranges, the
+    sensor index tag holds the asset's 1-based position among its location's assets.
+    """
+    num_locations = assignment.num_locations
+    num_datasets = dag.num_datasets
+    rows = np.arange(start, stop)
+
+    # Skip managed parents that don't have their own rows in the CSV
+    parent_indptr = np.asarray(dag.parent_indptr[start : stop + 1])
+    parent_indices = np.asarray(dag.parent_indices[parent_indptr[0] : parent_indptr[-1]])
+    parent_is_managed = np.char.startswith(np.asarray(dag.names[parent_indices]), b"managed.")
+    keep = ~(parent_is_managed & (parent_indices >= num_datasets))
+    edge_rows = np.repeat(rows, np.diff(parent_indptr))[keep]
+    dep_indices = parent_indices[keep]
+    dep_is_source = ~parent_is_managed[keep]
+    dep_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edge_rows - start, minlength=len(rows)), out=dep_indptr[1:])
+
+    # Sources are owned by the location their name hashes to and partitioned like the first
+    # dataset that references them
+    source_edges = np.flatnonzero(dep_is_source)
+    source_indices, first = np.unique(dep_indices[source_edges], return_index=True)
+    first_edges = source_edges[first]
+    new_sources = ~state.sources.is_planned(source_indices)
+    source_indices, first_edges = source_indices[new_sources], first_edges[new_sources]
+    order = np.argsort(first_edges, kind="stable")
+    source_indices, first_edges = source_indices[order], first_edges[order]
+    source_rows = edge_rows[first_edges]
+
+    # Only names that become assets in this chunk need a location
+    located = np.concatenate([rows, source_indices])
+    locations = assignment.locations(
+        _to_asset_names(np.asarray(dag.names[located])), location_table_path
+    )
+    row_locations, source_locations = locations[: len(rows)], locations[len(rows) :]
+    state.sources.add(source_indices, source_locations)
+
+    # Sensor indexes count assets per location in creation order: a row's new sources, then the row
+    event_rows = np.concatenate([source_rows, rows])
+    event_kind = np.concatenate([np.zeros(len(source_rows)), np.ones(len(rows))])
+    event_order = np.lexsort((event_kind, event_rows))
+    event_locations = np.concatenate([source_locations, row_locations])[event_order]
+    sensor_indexes = np.empty(len(event_order), dtype=np.int64)
+    for loc in range(1, num_locations + 1):
+        in_location = event_locations == loc
+        count = np.count_nonzero(in_location)
+        offset = state.assets_per_location[loc]
+        ordinals = np.arange(offset + 1, offset + count + 1)
+        if sensor_ranges is not None:
+            ordinals = sensor_ranges[loc].start + ordinals % len(sensor_ranges[loc])
+        sensor_indexes[event_order[in_location]] = ordinals
+        state.assets_per_location[loc] += count
+    source_sensor_indexes = sensor_indexes[: len(source_rows)]
+    row_sensor_indexes = sensor_indexes[len(source_rows) :]
+
+    # Backfill limits
+    partition_seconds = np.asarray(dag.partition_seconds[start:stop])
+    max_contiguous_seconds = np.asarray(dag.max_contiguous_seconds[start:stop])
+    has_limit = ~np.isnan(max_contiguous_seconds) & (partition_seconds > 0)
+    ratio = np.divide(
+        max_contiguous_seconds,
+        partition_seconds,
+        out=np.ones(len(rows)),
+        where=has_limit,
+    )
+    max_partitions_per_run = np.maximum(1, np.trunc(ratio)).astype(np.int64)
+
+    row_names = _to_asset_names(np.asarray(dag.names[rows]))
+    source_names = _to_asset_names(np.asarray(dag.names[source_indices]))
+    dep_names = _to_asset_names(np.asarray(dag.names[dep_indices]))
+    queue_bindings = list(dag.queue_bindings) + [""]
+    queue_codes = np.asarray(dag.queue_binding[start:stop]).tolist()
+    dep_indptr = dep_indptr.tolist()
+    partition_seconds_list = partition_seconds.tolist()
+    max_contiguous_seconds = max_contiguous_seconds.tolist()
+    max_partitions_per_run = max_partitions_per_run.tolist()
+    start_dates = np.datetime_as_string(np.asarray(dag.start_date[start:stop]), unit="D").tolist()
+    end_dates = np.datetime_as_string(np.asarray(dag.end_date[start:stop]), unit="D").tolist()
+    source_sensor_indexes = source_sensor_indexes.tolist()
+    row_sensor_indexes = row_sensor_indexes.tolist()
+    source_first_rows = (source_rows - start).tolist()
+
+    planned = {}
+    for loc in locations_to_plan:
+        planned[loc] = (
+            [
+                SourceAssetPlan(
+                    name=source_names[s],
+                    tags=_source_tags(loc, source_sensor_indexes[s]),
+                    partition_seconds=partition_seconds_list[source_first_rows[s]],
+                )
+                for s in np.flatnonzero(source_locations == loc).tolist()
+            ],
+            [
+                ManagedAssetPlan(
+                    name=row_names[i],
+                    deps=tuple(dep_names[dep_indptr[i] : dep_indptr[i + 1]]),
+                    tags=_managed_tags(loc, row_sensor_indexes[i], queue_bindings[queue_codes[i]]),
+                    partition_seconds=partition_seconds_list[i],
+                    max_contiguous_seconds=max_contiguous_seconds[i],
+                    max_partitions_per_run=max_partitions_per_run[i],
+                    start_date=start_dates[i],
+                    end_date=end_dates[i],
+                )
+                for i in np.flatnonzero(row_locations == loc).tolist()
+            ],
+        )
+    return planned
+
+
+def _plan_locations_vectorized(
+    dag: DagSnapshot,
+    assignment: LocationAssignment,
+    location_table_path: Path | None,
+    source_index: SourceAssetIndex,
+    sensor_ranges: dict[int, range] | None,
+) -> dict[int, LocationPlan]:
+    """Whole-column planner over all rows at once."""
+    locations = range(1, assignment.num_locations + 1)
+    state = _PlannerState.empty(dag, assignment.num_locations, source_index)
+    planned = _plan_rows(
+        dag, assignment, 0, dag.num_datasets, state, location_table_path, locations, sensor_ranges
+    )
+    return {
+        loc: LocationPlan(
+            location=loc, source_assets=tuple(planned[loc][0]), managed_assets=tuple(planned[loc][1])
+        )
+        for loc in locations
+    }
+
+
+def plan_locations(
+    dag: DagSnapshot,
+    assignment: LocationAssignment = LocationAssignment(),
+    mode: PlannerMode = PlannerMode.VECTORIZED,
+    location_table_path: Path | None = None,
+    source_index: SourceAssetIndex | None = None,
+    sensor_layout: SensorLayout | None = None,
+) -> dict[int, LocationPlan]:
+    """
+    Walk the DAG once and split it into per-location plans.
+
+    :param dag: The DAG snapshot.
+    :param assignment: Asset -> location assignment.
+    :param mode: Planner implementation. Both produce identical plans; compare them with
+        ``LocationPlan.to_json`` since a missing MAX_CONTIGUOUS_SECONDS is NaN.
+    :param location_table_path: Optional persisted name -> location table used by the vectorized planner.
+    :param source_index: Empty index over ``dag`` to fill with the planned sources and their owning
+        locations, for callers that want to query it afterwards.
+    :param sensor_layout: Sensor count and per-location sensor ranges; assets are spread
+        round-robin over their location's sensors. Defaults to the default sensor count split
+        across ``assignment.num_locations``.
+    :return: Mapping of location number to its plan.
+    """
+    if source_index is None:
+        source_index = SourceAssetIndex.empty(dag)
+    if sensor_layout is None:
+        sensor_layout = SensorLayout(num_locations=assignment.num_locations)
+    # Ranges sized by asset counts are only known once every location is planned
+    sensor_ranges = None if sensor_layout.scales_with_assets else sensor_layout.ranges()
+    if mode == PlannerMode.REFERENCE:
+        plans = _plan_locations_reference(dag, assignment, source_index, sensor_ranges)
+    else:
+        plans = _plan_locations_vectorized(
+            dag, assignment, location_table_path, source_index, sensor_ranges
+        )
+    return _with_sensor_ranges(plans, sensor_layout, retag=sensor_ranges is None)
+
+
+def _with_sensor_ranges(
+    plans: dict[int, LocationPlan], sensor_layout: SensorLayout, retag: bool
+) -> dict[int, LocationPlan]:
+    """Record each location's sensor range on its plan, first mapping ordinal tags into it."""
+    ranges = sensor_layout.ranges(
+        {loc: len(plan.source_assets) + len(plan.managed_assets) for loc, plan in plans.items()}
+    )
+
+    def with_index(asset, sensor_indexes: range):
+        index = round_robin_index(sensor_indexes, int(asset.tags[SENSOR_INDEX_TAG]))
+        return replace(asset, tags={**asset.tags, SENSOR_INDEX_TAG: str(index)})
+
+    located = {}
+    for loc, plan in plans.items():
+        sensor_indexes = ranges[loc]
+        if retag:
+            plan = replace(
+                plan,
+                source_assets=tuple(with_index(a, sensor_indexes) for a in plan.source_assets),
+                managed_assets=tuple(with_index(a, sensor_indexes) for a in plan.managed_assets),
+            )
+        located[loc] = replace(
+            plan, first_sensor_index=sensor_indexes.start, num_sensors=len(sensor_indexes)
+        )
+    return located
+
+
+@cache
+def _planner_source_sha256() -> str:
+    # The package version is not bumped on every edit, and is absent where the package is copied
+    # into a location instead of installed, so the planner's own sources are hashed instead
+    digest = hashlib.sha256()
+    for module in _PLANNER_MODULES:
+        digest.update((Path(__file__).parent / f"{module}.py").read_bytes())
+    return digest.hexdigest()
+
+
+def plan_cache_fingerprint(csv_path: Path, config: PerformanceConfig) -> dict:
+    """
+    Everything a set of plans depends on.
+
+    Only the settings ``plan_configured_locations`` reads are included, so toggling build-time
+    settings (queue pools, asset grouping, the automation condition, streaming, ...) keeps the
+    cached plans. The partition window only matters through its length, and only to budgeted plans
+    and cost-based sharding.
+
+    :param csv_path: Path to the DAG CSV.
+    :param config: Performance configuration the plans are built for.
+    :return: JSON-serializable fingerprint of the plans' inputs.
+    """
+    assignment = config.location_assignment
+    budgeted = config.partition_mode == PartitionMode.TPS_BUDGETED
+    windowed = budgeted or config.sensor_sharding == SensorSharding.COST
+    return {
+        "format_version": PLAN_FORMAT_VERSION,
+        "planner_sha256": _planner_source_sha256(),
+        "dag_sha256": file_sha256(csv_path),
+        "config": config.model_dump(mode="json", include=_PLAN_SETTINGS),
+        "partition_budget": config.partition_budget if budgeted else None,
+        "window_seconds": (
+            int((config.end_date - config.start_date).total_seconds()) if windowed else None
+        ),
+        "assignment_table_sha256": (
+            file_sha256(assignment.table_path)
+            if assignment.strategy == AssignmentStrategy.TABLE
+            else None
+        ),
+    }
+
+
+def plan_cache_key(csv_path: Path, config: PerformanceConfig) -> str:
+    """
+    Cache key for a set of plans: changes whenever the DAG, the configuration, the planner's code or
+    the plan format does.
+
+    :param csv_path: Path to the DAG CSV.
+    :param config: Performance configuration the plans are built for.
+    :return: Hex digest identifying the plans.
+    """
+    fingerprint = json.dumps(plan_cache_fingerprint(csv_path, config), sort_keys=True)
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+def _plan_cache_file(cache_dir: Path, key: str, location: int) -> Path:
+    return cache_dir / f"plan-{key[:16]}-location_{location}.json"
+
+
+def _read_cached_plan(cache_file: Path, key: str, location: int) -> LocationPlan | None:
+    try:
+        entry = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+    # The file name only holds a key prefix; the entry records the full key and location
+    if entry.get("key") != key or entry.get("location") != location:
+        return None
+    return LocationPlan.from_dict(entry["plan"])
+
+
+def _write_cached_plans(
+    cache_dir: Path, key: str, fingerprint: dict, plans: dict[int, LocationPlan]
+) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for loc, plan in plans.items():
+        target = _plan_cache_file(cache_dir, key, loc)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        entry = {"key": key, "location": loc, "fingerprint": fingerprint, "plan": asdict(plan)}
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, target)
+
+
+def evict_stale_plans(cache_dir: Path, keep: int, current_key: str | None = None) -> list[Path]:
+    """
+    Delete all but the ``keep`` most recently written generations of cached plans.
+
+    :param cache_dir: Directory holding cached plans.
+    :param keep: Number of generations (cache keys) to keep.
+    :param current_key: Key that is always kept, whatever its age.
+    :return: Deleted files.
+    """
+    generations: dict[str, list[Path]] = {}
+    for path in cache_dir.glob("plan-*"):
+        generations.setdefault(path.name.split("-")[1], []).append(path)
+
+    def newest(prefix: str) -> float:
+        return max(path.stat().st_mtime for path in generations[prefix])
+
+    current_prefix = current_key[:16] if current_key else None
+    by_age = sorted(generations, key=lambda prefix: (prefix != current_prefix, -newest(prefix)))
+    deleted = []
+    for prefix in by_age[keep:]:
+        for path in generations[prefix]:
+            path.unlink(missing_ok=True)
+            deleted.append(path)
+    return deleted
+
+
+def plan_configured_locations(
+    dag: DagSnapshot, csv_path: Path, config: PerformanceConfig = PERF_CONFIG
+) -> dict[int, LocationPlan]:
+    """
+    Plan every location as ``config`` describes: split the DAG, then apply the partition budget
+    and cost-based sensor sharding when they are enabled. A budget that coarsens any asset, or
+    cannot be met, is reported through the Dagster logger.
+
+    :param dag: The DAG snapshot.
+    :param csv_path: Path to the DAG CSV; its location table is read from the same directory.
+    :param config: Performance configuration the plans are built for.
+    :return: Mapping of location number to its plan.
+    """
+    plans = plan_locations(
+        dag,
+        config.location_assignment,
+        config.planner_mode,
+        location_table_path=csv_path.with_name(LOCATION_TABLE_PATH.name),
+        sensor_layout=config.sensor_layout,
+    )
+    window_seconds = int((config.end_date - config.start_date).total_seconds())
+    if config.partition_mode == PartitionMode.TPS_BUDGETED:
+        plans, report = apply_partition_budget(plans, config.partition_budget, window_seconds)
+        if not report.within_budget:
+            get_dagster_logger().warning(report.summary())
+        elif report.assets_after != report.assets_before:
+            get_dagster_logger().info(report.summary())
+    if config.sensor_sharding == SensorSharding.COST:
+        plans = apply_cost_sharding(plans, window_seconds / SECONDS_PER_DAY)
+    return plans
+
+
+def load_location_plan(
+    location: int,
+    csv_path: Path | None = None,
+    config: PerformanceConfig = PERF_CONFIG,
+    cache_dir: Path | None = None,
+) -> LocationPlan:
+    """
+    Load a location's plan from the cache, planning every location in one pass on a miss.
+
+    Cache entries are keyed by ``plan_cache_key``; after a miss, older generations beyond
+    ``config.plan_cache_keep`` are evicted. ``config.plan_cache`` turns the cache off.
+
+    :param location: Location number (1-5).
+    :param csv_path: Path to the DAG CSV (defaults to ``config.dag_path``).
+    :param config: Performance configuration the plan is built for.
+    :param cache_dir: Directory holding cached plans (defaults to ``config.plan_cache_dir``).
+    :return: The location's plan.
+    """
+    csv_path = csv_path or config.dag_path
+    cache_dir = cache_dir or config.plan_cache_dir
+    if config.plan_cache:
+        key = plan_cache_key(csv_path, config)
+        cached = _read_cached_plan(_plan_cache_file(cache_dir, key, location), key, location)
+        if cached is not None:
+            return cached
+
+    plans = plan_configured_locations(load_dag(csv_path), csv_path, config)
+    if config.plan_cache:
+        try:
+            _write_cached_plans(cache_dir, key, plan_cache_fingerprint(csv_path, config), plans)
+            evict_stale_plans(cache_dir, config.plan_cache_keep, current_key=key)
+        except OSError:
+            # Read-only deployments plan on every start
+            pass
+
+    return plans[location]
+
+
+def iter_location_plan(
+    location: int,
+    chunk_size: int,
+    csv_path: Path | None = None,
+    config: PerformanceConfig = PERF_CONFIG,
+) -> Iterator[list[SourceAssetPlan | ManagedAssetPlan]]:
+    """
+    Stream a location's planned assets in chunks of DAG rows, reading the memory-mapped snapshot
+    incrementally so only one chunk's intermediate arrays are alive at a time.
+
+    Cost-based sensor sharding, partition budgets, sensor counts sized by assets and the reference
+    planner need the whole DAG up front, so in those modes the full plan is loaded and then handed
+    out in chunks.
+
+    :param location: Location number (1-5).
+    :param chunk_size: Number of DAG rows planned per chunk.
+    :param csv_path: Path to the DAG CSV (defaults to ``config.dag_path``).
+    :param config: Performance configuration the plan is built for.
+    :return: Iterator over chunks of the location's planned assets, in plan order.
+    """
+    csv_path = csv_path or config.dag_path
+    if (
+        config.sensor_sharding == SensorSharding.COST
+        or config.partition_mode == PartitionMode.TPS_BUDGETED
+        or config.sensor_layout.scales_with_assets
+        or config.planner_mode == PlannerMode.REFERENCE
+    ):
+        plan = load_location_plan(location, csv_path, config)
+        assets = [*plan.source_assets, *plan.managed_assets]
+        del plan
+        for start in range(0, len(assets), chunk_size):
+            yield assets[start : start + chunk_size]
+        return
+
+    dag = load_dag(csv_path)
+    assignment = config.location_assignment
+    state = _PlannerState.empty(dag, assignment.num_locations)
+    location_table_path = csv_path.with_name(LOCATION_TABLE_PATH.name)
+    sensor_ranges = config.sensor_layout.ranges()
+    for start in range(0, dag.num_datasets, chunk_size):
+        stop = min(start + chunk_size, dag.num_datasets)
+        sources, managed = _plan_rows(
+            dag, assignment, start, stop, state, location_table_path, [location], sensor_ranges
+        )[location]
+        if sources or managed:
+            yield [*sources, *managed]
@@ -2,4 +2,24 @@ from pathlib import Path
 
 DATETIME_FORMAT = "%Y-%m-%dT%H-%M-%S"
 ASSET_TYPE = "full_deep_purple_dummy_dag"
+# Asset tags read by the sensors and the concurrency pools
+SENSOR_INDEX_TAG = "evaluation_trigger_sensor_index"
+QUEUE_BINDING_TAG = "queue_binding"
+
 DAG_CSV_PATH = Path(__file__).parent.parent.parent.parent / "dag.csv.gz"
+PLAN_CACHE_DIR = DAG_CSV_PATH.parent / ".deep_purple_cache"
+LOCATION_TABLE_PATH = DAG_CSV_PATH.with_name("dag.locations.npz")
+ASSIGNMENT_TABLE_PATH = DAG_CSV_PATH.with_name("dag.assignment.npz")
+
+# Partition duration in seconds -> cron schedule; other durations are partitioned daily
+PARTITION_CRON_SCHEDULES = {
+    300: "*/5 * * * *",  # Every 5 minutes
+    600: "*/10 * * * *",  # Every 10 minutes
+    900: "*/15 * * * *",  # Every 15 minutes
+    1200: "*/20 * * * *",  # Every 20 minutes
+    1800: "*/30 * * * *",  # Every 30 minutes
+    3600: "0 * * * *",  # Every hour
+    10800: "0 */3 * * *",  # Every 3 hours
+    21600: "0 */6 * * *",  # Every 6 hours
+    86400: "0 0 * * *",  # Daily
+}
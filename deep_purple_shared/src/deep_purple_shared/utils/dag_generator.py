@@ -0,0 +1,272 @@
+"""
+Synthetic DAG generator for scale testing.
+
+Writes CSVs with the same schema as ``DAG_CSV_PATH`` at any size, with distributions fitted to a
+reference DAG (``dag.csv.gz`` by default):
+
+- depth: every dataset gets a level (longest path from the sources) drawn from the reference
+  levels; its managed parents come from lower levels, with the reference's level gaps
+- fan-in: per dataset, the number of source, managed and dangling (managed, without their own rows)
+  parents is resampled jointly from the reference
+- popularity: the number of datasets reading each source or managed dataset follows the reference
+  distribution, so a few sources fan out to thousands of datasets
+- partition granularity, MAX_CONTIGUOUS_SECONDS, QUEUE_BINDING and START/END_DATE are resampled
+  jointly per dataset
+
+The same profile, size and seed always produce the same file. Point the project at the result with
+``DEEP_PURPLE_DAG_PATH``::
+
+    python -m deep_purple_shared.utils.dag_generator --datasets 100000 --output dag_100k.csv.gz --snapshot
+    DEEP_PURPLE_DAG_PATH=dag_100k.csv.gz python -m deep_purple_shared.benchmarks.load_suite
+"""
+
+import argparse
+from dataclasses import dataclass
+from graphlib import TopologicalSorter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from deep_purple_shared.utils.constants import DAG_CSV_PATH
+from deep_purple_shared.utils.dag_snapshot import DagSnapshot, build_snapshot, load_dag
+
+CSV_COLUMNS = (
+    "DATASET_NAME",
+    "PARENT_DATASET_NAME",
+    "END_DATE",
+    "START_DATE",
+    "QUEUE_BINDING",
+    "PARTITION_SECONDS",
+    "MAX_CONTIGUOUS_SECONDS",
+)
+
+
+@dataclass(frozen=True)
+class DagProfile:
+    """
+    Empirical distributions of a reference DAG, one entry per reference dataset unless noted.
+
+    :param levels: Longest path from the sources to each dataset.
+    :param source_fan_in: Number of source parents.
+    :param managed_fan_in: Number of managed parents that have their own rows.
+    :param dangling_fan_in: Number of managed parents without their own rows.
+    :param level_gaps: Child level minus parent level, one entry per managed edge.
+    :param source_degrees: Number of datasets reading each source, one entry per source.
+    :param managed_degrees: Number of datasets reading each dataset.
+    :param sources_per_dataset: Distinct sources relative to the number of datasets.
+    :param dangling_per_dataset: Distinct dangling managed parents relative to the number of datasets.
+    :param partition_seconds: PARTITION_SECONDS.
+    :param max_contiguous_seconds: MAX_CONTIGUOUS_SECONDS (NaN when missing).
+    :param queue_bindings: QUEUE_BINDING.
+    :param start_dates: START_DATE.
+    :param end_dates: END_DATE.
+    """
+
+    levels: np.ndarray
+    source_fan_in: np.ndarray
+    managed_fan_in: np.ndarray
+    dangling_fan_in: np.ndarray
+    level_gaps: np.ndarray
+    source_degrees: np.ndarray
+    managed_degrees: np.ndarray
+    sources_per_dataset: float
+    dangling_per_dataset: float
+    partition_seconds: np.ndarray
+    max_contiguous_seconds: np.ndarray
+    queue_bindings: np.ndarray
+    start_dates: np.ndarray
+    end_dates: np.ndarray
+
+    @property
+    def num_datasets(self) -> int:
+        return len(self.levels)
+
+
+def _levels(num_datasets: int, children: np.ndarray, parents: np.ndarray) -> np.ndarray:
+    """Longest path from a dataset without managed parents, for every dataset."""
+    parents_of: list[list[int]] = [[] for _ in range(num_datasets)]
+    for child, parent in zip(children.tolist(), parents.tolist()):
+        parents_of[child].append(parent)
+    sorter = TopologicalSorter({i: parents_of[i] for i in range(num_datasets)})
+    levels = np.zeros(num_datasets, dtype=np.int64)
+    for node in sorter.static_order():
+        if parents_of[node]:
+            levels[node] = max(levels[p] for p in parents_of[node]) + 1
+    return levels
+
+
+def fit_profile(dag: DagSnapshot) -> DagProfile:
+    """
+    Fit the generator's distributions to a DAG.
+
+    :param dag: The reference DAG snapshot.
+    :return: The fitted profile.
+    """
+    num_datasets = dag.num_datasets
+    names = np.asarray(dag.names)
+    parent_indices = np.asarray(dag.parent_indices)
+    rows = np.repeat(np.arange(num_datasets), np.diff(np.asarray(dag.parent_indptr)))
+    is_source = ~np.char.startswith(names, b"managed.")[parent_indices]
+    is_managed = ~is_source & (parent_indices < num_datasets)
+    is_dangling = ~is_source & ~is_managed
+
+    levels = _levels(num_datasets, rows[is_managed], parent_indices[is_managed])
+    source_degrees = np.bincount(parent_indices[is_source])
+    source_degrees = source_degrees[source_degrees > 0]
+
+    queue_bindings = np.asarray(list(dag.queue_bindings) + [""], dtype=object)
+    return DagProfile(
+        levels=levels,
+        source_fan_in=np.bincount(rows[is_source], minlength=num_datasets),
+        managed_fan_in=np.bincount(rows[is_managed], minlength=num_datasets),
+        dangling_fan_in=np.bincount(rows[is_dangling], minlength=num_datasets),
+        level_gaps=levels[rows[is_managed]] - levels[parent_indices[is_managed]],
+        source_degrees=source_degrees,
+        managed_degrees=np.bincount(parent_indices[is_managed], minlength=num_datasets),
+        sources_per_dataset=len(source_degrees) / num_datasets,
+        dangling_per_dataset=len(np.unique(parent_indices[is_dangling])) / num_datasets,
+        partition_seconds=np.asarray(dag.partition_seconds),
+        max_contiguous_seconds=np.asarray(dag.max_contiguous_seconds),
+        queue_bindings=queue_bindings[np.asarray(dag.queue_binding)],
+        start_dates=np.asarray(dag.start_date),
+        end_dates=np.asarray(dag.end_date),
+    )
+
+
+def _random_names(rng: np.random.Generator, prefix: str, count: int) -> np.ndarray:
+    digests = np.frombuffer(rng.bytes(16 * count), dtype=np.uint8).reshape(count, 16)
+    return np.array([f"{prefix}.{digest.tobytes().hex()}" for digest in digests], dtype=object)
+
+
+def _edges(counts: np.ndarray) -> np.ndarray:
+    """Child id of every edge, given the number of edges per child."""
+    return np.repeat(np.arange(len(counts)), counts)
+
+
+def generate_dag(profile: DagProfile, num_datasets: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic DAG following the profile's distributions.
+
+    :param profile: Distributions fitted with ``fit_profile``.
+    :param num_datasets: Number of managed datasets to generate.
+    :param seed: Random seed; the same inputs always generate the same DAG.
+    :return: One row per (dataset, parent) edge, with the columns of the DAG CSV.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Each generated dataset copies the fan-in, level and attributes of a reference dataset.
+    # Datasets are numbered by level, so every level is a contiguous id range.
+    template = rng.integers(0, profile.num_datasets, size=num_datasets)
+    template = template[np.argsort(profile.levels[template], kind="stable")]
+    levels = profile.levels[template]
+    level_starts = np.searchsorted(levels, np.arange(levels.max() + 2))
+
+    num_sources = max(1, round(profile.sources_per_dataset * num_datasets))
+    num_dangling = max(1, round(profile.dangling_per_dataset * num_datasets))
+    # Parent codes: sources, then datasets, then dangling managed parents
+    dataset_offset, dangling_offset = num_sources, num_sources + num_datasets
+
+    # Sources are drawn by popularity, so a few of them feed thousands of datasets
+    source_weights = rng.choice(profile.source_degrees, size=num_sources).astype(np.float64)
+    source_weights /= source_weights.sum()
+    source_children = _edges(profile.source_fan_in[template])
+    source_parents = rng.choice(num_sources, size=len(source_children), p=source_weights)
+
+    # Managed parents come from lower levels, drawn by popularity within the level; the first one
+    # sits one level up, which is what gives the dataset its level
+    managed_children = _edges(np.where(levels > 0, profile.managed_fan_in[template], 0))
+    child_levels = levels[managed_children]
+    gaps = np.clip(rng.choice(profile.level_gaps, size=len(managed_children)), 1, child_levels)
+    first = np.ones(len(managed_children), dtype=bool)
+    first[1:] = managed_children[1:] != managed_children[:-1]
+    gaps[first] = 1
+    parent_levels = child_levels - gaps
+    starts, stops = level_starts[parent_levels], level_starts[parent_levels + 1]
+    # Small DAGs can miss some levels entirely
+    populated = stops > starts
+    managed_children = managed_children[populated]
+    starts, stops = starts[populated], stops[populated]
+    # A small floor keeps levels made only of leaves in the reference selectable
+    cumulative = np.concatenate([[0.0], np.cumsum(profile.managed_degrees[template] + 0.01)])
+    low, high = cumulative[starts], cumulative[stops]
+    picks = np.searchsorted(cumulative, low + rng.random(len(starts)) * (high - low), side="right") - 1
+    managed_parents = dataset_offset + np.clip(picks, starts, stops - 1)
+
+    dangling_children = _edges(profile.dangling_fan_in[template])
+    dangling_parents = dangling_offset + rng.integers(0, num_dangling, size=len(dangling_children))
+
+    children = np.concatenate([source_children, managed_children, dangling_children])
+    parents = np.concatenate([source_parents, managed_parents, dangling_parents])
+    # Every dataset in the CSV has at least one parent
+    orphans = np.setdiff1d(np.arange(num_datasets), children)
+    children = np.concatenate([children, orphans])
+    parents = np.concatenate([parents, rng.choice(num_sources, size=len(orphans), p=source_weights)])
+
+    # CSV order is not topological: shuffle the datasets, keeping each dataset's rows together
+    rank = rng.permutation(num_datasets)
+    num_codes = dangling_offset + num_dangling
+    edge_keys = np.unique(rank[children].astype(np.int64) * num_codes + parents)
+    by_rank = np.argsort(rank)
+    children, parents = by_rank[edge_keys // num_codes], edge_keys % num_codes
+
+    names = np.concatenate(
+        [
+            _random_names(rng, "source", num_sources),
+            _random_names(rng, "managed", num_datasets),
+            _random_names(rng, "managed", num_dangling),
+        ]
+    )
+    edge_templates = template[children]
+    return pd.DataFrame(
+        {
+            "DATASET_NAME": names[dataset_offset + children],
+            "PARENT_DATASET_NAME": names[parents],
+            "END_DATE": pd.to_datetime(profile.end_dates[edge_templates]).strftime("%Y-%m-%d"),
+            "START_DATE": pd.to_datetime(profile.start_dates[edge_templates]).strftime("%Y-%m-%d"),
+            "QUEUE_BINDING": profile.queue_bindings[edge_templates],
+            "PARTITION_SECONDS": profile.partition_seconds[edge_templates],
+            "MAX_CONTIGUOUS_SECONDS": pd.array(
+                profile.max_contiguous_seconds[edge_templates], dtype="Int64"
+            ),
+        },
+        columns=list(CSV_COLUMNS),
+    )
+
+
+def write_dag_csv(frame: pd.DataFrame, output: Path) -> Path:
+    """
+    Write a generated DAG, gzip compressed when the file name ends in ``.gz``.
+
+    :param frame: Output of ``generate_dag``.
+    :param output: Target CSV path.
+    :return: Path of the written file.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Fixed mtime so equal DAGs give byte-identical files (and equal snapshot/plan cache keys)
+    compression = {"method": "gzip", "mtime": 0} if output.suffix == ".gz" else None
+    frame.to_csv(output, index=False, compression=compression)
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic DAG CSV.")
+    parser.add_argument("--datasets", type=int, required=True, help="Number of managed datasets")
+    parser.add_argument("--output", type=Path, required=True, help="CSV to write (.csv or .csv.gz)")
+    parser.add_argument("--reference", type=Path, default=DAG_CSV_PATH, help="DAG CSV to fit")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--snapshot", action="store_true", help="Also compile a DAG snapshot")
+    args = parser.parse_args()
+
+    frame = generate_dag(fit_profile(load_dag(args.reference)), args.datasets, args.seed)
+    write_dag_csv(frame, args.output)
+    print(
+        f"Wrote {args.output}: {args.datasets} datasets, "
+        f"{frame['PARENT_DATASET_NAME'].nunique()} distinct parents, {len(frame)} rows"
+    )
+    if args.snapshot:
+        print(f"Wrote {build_snapshot(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
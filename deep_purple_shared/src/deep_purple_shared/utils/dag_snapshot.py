@@ -0,0 +1,331 @@
+"""
+Compiled, memory-mappable snapshot of the Deep Purple DAG.
+
+Parsing the gzip compressed CSV and regrouping it by dataset is the most expensive step of loading a
+code location, and every location repeats it on each start and reload. This module compiles the CSV
+once into a directory of ``.npy`` arrays that can be memory-mapped:
+
+- ``names.npy``: interned dataset names (datasets first, in CSV order, followed by parent-only names)
+- ``parent_indptr.npy`` / ``parent_indices.npy``: CSR parent adjacency (one row per dataset)
+- ``partition_seconds.npy``, ``max_contiguous_seconds.npy``, ``queue_binding.npy``,
+  ``start_date.npy``, ``end_date.npy``: typed per-dataset columns
+
+A ``manifest.json`` records the SHA-256 of the source CSV, so a stale snapshot is rebuilt automatically.
+When no snapshot exists, the loader falls back to compiling the CSV in memory.
+
+Build a snapshot with::
+
+    python -m deep_purple_shared.utils.dag_snapshot --csv dag.csv.gz
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from deep_purple_shared.utils.constants import DAG_CSV_PATH
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+CSV_SUFFIXES = (".csv.gz", ".csv")
+MANIFEST_FILE = "manifest.json"
+
+_ARRAY_FILES = (
+    "names",
+    "parent_indptr",
+    "parent_indices",
+    "partition_seconds",
+    "max_contiguous_seconds",
+    "queue_binding",
+    "start_date",
+    "end_date",
+)
+
+
+@dataclass(frozen=True)
+class DagSnapshot:
+    """
+    Columnar view of the DAG. Row ``i`` of every per-dataset column describes ``names[i]``.
+
+    :param names: Interned names as UTF-8 bytes; the first ``num_datasets`` entries are datasets.
+    :param parent_indptr: CSR row pointers into ``parent_indices`` (length ``num_datasets + 1``).
+    :param parent_indices: Indices into ``names`` for each dataset's de-duplicated parents.
+    :param partition_seconds: PARTITION_SECONDS per dataset (0 when missing).
+    :param max_contiguous_seconds: MAX_CONTIGUOUS_SECONDS per dataset (NaN when missing).
+    :param queue_binding: Codes into ``queue_bindings`` per dataset (-1 when missing).
+    :param start_date: START_DATE per dataset.
+    :param end_date: END_DATE per dataset.
+    :param queue_bindings: Distinct QUEUE_BINDING values.
+    :param source_sha256: SHA-256 of the CSV the snapshot was compiled from.
+    """
+
+    names: np.ndarray
+    parent_indptr: np.ndarray
+    parent_indices: np.ndarray
+    partition_seconds: np.ndarray
+    max_contiguous_seconds: np.ndarray
+    queue_binding: np.ndarray
+    start_date: np.ndarray
+    end_date: np.ndarray
+    queue_bindings: tuple[str, ...]
+    source_sha256: str
+
+    @property
+    def num_datasets(self) -> int:
+        return len(self.partition_seconds)
+
+    @cached_property
+    def decoded_names(self) -> list[str]:
+        """All interned names as Python strings."""
+        return np.char.decode(self.names, "utf-8").tolist()
+
+    def parents_of(self, dataset_index: int) -> list[str]:
+        """
+        Parent dataset names of a dataset, in order of first appearance in the CSV.
+
+        :param dataset_index: Row of the dataset in the snapshot.
+        :return: De-duplicated parent names.
+        """
+        names = self.decoded_names
+        start, end = self.parent_indptr[dataset_index], self.parent_indptr[dataset_index + 1]
+        return [names[i] for i in self.parent_indices[start:end]]
+
+    def parents_by_dataset(self) -> dict[str, list[str]]:
+        """
+        Equivalent of ``raw_data.groupby("DATASET_NAME")["PARENT_DATASET_NAME"].apply(list)``,
+        with duplicate parents removed.
+
+        :return: Mapping of dataset name to its parent names.
+        """
+        names = self.decoded_names
+        return {names[i]: self.parents_of(i) for i in range(self.num_datasets)}
+
+    def datasets_frame(self) -> "pd.DataFrame":
+        """
+        One row per dataset, with the columns the asset generators read from the CSV.
+
+        :return: DataFrame ordered like ``drop_duplicates(subset=["DATASET_NAME"])`` on the CSV.
+        """
+        import pandas as pd
+
+        queue_bindings = pd.Categorical.from_codes(
+            np.asarray(self.queue_binding), categories=list(self.queue_bindings)
+        )
+        return pd.DataFrame(
+            {
+                "DATASET_NAME": self.decoded_names[: self.num_datasets],
+                "END_DATE": np.asarray(self.end_date),
+                "START_DATE": np.asarray(self.start_date),
+                "QUEUE_BINDING": np.asarray(queue_bindings, dtype=object),
+                "PARTITION_SECONDS": np.asarray(self.partition_seconds),
+                "MAX_CONTIGUOUS_SECONDS": np.asarray(self.max_contiguous_seconds),
+            }
+        )
+
+
+def snapshot_path_for(csv_path: Path) -> Path:
+    """
+    Default snapshot location for a DAG CSV: a sibling directory, e.g. ``dag.csv.gz`` -> ``dag.snapshot``
+    and ``dag.v2.csv`` -> ``dag.v2.snapshot``.
+
+    :param csv_path: Path to the DAG CSV.
+    :return: Path of the snapshot directory.
+    """
+    stem = csv_path.name
+    for suffix in CSV_SUFFIXES:
+        if stem.endswith(suffix):
+            stem = stem.removesuffix(suffix)
+            break
+    return csv_path.with_name(stem + SNAPSHOT_SUFFIX)
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Content hash of a file, used to detect stale snapshots.
+
+    :param path: File to hash.
+    :return: Hex encoded SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compile_dag_csv(csv_path: Path) -> DagSnapshot:
+    """
+    Parse the DAG CSV into an in-memory snapshot.
+
+    :param csv_path: Path to the (optionally gzip compressed) DAG CSV.
+    :return: The compiled snapshot.
+    """
+    # Only compiling the CSV needs pandas; memory-mapped snapshots load without it
+    import pandas as pd
+
+    raw_data = pd.read_csv(csv_path)
+
+    datasets = raw_data.drop_duplicates(subset=["DATASET_NAME"]).reset_index(drop=True)
+    num_datasets = len(datasets)
+
+    # Intern names: datasets get codes 0..num_datasets-1 in CSV order, parent-only names follow.
+    codes, names = pd.factorize(
+        pd.concat([raw_data["DATASET_NAME"], raw_data["PARENT_DATASET_NAME"]], ignore_index=True)
+    )
+    edges = pd.DataFrame({"child": codes[: len(raw_data)], "parent": codes[len(raw_data) :]})
+    edges = edges[edges["parent"] >= 0].drop_duplicates()
+    edges = edges.iloc[np.argsort(edges["child"].to_numpy(), kind="stable")]
+
+    parent_indptr = np.zeros(num_datasets + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges["child"].to_numpy(), minlength=num_datasets), out=parent_indptr[1:])
+
+    queue_codes, queue_bindings = pd.factorize(datasets["QUEUE_BINDING"])
+
+    return DagSnapshot(
+        names=np.char.encode(np.asarray(names, dtype=str), "utf-8"),
+        parent_indptr=parent_indptr,
+        parent_indices=edges["parent"].to_numpy(dtype=np.int32),
+        partition_seconds=datasets["PARTITION_SECONDS"].fillna(0).to_numpy(dtype=np.int64),
+        max_contiguous_seconds=datasets["MAX_CONTIGUOUS_SECONDS"].to_numpy(dtype=np.float64),
+        queue_binding=queue_codes.astype(np.int16),
+        start_date=pd.to_datetime(datasets["START_DATE"]).to_numpy(dtype="datetime64[D]"),
+        end_date=pd.to_datetime(datasets["END_DATE"]).to_numpy(dtype="datetime64[D]"),
+        queue_bindings=tuple(str(q) for q in queue_bindings),
+        source_sha256=file_sha256(csv_path),
+    )
+
+
+def write_snapshot(snapshot: DagSnapshot, snapshot_path: Path) -> None:
+    """
+    Write a snapshot directory, replacing any existing one.
+
+    :param snapshot: The snapshot to write.
+    :param snapshot_path: Target directory.
+    """
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(tempfile.mkdtemp(prefix=snapshot_path.name, dir=snapshot_path.parent))
+    try:
+        for name in _ARRAY_FILES:
+            np.save(tmp_path / f"{name}.npy", np.asarray(getattr(snapshot, name)))
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "source_sha256": snapshot.source_sha256,
+            "num_names": len(snapshot.names),
+            "num_datasets": snapshot.num_datasets,
+            "num_edges": len(snapshot.parent_indices),
+            "queue_bindings": list(snapshot.queue_bindings),
+        }
+        (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+        shutil.rmtree(snapshot_path, ignore_errors=True)
+        tmp_path.rename(snapshot_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+
+def build_snapshot(csv_path: Path = DAG_CSV_PATH, snapshot_path: Path | None = None) -> Path:
+    """
+    Compile the DAG CSV and write it as a snapshot.
+
+    :param csv_path: Path to the DAG CSV.
+    :param snapshot_path: Target directory (defaults to ``snapshot_path_for(csv_path)``).
+    :return: Path of the written snapshot.
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+    write_snapshot(compile_dag_csv(csv_path), snapshot_path)
+    return snapshot_path
+
+
+def read_snapshot(snapshot_path: Path) -> DagSnapshot:
+    """
+    Memory-map an existing snapshot directory.
+
+    :param snapshot_path: Snapshot directory.
+    :return: The snapshot, backed by read-only memory maps.
+    :raises ValueError: If the snapshot is from another format, or was replaced while being read.
+    """
+    manifest_text = (snapshot_path / MANIFEST_FILE).read_text()
+    manifest = json.loads(manifest_text)
+    if manifest["format_version"] != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported DAG snapshot format {manifest['format_version']} at {snapshot_path}"
+        )
+    arrays = {name: np.load(snapshot_path / f"{name}.npy", mmap_mode="r") for name in _ARRAY_FILES}
+    # A rebuild in another process may have swapped the directory between the reads above
+    if (snapshot_path / MANIFEST_FILE).read_text() != manifest_text:
+        raise ValueError(f"DAG snapshot at {snapshot_path} was replaced while being read")
+    return DagSnapshot(
+        **arrays,
+        queue_bindings=tuple(manifest["queue_bindings"]),
+        source_sha256=manifest["source_sha256"],
+    )
+
+
+def _read_manifest_sha256(snapshot_path: Path) -> str | None:
+    try:
+        manifest = json.loads((snapshot_path / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return manifest.get("source_sha256")
+
+
+def load_dag(csv_path: Path = DAG_CSV_PATH, snapshot_path: Path | None = None) -> DagSnapshot:
+    """
+    Load the DAG, preferring a compiled snapshot over parsing the CSV.
+
+    - If a snapshot exists and matches the CSV's content hash, it is memory-mapped.
+    - If a snapshot exists but is stale (or from an older format), it is rebuilt and then loaded.
+    - If no snapshot exists, or another process is replacing it while it is read, the CSV is
+      compiled in memory.
+
+    :param csv_path: Path to the DAG CSV.
+    :param snapshot_path: Snapshot directory (defaults to ``snapshot_path_for(csv_path)``).
+    :return: The DAG snapshot.
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+    if not snapshot_path.exists():
+        return compile_dag_csv(csv_path)
+
+    if csv_path.exists() and _read_manifest_sha256(snapshot_path) != file_sha256(csv_path):
+        snapshot = compile_dag_csv(csv_path)
+        try:
+            write_snapshot(snapshot, snapshot_path)
+        except OSError:
+            # Read-only deployments still get a correct, if uncached, DAG
+            return snapshot
+
+    try:
+        return read_snapshot(snapshot_path)
+    except (OSError, ValueError):
+        # A rebuild elsewhere removes the old directory just before renaming the new one in
+        return compile_dag_csv(csv_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the Deep Purple DAG CSV into a snapshot.")
+    parser.add_argument("--csv", type=Path, default=DAG_CSV_PATH, help="Path to the DAG CSV")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot directory to write")
+    args = parser.parse_args()
+
+    snapshot_path = build_snapshot(args.csv, args.output)
+    snapshot = read_snapshot(snapshot_path)
+    print(
+        f"Wrote {snapshot_path}: {snapshot.num_datasets} datasets, {len(snapshot.names)} names, "
+        f"{len(snapshot.parent_indices)} parent edges"
+    )
+
+
+if __name__ == "__main__":
+    main()
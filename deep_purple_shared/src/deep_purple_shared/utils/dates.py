@@ -0,0 +1,80 @@
+"""
+Date helpers built on the standard library.
+
+Configuration and asset definitions only need "midnight today" arithmetic and formatting, so they use
+these instead of ``pandas.Timestamp``: pandas is only imported on the DAG-loading path.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from deep_purple_shared.utils.constants import DATETIME_FORMAT
+
+
+def start_of_day(moment: datetime | None = None) -> datetime:
+    """
+    Midnight of the given day, like ``pd.Timestamp.now().normalize()``.
+
+    :param moment: Any time of the day (defaults to now, local time).
+    :return: The day's midnight, naive like the input.
+    """
+    moment = moment or datetime.now()
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def utc_start_of_day() -> datetime:
+    """
+    :return: Midnight of the current UTC day, as a naive datetime.
+    """
+    return start_of_day(datetime.now(timezone.utc).replace(tzinfo=None))
+
+
+def snap_to_boundary(moment: datetime, boundary_days: int) -> datetime:
+    """
+    Round down to the closest boundary, boundaries being every ``boundary_days`` days since 1970-01-01.
+
+    Every process snapping a time within the same interval gets the same result, whenever it runs.
+
+    :param moment: The time to snap.
+    :param boundary_days: Distance between boundaries in days.
+    :return: Midnight of the boundary at or before ``moment``.
+    """
+    days = (moment.date() - date(1970, 1, 1)).days
+    return datetime.combine(date(1970, 1, 1), time()) + timedelta(days=days - days % boundary_days)
+
+
+def intersect_window(
+    start: datetime, end: datetime, first_day: date, last_day: date
+) -> tuple[datetime, datetime]:
+    """
+    Narrow a partitions window to the days a dataset is active.
+
+    :param start: Window start.
+    :param end: Window end (exclusive).
+    :param first_day: First active day.
+    :param last_day: Last active day (inclusive).
+    :return: The intersection, or ``(start, start)`` when the dataset isn't active in the window.
+    """
+    effective_start = max(start, datetime.combine(first_day, time()))
+    effective_end = min(end, datetime.combine(last_day + timedelta(days=1), time()))
+    if effective_end <= effective_start:
+        return start, start
+    return effective_start, effective_end
+
+
+def days_before(moment: datetime, n_days: int) -> datetime:
+    """
+    :param moment: Reference time.
+    :param n_days: Number of days to go back.
+    :return: ``moment`` minus ``n_days`` days.
+    """
+    return moment - timedelta(days=n_days)
+
+
+def format_partition_date(moment: datetime) -> str:
+    """
+    Format a datetime for partitions definitions.
+
+    :param moment: The datetime (``pd.Timestamp`` works as well).
+    :return: ``moment`` formatted with ``DATETIME_FORMAT``.
+    """
+    return moment.strftime(DATETIME_FORMAT)
@@ -0,0 +1,306 @@
+"""
+Offline, graph-aware assignment of assets to code locations.
+
+Hash-based assignment puts an asset and its parents in different locations for roughly
+``(n - 1) / n`` of all edges, and cross-location edges are the expensive ones for asset-graph
+resolution and automation evaluation. This module partitions the DAG to minimize cut edges
+under a balance constraint:
+
+1. Connected components are found with union-find. Components larger than a location's share
+   are split along a breadth-first ordering; the rest are bin-packed into the lightest location.
+2. Balanced label propagation then moves boundary assets to the location most of their
+   neighbours live in, as long as every location stays within ``imbalance`` of an even share.
+
+The result is written as a stable name -> location table (same format as
+``location_utils.write_location_table``) that ``AssignmentStrategy.TABLE`` consults::
+
+    python -m deep_purple_shared.utils.graph_partitioner --num-locations 5
+"""
+
+import argparse
+import math
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from deep_purple_shared.utils.constants import ASSIGNMENT_TABLE_PATH, DAG_CSV_PATH
+from deep_purple_shared.utils.dag_snapshot import DagSnapshot, load_dag
+from deep_purple_shared.utils.location_utils import get_asset_locations
+
+
+@dataclass(frozen=True)
+class AssetGraph:
+    """
+    Undirected asset graph in CSR form.
+
+    :param asset_names: Asset names, one per node.
+    :param indptr: CSR row pointers.
+    :param indices: Neighbour node ids.
+    :param num_edges: Number of (directed, de-duplicated) dependency edges.
+    """
+
+    asset_names: list[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    num_edges: int
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.asset_names)
+
+    def edges(self) -> tuple[np.ndarray, np.ndarray]:
+        """:return: Source and target node ids of every undirected edge, each listed once."""
+        rows = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        once = rows < self.indices
+        return rows[once], self.indices[once]
+
+
+@dataclass(frozen=True)
+class PartitionResult:
+    """
+    :param asset_names: Asset names, one per node.
+    :param locations: Location number (1-n) per asset.
+    :param cut_edges: Edges whose endpoints are in different locations.
+    :param total_edges: Edges in the graph.
+    :param hash_cut_edges: Cut edges under the MD5 modulo assignment, for comparison.
+    """
+
+    asset_names: list[str]
+    locations: np.ndarray
+    cut_edges: int
+    total_edges: int
+    hash_cut_edges: int
+
+    def summary(self) -> str:
+        sizes = np.bincount(self.locations)[1:].tolist()
+        return (
+            f"{len(self.asset_names)} assets, {self.total_edges} edges\n"
+            f"  cut edges: {self.cut_edges} ({self.cut_edges / max(self.total_edges, 1):.1%}), "
+            f"hash assignment: {self.hash_cut_edges} "
+            f"({self.hash_cut_edges / max(self.total_edges, 1):.1%})\n"
+            f"  assets per location: {sizes}"
+        )
+
+
+def build_asset_graph(dag: DagSnapshot) -> AssetGraph:
+    """
+    Build the undirected asset graph: datasets and source parents, linked by their dependencies.
+
+    :param dag: The DAG snapshot.
+    :return: The asset graph.
+    """
+    names = np.asarray(dag.names)
+    num_datasets = dag.num_datasets
+    is_managed = np.char.startswith(names, b"managed.")
+    # Managed parents without their own rows never become assets
+    is_asset = np.ones(len(names), dtype=bool)
+    is_asset[num_datasets:] = ~is_managed[num_datasets:]
+    node_ids = np.cumsum(is_asset) - 1
+
+    parent_indices = np.asarray(dag.parent_indices)
+    rows = np.repeat(np.arange(num_datasets), np.diff(np.asarray(dag.parent_indptr)))
+    keep = is_asset[parent_indices]
+    children, parents = node_ids[rows[keep]], node_ids[parent_indices[keep]]
+
+    num_nodes = int(is_asset.sum())
+    sources = np.concatenate([children, parents])
+    targets = np.concatenate([parents, children])
+    order = np.lexsort((targets, sources))
+    sources, targets = sources[order], targets[order]
+    unique = np.ones(len(sources), dtype=bool)
+    unique[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    sources, targets = sources[unique], targets[unique]
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+    asset_names = np.char.decode(np.char.replace(names[is_asset], b".", b"_"), "utf-8").tolist()
+    return AssetGraph(
+        asset_names=asset_names, indptr=indptr, indices=targets, num_edges=len(children)
+    )
+
+
+def _connected_components(graph: AssetGraph) -> list[np.ndarray]:
+    parent = np.arange(graph.num_nodes)
+
+    def find(x: int) -> int:
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for a, b in zip(*(e.tolist() for e in graph.edges())):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    roots = np.array([find(x) for x in range(graph.num_nodes)])
+    order = np.argsort(roots, kind="stable")
+    splits = np.flatnonzero(np.diff(roots[order])) + 1
+    components = np.split(order, splits)
+    # Largest first, ties broken by the smallest node id for a stable result
+    return sorted(components, key=lambda c: (-len(c), int(c[0])))
+
+
+def _bfs_order(graph: AssetGraph, component: np.ndarray) -> list[int]:
+    indptr, indices = graph.indptr, graph.indices
+    degrees = indptr[component + 1] - indptr[component]
+    start = int(component[np.argmin(degrees)])
+    seen = {start}
+    order = []
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for neighbour in indices[indptr[node] : indptr[node + 1]].tolist():
+            if neighbour not in seen:
+                seen.add(neighbour)
+                queue.append(neighbour)
+    return order
+
+
+def _initial_assignment(graph: AssetGraph, num_locations: int, target: float) -> np.ndarray:
+    labels = np.zeros(graph.num_nodes, dtype=np.int64)
+    loads = np.zeros(num_locations + 1)
+    loads[0] = np.inf
+    for component in _connected_components(graph):
+        lightest = int(np.argmin(loads))
+        if loads[lightest] + len(component) <= target:
+            labels[component] = lightest
+            loads[lightest] += len(component)
+            continue
+        # Too big for any one location: fill the lightest locations along a BFS ordering
+        for node in _bfs_order(graph, component):
+            if loads[lightest] >= target:
+                lightest = int(np.argmin(loads))
+            labels[node] = lightest
+            loads[lightest] += 1
+    return labels
+
+
+def _refine(
+    graph: AssetGraph,
+    labels: np.ndarray,
+    num_locations: int,
+    capacity: int,
+    minimum: int,
+    passes: int,
+    seed: int,
+) -> np.ndarray:
+    indptr, indices = graph.indptr, graph.indices
+    sizes = np.bincount(labels, minlength=num_locations + 1)
+    rng = np.random.default_rng(seed)
+    for _ in range(passes):
+        moved = 0
+        for node in rng.permutation(graph.num_nodes).tolist():
+            neighbours = indices[indptr[node] : indptr[node + 1]]
+            if not len(neighbours):
+                continue
+            current = labels[node]
+            if sizes[current] <= minimum:
+                continue
+            counts = np.bincount(labels[neighbours], minlength=num_locations + 1)
+            # Label 0 is unused; full locations can't take more assets
+            gains = np.where(sizes >= capacity, -1, counts)
+            gains[0] = -1
+            best = int(np.argmax(gains))
+            if best != current and gains[best] > counts[current]:
+                labels[node] = best
+                sizes[current] -= 1
+                sizes[best] += 1
+                moved += 1
+        if not moved:
+            break
+    return labels
+
+
+def count_cut_edges(graph: AssetGraph, locations: np.ndarray) -> int:
+    """
+    :param graph: The asset graph.
+    :param locations: Location per node.
+    :return: Number of undirected edges whose endpoints are in different locations.
+    """
+    sources, targets = graph.edges()
+    return int(np.count_nonzero(locations[sources] != locations[targets]))
+
+
+def partition_dag(
+    dag: DagSnapshot,
+    num_locations: int = 5,
+    imbalance: float = 0.05,
+    passes: int = 20,
+    seed: int = 0,
+) -> PartitionResult:
+    """
+    Assign assets to locations to minimize cross-location dependency edges.
+
+    :param dag: The DAG snapshot.
+    :param num_locations: Total number of code locations.
+    :param imbalance: Allowed excess over an even share per location (0.05 = 5%).
+    :param passes: Maximum label propagation passes.
+    :param seed: Seed for the node visiting order, so results are reproducible.
+    :return: The assignment and its cut statistics.
+    """
+    graph = build_asset_graph(dag)
+    target = graph.num_nodes / num_locations
+    capacity = math.ceil(target * (1 + imbalance))
+    minimum = math.floor(target * (1 - imbalance))
+
+    labels = _initial_assignment(graph, num_locations, target)
+    labels = _refine(graph, labels, num_locations, capacity, minimum, passes, seed)
+
+    hash_locations = get_asset_locations(graph.asset_names, num_locations)
+    return PartitionResult(
+        asset_names=graph.asset_names,
+        locations=labels,
+        cut_edges=count_cut_edges(graph, labels),
+        total_edges=len(graph.edges()[0]),
+        hash_cut_edges=count_cut_edges(graph, hash_locations),
+    )
+
+
+def write_assignment_table(result: PartitionResult, table_path: Path, num_locations: int) -> Path:
+    """
+    Persist a partition as a name -> location table readable by ``location_utils.lookup_location_table``.
+
+    :param result: The partition.
+    :param table_path: Target ``.npz`` file.
+    :param num_locations: Total number of code locations.
+    :return: Path of the written table.
+    """
+    names = np.char.encode(np.asarray(result.asset_names, dtype=str), "utf-8")
+    order = np.argsort(names, kind="stable")
+    with open(table_path, "wb") as f:
+        np.savez(
+            f,
+            names=names[order],
+            locations=result.locations[order].astype(np.int16),
+            num_locations=num_locations,
+        )
+    return table_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partition the DAG across code locations.")
+    parser.add_argument("--csv", type=Path, default=DAG_CSV_PATH, help="Path to the DAG CSV")
+    parser.add_argument("--output", type=Path, default=None, help="Assignment table to write")
+    parser.add_argument("--num-locations", type=int, default=5)
+    parser.add_argument("--imbalance", type=float, default=0.05)
+    parser.add_argument("--passes", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = partition_dag(
+        load_dag(args.csv), args.num_locations, args.imbalance, args.passes, args.seed
+    )
+    table_path = args.output or args.csv.with_name(ASSIGNMENT_TABLE_PATH.name)
+    write_assignment_table(result, table_path, args.num_locations)
+    print(result.summary())
+    print(f"Wrote {table_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,357 @@
 """
 Utility functions for distributing assets across multiple code locations.
 """
+import argparse
 import hashlib
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import cached_property, lru_cache
+from pathlib import Path
 
+import numpy as np
 
+from deep_purple_shared.utils.constants import DAG_CSV_PATH, LOCATION_TABLE_PATH
+
+
+@lru_cache(maxsize=65536)
 def get_asset_location(asset_name: str, num_locations: int = 5) -> int:
     """
     Determine which code location an asset belongs to based on hash.
 
     Uses a deterministic hash function (MD5) to ensure consistent assignment
-    across different Python processes.
+    across different Python processes. Results are memoized, since the same
+    source names are looked up for many children.
 
     :param asset_name: The name of the asset (e.g., "managed_abc123" or "source_xyz789")
     :param num_locations: Total number of code locations (default 5)
     :return: Location number (1-5)
     """
     # Use MD5 for deterministic hashing across Python processes
-    hash_value = int(hashlib.md5(asset_name.encode()).hexdigest(), 16)
+    hash_value = int.from_bytes(hashlib.md5(asset_name.encode()).digest(), "big")
     return (hash_value % num_locations) + 1
 
 
-def should_create_asset_in_location(asset_name: str, current_location: int, num_locations: int = 5) -> bool:
+def get_asset_locations(
+    asset_names: Sequence[str], num_locations: int = 5, table_path: Path | None = None
+) -> np.ndarray:
+    """
+    Batch version of ``get_asset_location``; returns exactly the same locations.
+
+    The 128-bit MD5 value is reduced modulo ``num_locations`` from its two 64-bit halves,
+    so the modulo runs as whole-array operations instead of Python big-int arithmetic.
+
+    :param asset_names: Names of the assets.
+    :param num_locations: Total number of code locations (default 5)
+    :param table_path: Optional persisted name -> location table (see ``write_location_table``).
+        Names found in it are not re-hashed.
+    :return: Array of location numbers (1-5), aligned with ``asset_names``.
+    """
+    names = list(asset_names)
+    locations = np.zeros(len(names), dtype=np.int64)
+    missing = np.arange(len(names))
+
+    if table_path is not None and table_path.exists():
+        locations[:] = lookup_location_table(table_path, names, num_locations)
+        missing = np.flatnonzero(locations == 0)
+
+    if len(missing):
+        digests = np.frombuffer(
+            b"".join(hashlib.md5(names[i].encode()).digest() for i in missing), dtype=">u8"
+        ).reshape(-1, 2)
+        high, low = digests[:, 0].astype(np.uint64), digests[:, 1].astype(np.uint64)
+        n = np.uint64(num_locations)
+        two_pow_64_mod_n = np.uint64((1 << 64) % num_locations)
+        locations[missing] = ((high % n) * two_pow_64_mod_n + low % n) % n + 1
+
+    return locations
+
+
+class AssignmentStrategy(str, Enum):
+    """How assets are assigned to code locations."""
+
+    MODULO = "modulo"
+    """MD5 of the asset name modulo the number of locations (changing the count moves most assets)."""
+
+    CONSISTENT = "consistent"
+    """Consistent-hash ring with virtual nodes per location (changing the count moves ~1/n of assets)."""
+
+    TABLE = "table"
+    """Precomputed assignment table (see ``graph_partitioner``); unlisted names fall back to MODULO."""
+
+
+def _ring_position(key: str) -> int:
+    """64-bit ring position: the high half of the key's MD5 digest."""
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+@dataclass(frozen=True)
+class LocationAssignment:
+    """
+    Pluggable asset -> location assignment.
+
+    :param num_locations: Total number of code locations.
+    :param strategy: Assignment strategy.
+    :param virtual_nodes: Ring points per location (``CONSISTENT`` only), scaled by the location's weight.
+    :param weights: Optional relative weight per location, in location order (``CONSISTENT`` only).
+    :param table_path: Assignment table written by ``graph_partitioner`` (``TABLE`` only).
+    """
+
+    num_locations: int = 5
+    strategy: AssignmentStrategy = AssignmentStrategy.MODULO
+    virtual_nodes: int = 160
+    weights: tuple[float, ...] | None = field(default=None)
+    table_path: Path | None = None
+
+    def __post_init__(self):
+        if self.weights is not None and len(self.weights) != self.num_locations:
+            raise ValueError(
+                f"Expected {self.num_locations} location weights, got {len(self.weights)}"
+            )
+
+    @cached_property
+    def _ring(self) -> tuple[np.ndarray, np.ndarray]:
+        weights = self.weights or (1.0,) * self.num_locations
+        mean_weight = sum(weights) / len(weights)
+        positions, owners = [], []
+        for location, weight in enumerate(weights, start=1):
+            for vnode in range(max(1, round(self.virtual_nodes * weight / mean_weight))):
+                positions.append(_ring_position(f"location_{location}#{vnode}"))
+                owners.append(location)
+        order = np.argsort(np.array(positions, dtype=np.uint64), kind="stable")
+        return np.array(positions, dtype=np.uint64)[order], np.array(owners, dtype=np.int64)[order]
+
+    @cached_property
+    def _table(self) -> dict[str, int]:
+        if self.table_path is None or not self.table_path.exists():
+            raise FileNotFoundError(f"Location assignment table not found: {self.table_path}")
+        with np.load(self.table_path) as table:
+            if int(table["num_locations"]) != self.num_locations:
+                raise ValueError(
+                    f"{self.table_path} assigns assets to {int(table['num_locations'])} locations, "
+                    f"expected {self.num_locations}"
+                )
+            return dict(
+                zip(np.char.decode(table["names"], "utf-8").tolist(), table["locations"].tolist())
+            )
+
+    def location(self, asset_name: str) -> int:
+        """
+        :param asset_name: The name of the asset.
+        :return: Location number of the asset.
+        """
+        if self.strategy == AssignmentStrategy.MODULO:
+            return get_asset_location(asset_name, self.num_locations)
+        if self.strategy == AssignmentStrategy.TABLE:
+            return self._table.get(asset_name) or get_asset_location(asset_name, self.num_locations)
+        return _consistent_location(asset_name, self)
+
+    def locations(self, asset_names: Sequence[str], table_path: Path | None = None) -> np.ndarray:
+        """
+        :param asset_names: Names of the assets.
+        :param table_path: Optional persisted table (``MODULO`` only, see ``write_location_table``).
+        :return: Array of location numbers, aligned with ``asset_names``.
+        """
+        if self.strategy == AssignmentStrategy.MODULO:
+            return get_asset_locations(asset_names, self.num_locations, table_path)
+        if self.strategy == AssignmentStrategy.TABLE:
+            return np.fromiter(
+                (self.location(name) for name in asset_names), dtype=np.int64, count=len(asset_names)
+            )
+        positions, owners = self._ring
+        hashes = np.fromiter(
+            (_ring_position(name) for name in asset_names), dtype=np.uint64, count=len(asset_names)
+        )
+        return owners[np.searchsorted(positions, hashes) % len(positions)]
+
+
+@lru_cache(maxsize=65536)
+def _consistent_location(asset_name: str, assignment: LocationAssignment) -> int:
+    positions, owners = assignment._ring
+    index = np.searchsorted(positions, np.uint64(_ring_position(asset_name))) % len(positions)
+    return int(owners[index])
+
+
+@dataclass(frozen=True)
+class RebalanceReport:
+    """
+    Assets that would move when switching from one assignment to another.
+
+    :param moves: ``(asset_name, current_location, proposed_location)`` for every asset that moves.
+    :param total_assets: Number of assets considered.
+    :param current_counts: Assets per location under the current assignment.
+    :param proposed_counts: Assets per location under the proposed assignment.
+    """
+
+    moves: tuple[tuple[str, int, int], ...]
+    total_assets: int
+    current_counts: dict[int, int]
+    proposed_counts: dict[int, int]
+
+    @property
+    def moved_fraction(self) -> float:
+        return len(self.moves) / self.total_assets if self.total_assets else 0.0
+
+    def summary(self) -> str:
+        lines = [f"{len(self.moves)} of {self.total_assets} assets move ({self.moved_fraction:.1%})"]
+        for location in sorted(set(self.current_counts) | set(self.proposed_counts)):
+            lines.append(
+                f"  location_{location}: {self.current_counts.get(location, 0)} -> "
+                f"{self.proposed_counts.get(location, 0)}"
+            )
+        return "\n".join(lines)
+
+
+def plan_rebalance(
+    asset_names: Sequence[str], current: LocationAssignment, proposed: LocationAssignment
+) -> RebalanceReport:
+    """
+    Report which assets would change location, e.g. before adding a code location.
+
+    :param asset_names: Names of the assets.
+    :param current: The assignment in use today.
+    :param proposed: The assignment to switch to.
+    :return: The moves and per-location asset counts.
+    """
+    names = list(asset_names)
+    current_locations = current.locations(names)
+    proposed_locations = proposed.locations(names)
+    moved = np.flatnonzero(current_locations != proposed_locations)
+    return RebalanceReport(
+        moves=tuple(
+            (names[i], int(current_locations[i]), int(proposed_locations[i])) for i in moved
+        ),
+        total_assets=len(names),
+        current_counts=dict(Counter(current_locations.tolist())),
+        proposed_counts=dict(Counter(proposed_locations.tolist())),
+    )
+
+
+def write_location_table(
+    asset_names: Sequence[str], table_path: Path = LOCATION_TABLE_PATH, num_locations: int = 5
+) -> Path:
+    """
+    Persist the name -> location table, so other processes can skip hashing.
+
+    :param asset_names: Names of the assets.
+    :param table_path: Target ``.npz`` file.
+    :param num_locations: Total number of code locations (default 5)
+    :return: Path of the written table.
+    """
+    names = np.unique(np.char.encode(np.asarray(list(asset_names), dtype=str), "utf-8"))
+    locations = get_asset_locations(np.char.decode(names, "utf-8").tolist(), num_locations)
+    with open(table_path, "wb") as f:
+        np.savez(f, names=names, locations=locations.astype(np.int16), num_locations=num_locations)
+    return table_path
+
+
+def lookup_location_table(
+    table_path: Path, asset_names: Sequence[str], num_locations: int = 5
+) -> np.ndarray:
+    """
+    Look names up in a persisted table.
+
+    :param table_path: Table written by ``write_location_table``.
+    :param asset_names: Names to look up.
+    :param num_locations: Total number of code locations the caller expects.
+    :return: Location numbers aligned with ``asset_names``; 0 for names not in the table,
+        or for every name if the table was built for a different number of locations.
+    """
+    with np.load(table_path) as table:
+        if int(table["num_locations"]) != num_locations:
+            return np.zeros(len(asset_names), dtype=np.int64)
+        table_names, table_locations = table["names"], table["locations"]
+    if not len(table_names):
+        return np.zeros(len(asset_names), dtype=np.int64)
+
+    query = np.char.encode(np.asarray(list(asset_names), dtype=str), "utf-8")
+    positions = np.searchsorted(table_names, query).clip(max=len(table_names) - 1)
+    found = table_names[positions] == query
+    return np.where(found, table_locations[positions], 0).astype(np.int64)
+
+
+def should_create_asset_in_location(
+    asset_name: str,
+    current_location: int,
+    num_locations: int = 5,
+    assignment: LocationAssignment | None = None,
+) -> bool:
     """
     Check if an asset should be created in the current code location.
 
     :param asset_name: The name of the asset
     :param current_location: The current code location number (1-5)
     :param num_locations: Total number of code locations (default 5)
+    :param assignment: Optional assignment to consult instead of MD5 modulo ``num_locations``,
+        e.g. a graph-partitioned ``AssignmentStrategy.TABLE``
     :return: True if asset should be created in this location
     """
+    if assignment is not None:
+        return assignment.location(asset_name) == current_location
     return get_asset_location(asset_name, num_locations) == current_location
+
+
+def main() -> None:
+    from deep_purple_shared.utils.dag_snapshot import load_dag
+
+    parser = argparse.ArgumentParser(description="Inspect and persist asset -> location assignments.")
+    parser.add_argument("--csv", type=Path, default=DAG_CSV_PATH, help="Path to the DAG CSV")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    table_parser = subparsers.add_parser("table", help="Persist the asset name -> location table")
+    table_parser.add_argument("--output", type=Path, default=None, help="Table file to write")
+    table_parser.add_argument("--num-locations", type=int, default=5)
+
+    rebalance_parser = subparsers.add_parser(
+        "rebalance", help="Report which assets move under a different assignment"
+    )
+    for prefix in ("current", "proposed"):
+        rebalance_parser.add_argument(f"--{prefix}-locations", type=int, default=5)
+        rebalance_parser.add_argument(
+            f"--{prefix}-strategy",
+            type=AssignmentStrategy,
+            choices=list(AssignmentStrategy),
+            default=AssignmentStrategy.MODULO,
+        )
+        rebalance_parser.add_argument(
+            f"--{prefix}-weights",
+            type=lambda value: tuple(float(w) for w in value.split(",")),
+            default=None,
+            help="Comma separated weight per location",
+        )
+    rebalance_parser.add_argument("--virtual-nodes", type=int, default=160)
+    rebalance_parser.add_argument(
+        "--table", type=Path, default=None, help="Assignment table for the table strategy"
+    )
+    args = parser.parse_args()
+
+    dag = load_dag(args.csv)
+    # Datasets plus source parents; managed parents without their own rows never become assets
+    asset_names = [
+        name.replace(".", "_")
+        for i, name in enumerate(dag.decoded_names)
+        if i < dag.num_datasets or not name.startswith("managed.")
+    ]
+
+    if args.command == "table":
+        table_path = args.output or args.csv.with_name(LOCATION_TABLE_PATH.name)
+        write_location_table(asset_names, table_path, args.num_locations)
+        print(f"Wrote {table_path}: {len(asset_names)} assets across {args.num_locations} locations")
+        return
+
+    current, proposed = (
+        LocationAssignment(
+            num_locations=getattr(args, f"{prefix}_locations"),
+            strategy=getattr(args, f"{prefix}_strategy"),
+            virtual_nodes=args.virtual_nodes,
+            weights=getattr(args, f"{prefix}_weights"),
+            table_path=args.table,
+        )
+        for prefix in ("current", "proposed")
+    )
+    print(plan_rebalance(asset_names, current, proposed).summary())
+
+
+if __name__ == "__main__":
+    main()
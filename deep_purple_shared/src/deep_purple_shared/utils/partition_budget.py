@@ -0,0 +1,202 @@
+"""
+Coarsening of partition granularity to fit a global partition budget.
+
+With ``tps_actual`` partitioning, an asset's partition count is its window length divided by its
+partition duration, so the total across the DAG grows linearly with ``n_days`` and is dominated by
+the 5- and 10-minute assets. The ``tps_budgeted`` partition mode caps that total: the finest
+assets are moved one step up the cron ladder (``PARTITION_CRON_SCHEDULES``), costliest first by
+the sensor sharding cost estimate, until the total fits the budget or everything is daily.
+
+Report the effect of a budget with::
+
+    python -m deep_purple_shared.utils.partition_budget --budget 500000
+"""
+
+import argparse
+import dataclasses
+import math
+from dataclasses import dataclass
+
+from deep_purple_shared.utils.constants import PARTITION_CRON_SCHEDULES
+from deep_purple_shared.utils.sensor_sharding import SECONDS_PER_DAY, estimate_evaluation_cost
+
+GRANULARITIES = tuple(sorted(PARTITION_CRON_SCHEDULES))
+
+
+@dataclass(frozen=True)
+class PartitionBudgetReport:
+    """
+    Partition counts before and after applying a budget.
+
+    :param budget: Cap on total partitions.
+    :param window_seconds: Length of the partition window.
+    :param assets_before: Assets per partition duration before coarsening.
+    :param assets_after: Assets per partition duration after coarsening.
+    :param partitions_before: Total partitions before coarsening.
+    :param partitions_after: Total partitions after coarsening.
+    """
+
+    budget: int
+    window_seconds: int
+    assets_before: dict[int, int]
+    assets_after: dict[int, int]
+    partitions_before: int
+    partitions_after: int
+
+    @property
+    def within_budget(self) -> bool:
+        return self.partitions_after <= self.budget
+
+    def summary(self) -> str:
+        lines = [
+            f"budget {self.budget:,}: {self.partitions_before:,} -> {self.partitions_after:,} partitions"
+            + ("" if self.within_budget else " (over budget: every asset is already daily)")
+        ]
+        for seconds in GRANULARITIES:
+            before, after = self.assets_before.get(seconds, 0), self.assets_after.get(seconds, 0)
+            if before or after:
+                lines.append(
+                    f"  {seconds:>6}s: {before:6d} -> {after:6d} assets, "
+                    f"{after * partition_count(seconds, self.window_seconds):,} partitions"
+                )
+        return "\n".join(lines)
+
+
+def effective_partition_seconds(partition_seconds: int) -> int:
+    """
+    :param partition_seconds: PARTITION_SECONDS of an asset.
+    :return: Duration of the partitions it actually gets (unknown durations are partitioned daily).
+    """
+    return partition_seconds if partition_seconds in PARTITION_CRON_SCHEDULES else SECONDS_PER_DAY
+
+
+def partition_count(partition_seconds: int, window_seconds: int) -> int:
+    """
+    :param partition_seconds: Effective partition duration.
+    :param window_seconds: Length of the partition window.
+    :return: Number of partitions in the window.
+    """
+    return window_seconds // partition_seconds
+
+
+def coarsen_to_budget(
+    partition_seconds: list[int], costs: list[float], budget: int, window_seconds: int
+) -> list[int]:
+    """
+    Coarsen the finest assets one cron step at a time until the total partition count fits.
+
+    Within a step, assets with the highest estimated cost are coarsened first and only as many
+    as needed; ties keep their input order.
+
+    :param partition_seconds: Effective partition duration per asset.
+    :param costs: Estimated evaluation cost per asset.
+    :param budget: Cap on total partitions.
+    :param window_seconds: Length of the partition window.
+    :return: New effective partition duration per asset.
+    """
+    coarsened = list(partition_seconds)
+    total = sum(partition_count(seconds, window_seconds) for seconds in coarsened)
+    for step, finest in enumerate(GRANULARITIES[:-1]):
+        if total <= budget:
+            break
+        members = [i for i, seconds in enumerate(coarsened) if seconds == finest]
+        if not members:
+            continue
+        coarser = GRANULARITIES[step + 1]
+        saving = partition_count(finest, window_seconds) - partition_count(coarser, window_seconds)
+        members.sort(key=lambda i: -costs[i])
+        for i in members[: math.ceil((total - budget) / saving)]:
+            coarsened[i] = coarser
+            total -= saving
+    return coarsened
+
+
+def apply_partition_budget(
+    plans: dict, budget: int, window_seconds: int
+) -> tuple[dict, PartitionBudgetReport]:
+    """
+    Coarsen planned assets across all locations so their total partition count fits ``budget``.
+
+    Coarsened managed assets get their backfill limit recomputed for the new duration.
+
+    :param plans: Mapping of location number to ``LocationPlan``.
+    :param budget: Cap on total partitions across all locations.
+    :param window_seconds: Length of the partition window.
+    :return: New plans and the before/after report.
+    """
+    assets = [
+        asset
+        for location in sorted(plans)
+        for asset in (*plans[location].source_assets, *plans[location].managed_assets)
+    ]
+    before = [effective_partition_seconds(asset.partition_seconds) for asset in assets]
+    costs = [
+        estimate_evaluation_cost(
+            seconds, len(getattr(asset, "deps", ())), window_seconds / SECONDS_PER_DAY
+        )
+        for asset, seconds in zip(assets, before)
+    ]
+    after = coarsen_to_budget(before, costs, budget, window_seconds)
+    new_seconds = {
+        asset.name: seconds for asset, old, seconds in zip(assets, before, after) if seconds != old
+    }
+
+    def coarsen(asset):
+        seconds = new_seconds.get(asset.name)
+        if seconds is None:
+            return asset
+        changes = {"partition_seconds": seconds}
+        max_contiguous_seconds = getattr(asset, "max_contiguous_seconds", math.nan)
+        if not math.isnan(max_contiguous_seconds):
+            # Same rule as the planner's backfill limit
+            changes["max_partitions_per_run"] = max(1, int(max_contiguous_seconds / seconds))
+        return dataclasses.replace(asset, **changes)
+
+    budgeted = {
+        location: dataclasses.replace(
+            plan,
+            source_assets=tuple(coarsen(asset) for asset in plan.source_assets),
+            managed_assets=tuple(coarsen(asset) for asset in plan.managed_assets),
+        )
+        for location, plan in plans.items()
+    }
+
+    def histogram(durations: list[int]) -> dict[int, int]:
+        return {seconds: durations.count(seconds) for seconds in GRANULARITIES if seconds in durations}
+
+    report = PartitionBudgetReport(
+        budget=budget,
+        window_seconds=window_seconds,
+        assets_before=histogram(before),
+        assets_after=histogram(after),
+        partitions_before=sum(partition_count(s, window_seconds) for s in before),
+        partitions_after=sum(partition_count(s, window_seconds) for s in after),
+    )
+    return budgeted, report
+
+
+def main() -> None:
+    from deep_purple_shared.utils.asset_planner import plan_locations
+    from deep_purple_shared.utils.dag_snapshot import load_dag
+    from deep_purple_shared.utils.performance_config import PERF_CONFIG
+
+    parser = argparse.ArgumentParser(description="Partition counts under a partition budget.")
+    parser.add_argument("--budget", type=int, nargs="+", default=[PERF_CONFIG.partition_budget])
+    parser.add_argument("--n-days", type=int, default=PERF_CONFIG.n_days)
+    args = parser.parse_args()
+
+    plans = plan_locations(
+        load_dag(PERF_CONFIG.dag_path),
+        PERF_CONFIG.location_assignment,
+        PERF_CONFIG.planner_mode,
+        sensor_layout=PERF_CONFIG.sensor_layout,
+    )
+    for budget in args.budget:
+        if budget is None:
+            parser.error("--budget or DEEP_PURPLE_PARTITION_BUDGET is required")
+        _, report = apply_partition_budget(plans, budget, args.n_days * SECONDS_PER_DAY)
+        print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
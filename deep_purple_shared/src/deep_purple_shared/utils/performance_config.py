@@ -4,13 +4,24 @@ Configuration module for Dagster performance testing.
 Provides simple toggles to control asset definitions for performance testing scenarios.
 """
 
+from datetime import date, datetime, time
 from enum import Enum
+from pathlib import Path
 
-import pandas as pd
 from dagster import DefaultSensorStatus
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from deep_purple_shared.utils.constants import ASSIGNMENT_TABLE_PATH, DAG_CSV_PATH, PLAN_CACHE_DIR
+from deep_purple_shared.utils.dates import (
+    days_before,
+    snap_to_boundary,
+    start_of_day,
+    utc_start_of_day,
+)
+from deep_purple_shared.utils.location_utils import AssignmentStrategy, LocationAssignment
+from deep_purple_shared.utils.sensor_layout import SensorLayout
+
 
 class PartitionMode(str, Enum):
     """Partition mode for performance testing."""
@@ -21,15 +32,89 @@ class PartitionMode(str, Enum):
     TPS_ACTUAL = "tps_actual"
     """Use actual partition definition from TPS (based on effective start/end dates)."""
 
+    TPS_EFFECTIVE = "tps_effective"
+    """Like TPS_ACTUAL, with each dataset's window narrowed to its own START_DATE/END_DATE."""
+
+    TPS_BUDGETED = "tps_budgeted"
+    """Like TPS_ACTUAL, with the costliest assets coarsened until the total fits the partition budget."""
+
+
+class PlannerMode(str, Enum):
+    """How the asset planner walks the DAG."""
+
+    VECTORIZED = "vectorized"
+    """Compute names, locations, backfill limits and deps with whole-column NumPy operations."""
+
+    REFERENCE = "reference"
+    """Walk the DAG row by row; kept to check the vectorized planner against."""
+
+
+class SensorSharding(str, Enum):
+    """How assets are spread across a location's automation condition sensors."""
+
+    ROUND_ROBIN = "round_robin"
+    """Count assets in planning order modulo the sensor count."""
+
+    COST = "cost"
+    """Pack dependency clusters onto the location's sensors by estimated evaluation cost."""
+
+
+class AssetGrouping(str, Enum):
+    """How planned assets are turned into asset definitions."""
+
+    NONE = "none"
+    """One ``@dg.asset`` (and op) per asset."""
+
+    MULTI_ASSET = "multi_asset"
+    """Subsettable ``@dg.multi_asset`` per (partitions, queue, backfill limit), capped in size."""
+
+
+class WindowAnchor(str, Enum):
+    """How the end of the partition window is chosen."""
+
+    NOW = "now"
+    """Midnight today (local time), recomputed on every start."""
+
+    PINNED = "pinned"
+    """Explicit dates, so every location and restart builds the same definitions."""
+
+    SNAPPED = "snapped"
+    """Today (UTC) rounded down to a boundary, so the window only moves once per boundary."""
+
 
 class PerformanceConfig(BaseSettings):
     """
     Configuration for performance testing.
 
     Configure via environment variables:
-    - DEEP_PURPLE_PARTITION_MODE: Partition mode (daily or tps_actual)
+    - DEEP_PURPLE_DAG_PATH: DAG CSV to load (e.g. a synthetic DAG from utils.dag_generator)
+    - DEEP_PURPLE_PARTITION_MODE: Partition mode (daily, tps_actual, tps_effective or tps_budgeted)
     - DEEP_PURPLE_N_DAYS: Number of days for partitions
+    - DEEP_PURPLE_PARTITION_BUDGET: Cap on total partitions across all locations for tps_budgeted
+    - DEEP_PURPLE_WINDOW_ANCHOR: How the partition window end is chosen (now, pinned or snapped)
+    - DEEP_PURPLE_WINDOW_END: Window end date (YYYY-MM-DD) for the pinned anchor
+    - DEEP_PURPLE_WINDOW_START: Window start date for the pinned anchor (defaults to n_days before the end)
+    - DEEP_PURPLE_WINDOW_SNAP_DAYS: Boundary in days the snapped anchor rounds down to
     - DEEP_PURPLE_SENSOR_DEFAULT_STATUS: Default sensor status (RUNNING or STOPPED)
+    - DEEP_PURPLE_PLANNER_MODE: Asset planner implementation (vectorized or reference)
+    - DEEP_PURPLE_NUM_LOCATIONS: Number of code locations assets are spread across
+    - DEEP_PURPLE_LOCATION_STRATEGY: Asset -> location assignment (modulo, consistent or table)
+    - DEEP_PURPLE_VIRTUAL_NODES: Ring points per location for consistent assignment
+    - DEEP_PURPLE_LOCATION_WEIGHTS: JSON list of relative weights per location for consistent assignment
+    - DEEP_PURPLE_ASSIGNMENT_TABLE: Graph-partitioned assignment table for table assignment
+    - DEEP_PURPLE_SENSOR_SHARDING: Asset -> sensor sharding (round_robin or cost)
+    - DEEP_PURPLE_SENSOR_COUNT: Total automation condition sensors, split evenly across locations
+    - DEEP_PURPLE_ASSETS_PER_SENSOR: Target assets per sensor; sizes each location's sensors to its assets
+    - DEEP_PURPLE_STREAMING_CHUNK_SIZE: Build assets in streaming chunks of this many DAG rows
+    - DEEP_PURPLE_QUEUE_POOLS: Run managed assets in one concurrency pool per QUEUE_BINDING (true or false)
+    - DEEP_PURPLE_QUEUE_POOL_LIMITS: JSON object of QUEUE_BINDING -> concurrency slots
+    - DEEP_PURPLE_QUEUE_POOL_DEFAULT_LIMIT: Concurrency slots of queues without an explicit limit
+    - DEEP_PURPLE_QUEUE_PRIORITIES: JSON object of QUEUE_BINDING -> step priority (higher claims slots first)
+    - DEEP_PURPLE_ASSET_GROUPING: Asset definitions per asset or grouped into multi-assets (none or multi_asset)
+    - DEEP_PURPLE_MULTI_ASSET_MAX_SIZE: Most assets per multi-asset
+    - DEEP_PURPLE_PLAN_CACHE: Cache location plans on disk (true or false)
+    - DEEP_PURPLE_PLAN_CACHE_DIR: Directory holding cached location plans
+    - DEEP_PURPLE_PLAN_CACHE_KEEP: Number of plan cache generations kept before older ones are evicted
     """
 
     model_config = SettingsConfigDict(
@@ -37,6 +122,12 @@ class PerformanceConfig(BaseSettings):
         case_sensitive=False,
     )
 
+    dag_path: Path = Field(
+        default=DAG_CSV_PATH,
+        description="DAG CSV to load",
+        validation_alias="DEEP_PURPLE_DAG_PATH",
+    )
+
     partition_mode: PartitionMode = Field(
         default=PartitionMode.TPS_ACTUAL,
         description="Partition mode for performance testing",
@@ -50,29 +141,240 @@ class PerformanceConfig(BaseSettings):
         validation_alias="DEEP_PURPLE_N_DAYS",
     )
 
+    partition_budget: int | None = Field(
+        default=None,
+        description="Cap on total partitions across all locations for the tps_budgeted partition mode",
+        ge=1,
+        validation_alias="DEEP_PURPLE_PARTITION_BUDGET",
+    )
+
+    window_anchor: WindowAnchor = Field(
+        default=WindowAnchor.NOW,
+        description="How the partition window end is chosen",
+        validation_alias="DEEP_PURPLE_WINDOW_ANCHOR",
+    )
+
+    window_end: date | None = Field(
+        default=None,
+        description="Window end date for the pinned anchor",
+        validation_alias="DEEP_PURPLE_WINDOW_END",
+    )
+
+    window_start: date | None = Field(
+        default=None,
+        description="Window start date for the pinned anchor (defaults to n_days before the end)",
+        validation_alias="DEEP_PURPLE_WINDOW_START",
+    )
+
+    window_snap_days: int = Field(
+        default=1,
+        description="Boundary in days (since 1970-01-01) the snapped anchor rounds down to",
+        ge=1,
+        validation_alias="DEEP_PURPLE_WINDOW_SNAP_DAYS",
+    )
+
     sensor_default_status: DefaultSensorStatus = Field(
         default=DefaultSensorStatus.RUNNING,
         description="Default status for sensors (RUNNING or STOPPED)",
         validation_alias="DEEP_PURPLE_SENSOR_DEFAULT_STATUS",
     )
 
+    planner_mode: PlannerMode = Field(
+        default=PlannerMode.VECTORIZED,
+        description="Asset planner implementation",
+        validation_alias="DEEP_PURPLE_PLANNER_MODE",
+    )
+
+    num_locations: int = Field(
+        default=5,
+        description="Number of code locations assets are spread across",
+        ge=1,
+        validation_alias="DEEP_PURPLE_NUM_LOCATIONS",
+    )
+
+    location_strategy: AssignmentStrategy = Field(
+        default=AssignmentStrategy.MODULO,
+        description="Asset -> location assignment strategy",
+        validation_alias="DEEP_PURPLE_LOCATION_STRATEGY",
+    )
+
+    virtual_nodes: int = Field(
+        default=160,
+        description="Ring points per location for consistent assignment",
+        ge=1,
+        validation_alias="DEEP_PURPLE_VIRTUAL_NODES",
+    )
+
+    location_weights: tuple[float, ...] | None = Field(
+        default=None,
+        description="Relative weight per location for consistent assignment",
+        validation_alias="DEEP_PURPLE_LOCATION_WEIGHTS",
+    )
+
+    assignment_table: Path = Field(
+        default=ASSIGNMENT_TABLE_PATH,
+        description="Graph-partitioned assignment table for table assignment",
+        validation_alias="DEEP_PURPLE_ASSIGNMENT_TABLE",
+    )
+
+    sensor_sharding: SensorSharding = Field(
+        default=SensorSharding.ROUND_ROBIN,
+        description="Asset -> sensor sharding strategy",
+        validation_alias="DEEP_PURPLE_SENSOR_SHARDING",
+    )
+
+    sensor_count: int = Field(
+        default=50,
+        description="Total automation condition sensors, split evenly across locations",
+        ge=1,
+        validation_alias="DEEP_PURPLE_SENSOR_COUNT",
+    )
+
+    assets_per_sensor: int | None = Field(
+        default=None,
+        description="Target assets per sensor (unset uses sensor_count)",
+        ge=1,
+        validation_alias="DEEP_PURPLE_ASSETS_PER_SENSOR",
+    )
+
+    streaming_chunk_size: int | None = Field(
+        default=None,
+        description="Build assets in streaming chunks of this many DAG rows (unset builds from the full plan)",
+        ge=1,
+        validation_alias="DEEP_PURPLE_STREAMING_CHUNK_SIZE",
+    )
+
+    queue_pools: bool = Field(
+        default=False,
+        description="Run managed assets in one concurrency pool per QUEUE_BINDING",
+        validation_alias="DEEP_PURPLE_QUEUE_POOLS",
+    )
+
+    queue_pool_limits: dict[str, int] = Field(
+        default_factory=dict,
+        description="Concurrency slots per QUEUE_BINDING",
+        validation_alias="DEEP_PURPLE_QUEUE_POOL_LIMITS",
+    )
+
+    queue_pool_default_limit: int = Field(
+        default=4,
+        description="Concurrency slots of queues without an explicit limit",
+        ge=0,
+        validation_alias="DEEP_PURPLE_QUEUE_POOL_DEFAULT_LIMIT",
+    )
+
+    queue_priorities: dict[str, int] = Field(
+        default_factory=dict,
+        description="Step priority per QUEUE_BINDING (higher claims pool slots first)",
+        validation_alias="DEEP_PURPLE_QUEUE_PRIORITIES",
+    )
+
+    asset_grouping: AssetGrouping = Field(
+        default=AssetGrouping.NONE,
+        description="Asset definitions per asset or grouped into multi-assets",
+        validation_alias="DEEP_PURPLE_ASSET_GROUPING",
+    )
+
+    multi_asset_max_size: int = Field(
+        default=256,
+        description="Most assets per multi-asset",
+        ge=1,
+        validation_alias="DEEP_PURPLE_MULTI_ASSET_MAX_SIZE",
+    )
+
+    plan_cache: bool = Field(
+        default=True,
+        description="Cache location plans on disk",
+        validation_alias="DEEP_PURPLE_PLAN_CACHE",
+    )
+
+    plan_cache_dir: Path = Field(
+        default=PLAN_CACHE_DIR,
+        description="Directory holding cached location plans",
+        validation_alias="DEEP_PURPLE_PLAN_CACHE_DIR",
+    )
+
+    plan_cache_keep: int = Field(
+        default=3,
+        description="Number of plan cache generations (fingerprints) kept before older ones are evicted",
+        ge=1,
+        validation_alias="DEEP_PURPLE_PLAN_CACHE_KEEP",
+    )
+
+    @model_validator(mode="after")
+    def _check_window(self) -> "PerformanceConfig":
+        if self.window_anchor == WindowAnchor.PINNED and self.window_end is None:
+            raise ValueError("DEEP_PURPLE_WINDOW_END is required with the pinned window anchor")
+        if self.window_start is not None and self.window_end is not None:
+            if self.window_start >= self.window_end:
+                raise ValueError("DEEP_PURPLE_WINDOW_START must be before DEEP_PURPLE_WINDOW_END")
+        return self
+
+    @model_validator(mode="after")
+    def _check_partition_budget(self) -> "PerformanceConfig":
+        if self.partition_mode == PartitionMode.TPS_BUDGETED and self.partition_budget is None:
+            raise ValueError(
+                "DEEP_PURPLE_PARTITION_BUDGET is required with the tps_budgeted partition mode"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _check_sensor_count(self) -> "PerformanceConfig":
+        if self.assets_per_sensor is None and self.sensor_count < self.num_locations:
+            raise ValueError("DEEP_PURPLE_SENSOR_COUNT must be at least DEEP_PURPLE_NUM_LOCATIONS")
+        return self
+
+    @property
+    def location_assignment(self) -> LocationAssignment:
+        """
+        Asset -> location assignment described by this configuration.
+
+        :return: The location assignment.
+        """
+        return LocationAssignment(
+            num_locations=self.num_locations,
+            strategy=self.location_strategy,
+            virtual_nodes=self.virtual_nodes,
+            weights=self.location_weights,
+            table_path=self.assignment_table,
+        )
+
+    @property
+    def sensor_layout(self) -> SensorLayout:
+        """
+        Sensor count and per-location sensor ranges described by this configuration.
+
+        :return: The sensor layout.
+        """
+        return SensorLayout(
+            num_locations=self.num_locations,
+            sensor_count=self.sensor_count,
+            assets_per_sensor=self.assets_per_sensor,
+        )
+
     @property
-    def start_date(self) -> pd.Timestamp:
+    def start_date(self) -> datetime:
         """
         Compute the start date based on n_days.
 
-        :return: The start date (n_days ago from today).
+        :return: The pinned start date, otherwise n_days before the end date.
         """
-        return pd.Timestamp.now().normalize() - pd.Timedelta(days=self.n_days)
+        if self.window_anchor == WindowAnchor.PINNED and self.window_start is not None:
+            return datetime.combine(self.window_start, time())
+        return days_before(self.end_date, self.n_days)
 
     @property
-    def end_date(self) -> pd.Timestamp:
+    def end_date(self) -> datetime:
         """
-        Compute the end date.
+        Compute the end date according to the window anchor.
 
-        :return: Today's date.
+        :return: Today's date, the pinned end date, or today (UTC) snapped to the boundary.
         """
-        return pd.Timestamp.now().normalize()
+        if self.window_anchor == WindowAnchor.PINNED:
+            return datetime.combine(self.window_end, time())
+        if self.window_anchor == WindowAnchor.SNAPPED:
+            return snap_to_boundary(utc_start_of_day(), self.window_snap_days)
+        return start_of_day()
 
 
 # Global configuration instance
@@ -0,0 +1,201 @@
+"""
+Concurrency pools per QUEUE_BINDING.
+
+Managed assets are tagged with their dataset's QUEUE_BINDING. With ``DEEP_PURPLE_QUEUE_POOLS``
+enabled, each managed asset runs in the Dagster concurrency pool of its queue and, when the queue
+has a priority, its steps claim pool slots ahead of lower-priority queues. A hot queue then only
+saturates its own slots instead of every run competing in one undifferentiated queue.
+
+Pool limits live on the Dagster instance. Apply the configured limits and report per-queue load
+and throughput with::
+
+    python -m deep_purple_shared.utils.queue_pools --apply
+    python -m deep_purple_shared.utils.queue_pools --hours 24
+"""
+
+import argparse
+import re
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from deep_purple_shared.utils.constants import QUEUE_BINDING_TAG
+from deep_purple_shared.utils.partition_budget import effective_partition_seconds, partition_count
+from deep_purple_shared.utils.performance_config import PERF_CONFIG, PartitionMode, PerformanceConfig
+from deep_purple_shared.utils.sensor_sharding import SECONDS_PER_DAY
+
+POOL_PREFIX = "deep_purple_"
+
+
+def pool_for_queue(queue_binding: str) -> str | None:
+    """
+    :param queue_binding: QUEUE_BINDING of a dataset.
+    :return: The queue's concurrency pool, or None for datasets without a queue.
+    """
+    # Pool names may only hold letters, digits and underscores
+    return POOL_PREFIX + re.sub(r"\W", "_", queue_binding) if queue_binding else None
+
+
+def queue_priority(queue_binding: str, config: PerformanceConfig = PERF_CONFIG) -> int | None:
+    """
+    :param queue_binding: QUEUE_BINDING of a dataset.
+    :param config: Performance configuration.
+    :return: The queue's step priority, or None when it has none.
+    """
+    return config.queue_priorities.get(queue_binding)
+
+
+def queue_pool_limits(
+    queue_bindings: Iterable[str], config: PerformanceConfig = PERF_CONFIG
+) -> dict[str, int]:
+    """
+    :param queue_bindings: QUEUE_BINDING values to size pools for.
+    :param config: Performance configuration.
+    :return: Mapping of pool name to concurrency slots.
+    """
+    return {
+        pool_for_queue(queue): config.queue_pool_limits.get(queue, config.queue_pool_default_limit)
+        for queue in sorted(set(queue_bindings))
+        if queue
+    }
+
+
+def apply_pool_limits(instance, limits: dict[str, int]) -> None:
+    """
+    Set the concurrency slots of every pool on a Dagster instance.
+
+    :param instance: The ``DagsterInstance``.
+    :param limits: Mapping of pool name to concurrency slots.
+    """
+    for pool, limit in limits.items():
+        instance.event_log_storage.set_concurrency_slots(pool, limit)
+
+
+def plan_queue_load(
+    plans: dict, window_seconds: int, config: PerformanceConfig = PERF_CONFIG
+) -> dict[str, dict]:
+    """
+    Managed assets and partitions per queue across all locations.
+
+    :param plans: Mapping of location number to ``LocationPlan``.
+    :param window_seconds: Length of the partition window.
+    :param config: Performance configuration.
+    :return: Mapping of QUEUE_BINDING to its assets, partitions, pool, limit and priority.
+    """
+    load: dict[str, dict] = {}
+    for plan in plans.values():
+        for managed in plan.managed_assets:
+            queue = managed.tags.get(QUEUE_BINDING_TAG, "")
+            if not queue:
+                continue
+            seconds = (
+                SECONDS_PER_DAY
+                if config.partition_mode == PartitionMode.DAILY
+                else effective_partition_seconds(managed.partition_seconds)
+            )
+            stats = load.setdefault(queue, {"assets": 0, "partitions": 0})
+            stats["assets"] += 1
+            stats["partitions"] += partition_count(seconds, window_seconds)
+    limits = queue_pool_limits(load, config)
+    for queue, stats in load.items():
+        stats["pool"] = pool_for_queue(queue)
+        stats["limit"] = limits[stats["pool"]]
+        stats["priority"] = queue_priority(queue, config)
+    return load
+
+
+def queue_throughput(instance, asset_queues: dict[str, str], since: float) -> dict[str, dict]:
+    """
+    Materializations per queue in the runs a Dagster instance launched since a point in time.
+
+    :param instance: The ``DagsterInstance``.
+    :param asset_queues: Mapping of asset name to QUEUE_BINDING.
+    :param since: Unix timestamp to count from.
+    :return: Mapping of QUEUE_BINDING to its materializations, runs, rate and pool slot usage.
+    """
+    import dagster as dg
+
+    hours = max(time.time() - since, 1.0) / 3600
+    materializations: dict[str, int] = {}
+    runs: dict[str, set[str]] = {}
+    run_records = instance.get_run_records(
+        filters=dg.RunsFilter(created_after=datetime.fromtimestamp(since, timezone.utc))
+    )
+    for run_record in run_records:
+        run_id = run_record.dagster_run.run_id
+        for entry in instance.all_logs(run_id, of_type=dg.DagsterEventType.ASSET_MATERIALIZATION):
+            queue = asset_queues.get(entry.dagster_event.asset_key.to_user_string())
+            if queue:
+                materializations[queue] = materializations.get(queue, 0) + 1
+                runs.setdefault(queue, set()).add(run_id)
+
+    pools = instance.event_log_storage.get_concurrency_keys()
+    throughput = {}
+    for queue in sorted(set(filter(None, asset_queues.values()))):
+        pool = pool_for_queue(queue)
+        info = instance.event_log_storage.get_concurrency_info(pool) if pool in pools else None
+        throughput[queue] = {
+            "materializations": materializations.get(queue, 0),
+            "runs": len(runs.get(queue, ())),
+            "per_hour": round(materializations.get(queue, 0) / hours, 1),
+            "active_slots": len(info.claimed_slots) if info else 0,
+            "pending_steps": len(info.pending_steps) if info else 0,
+        }
+    return throughput
+
+
+def main() -> None:
+    from deep_purple_shared.utils.asset_planner import plan_locations
+    from deep_purple_shared.utils.dag_snapshot import load_dag
+
+    parser = argparse.ArgumentParser(description="Concurrency pools per QUEUE_BINDING.")
+    parser.add_argument("--n-days", type=int, default=PERF_CONFIG.n_days)
+    parser.add_argument(
+        "--apply", action="store_true", help="Set the pool limits on the instance in DAGSTER_HOME"
+    )
+    parser.add_argument(
+        "--hours", type=float, default=None, help="Report throughput over the last HOURS from DAGSTER_HOME"
+    )
+    args = parser.parse_args()
+
+    plans = plan_locations(
+        load_dag(PERF_CONFIG.dag_path),
+        PERF_CONFIG.location_assignment,
+        PERF_CONFIG.planner_mode,
+        sensor_layout=PERF_CONFIG.sensor_layout,
+    )
+    load = plan_queue_load(plans, args.n_days * SECONDS_PER_DAY)
+    print(f"{'queue':<12} {'pool':<24} {'limit':>5} {'priority':>8} {'assets':>7} {'partitions':>11}")
+    for queue, stats in sorted(load.items(), key=lambda item: -item[1]["partitions"]):
+        priority = "" if stats["priority"] is None else stats["priority"]
+        print(
+            f"{queue:<12} {stats['pool']:<24} {stats['limit']:>5} {priority:>8} "
+            f"{stats['assets']:>7} {stats['partitions']:>11,}"
+        )
+
+    if not (args.apply or args.hours):
+        return
+    import dagster as dg
+
+    with dg.DagsterInstance.get() as instance:
+        if args.apply:
+            apply_pool_limits(instance, {stats["pool"]: stats["limit"] for stats in load.values()})
+            print(f"Set limits of {len(load)} pools")
+        if args.hours:
+            asset_queues = {
+                managed.name: managed.tags.get(QUEUE_BINDING_TAG, "")
+                for plan in plans.values()
+                for managed in plan.managed_assets
+            }
+            throughput = queue_throughput(instance, asset_queues, time.time() - args.hours * 3600)
+            print(f"\nLast {args.hours:g}h")
+            print(f"{'queue':<12} {'materializations':>16} {'runs':>6} {'per hour':>9} {'active':>7} {'pending':>8}")
+            for queue, stats in sorted(throughput.items(), key=lambda item: -item[1]["materializations"]):
+                print(
+                    f"{queue:<12} {stats['materializations']:>16} {stats['runs']:>6} "
+                    f"{stats['per_hour']:>9} {stats['active_slots']:>7} {stats['pending_steps']:>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
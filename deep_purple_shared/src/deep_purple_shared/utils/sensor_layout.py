@@ -0,0 +1,75 @@
+"""
+Number of automation condition sensors and the sensor indexes each code location owns.
+
+Either a fixed sensor count is split evenly across the locations, or every location gets one sensor
+per ``assets_per_sensor`` of its assets, so sensors are added as the DAG grows and the assets one
+sensor evaluates per tick stay bounded. Ranges are contiguous in location order: with 50 sensors
+and 5 locations, location 1 owns sensors 0-9, location 2 sensors 10-19, and so on.
+"""
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SensorLayout:
+    """
+    Sensor count and per-location sensor index ranges.
+
+    :param num_locations: Total number of code locations.
+    :param sensor_count: Total number of sensors, split evenly across locations (the first
+        locations get one more when it doesn't divide).
+    :param assets_per_sensor: Target number of assets per sensor; when set, each location gets
+        enough sensors for its own assets and ``sensor_count`` is ignored.
+    """
+
+    num_locations: int = 5
+    sensor_count: int = 50
+    assets_per_sensor: int | None = None
+
+    def __post_init__(self):
+        if self.assets_per_sensor is None and self.sensor_count < self.num_locations:
+            raise ValueError(
+                f"Expected at least one sensor per location, got {self.sensor_count} sensors "
+                f"for {self.num_locations} locations"
+            )
+
+    @property
+    def scales_with_assets(self) -> bool:
+        """Whether the sensor ranges depend on how many assets each location owns."""
+        return self.assets_per_sensor is not None
+
+    def ranges(self, asset_counts: Mapping[int, int] | None = None) -> dict[int, range]:
+        """
+        Sensor indexes owned by each location.
+
+        :param asset_counts: Assets per location number; required when ``assets_per_sensor`` is set.
+        :return: Mapping of location number to its sensor indexes.
+        """
+        locations = range(1, self.num_locations + 1)
+        if self.assets_per_sensor is not None:
+            if asset_counts is None:
+                raise ValueError("Asset counts per location are required with assets_per_sensor")
+            sizes = [
+                max(1, math.ceil(asset_counts.get(location, 0) / self.assets_per_sensor))
+                for location in locations
+            ]
+        else:
+            per_location, extra = divmod(self.sensor_count, self.num_locations)
+            sizes = [per_location + (1 if location <= extra else 0) for location in locations]
+
+        ranges, start = {}, 0
+        for location, size in zip(locations, sizes):
+            ranges[location] = range(start, start + size)
+            start += size
+        return ranges
+
+
+def round_robin_index(sensor_indexes: range, ordinal: int) -> int:
+    """
+    :param sensor_indexes: Sensor indexes owned by a location.
+    :param ordinal: 1-based position of an asset among the location's assets, in planning order.
+    :return: The asset's sensor index.
+    """
+    return sensor_indexes[ordinal % len(sensor_indexes)]
@@ -0,0 +1,228 @@
+"""
+Cost-based sharding of assets across automation condition sensors.
+
+Round-robin sharding (the n-th asset of a location goes to sensor ``n % sensors`` of the location's
+range, see ``sensor_layout``) makes shard sizes and costs depend on iteration order. Cost-based
+sharding instead estimates each asset's evaluation cost as ``partition count x upstream fan-in x
+cron frequency``, keeps assets that depend on each other within a location in the same cluster, and
+packs clusters onto the location's sensors largest-first, so no single sensor tick becomes the long
+pole.
+
+Compare both layouts with::
+
+    python -m deep_purple_shared.utils.sensor_sharding
+"""
+
+import argparse
+import dataclasses
+from dataclasses import dataclass
+
+import numpy as np
+
+from deep_purple_shared.utils.constants import SENSOR_INDEX_TAG
+from deep_purple_shared.utils.performance_config import SensorSharding
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass(frozen=True)
+class ShardReport:
+    """
+    Estimated evaluation cost per sensor shard of one location.
+
+    :param location: Location number.
+    :param costs: Estimated cost per sensor index.
+    :param asset_counts: Assets per sensor index.
+    """
+
+    location: int
+    costs: dict[int, float]
+    asset_counts: dict[int, int]
+
+    @property
+    def imbalance(self) -> float:
+        """Cost of the most expensive shard relative to the mean shard cost."""
+        costs = list(self.costs.values())
+        mean = sum(costs) / len(costs) if costs else 0.0
+        return max(costs) / mean if mean else 0.0
+
+    def summary(self) -> str:
+        lines = [f"location_{self.location}: max/mean cost {self.imbalance:.2f}"]
+        for index in sorted(self.costs):
+            lines.append(
+                f"  sensor_{index}: {self.asset_counts[index]:5d} assets, cost {self.costs[index]:,.0f}"
+            )
+        return "\n".join(lines)
+
+
+def estimate_evaluation_cost(partition_seconds: int, fan_in: int, n_days: float) -> float:
+    """
+    Estimated per-tick cost of evaluating an asset's automation condition.
+
+    :param partition_seconds: Duration of each partition in seconds (0 means daily).
+    :param fan_in: Number of upstream assets.
+    :param n_days: Length of the partition window in days (fractional for windows that don't
+        span whole days).
+    :return: partition count x upstream fan-in x cron frequency (ticks per day).
+    """
+    partition_seconds = partition_seconds if partition_seconds > 0 else SECONDS_PER_DAY
+    partition_count = max(1.0, n_days * SECONDS_PER_DAY / partition_seconds)
+    cron_frequency = SECONDS_PER_DAY / partition_seconds
+    return partition_count * max(1, fan_in) * cron_frequency
+
+
+def _clusters(names: list[str], deps: list[tuple[str, ...]]) -> list[list[int]]:
+    """Connected components of the dependency edges between the given assets."""
+    position = {name: i for i, name in enumerate(names)}
+    parent = list(range(len(names)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for child, child_deps in enumerate(deps):
+        for dep in child_deps:
+            if dep in position:
+                root_a, root_b = find(child), find(position[dep])
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(names)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+
+def shard_by_cost(
+    names: list[str], deps: list[tuple[str, ...]], costs: list[float], sensor_indexes: range
+) -> dict[str, int]:
+    """
+    Assign assets to sensors, keeping dependency clusters together and balancing total cost.
+
+    Clusters costing more than an even share are split into consecutive runs of at most that
+    share; clusters are then placed largest-first on the cheapest sensor.
+
+    :param names: Asset names.
+    :param deps: Upstream asset names per asset (deps outside ``names`` are ignored).
+    :param costs: Estimated evaluation cost per asset.
+    :param sensor_indexes: Sensor indexes to spread the assets across.
+    :return: Mapping of asset name to sensor index.
+    """
+    costs_array = np.asarray(costs, dtype=np.float64)
+    share = costs_array.sum() / len(sensor_indexes) if len(names) else 0.0
+
+    groups: list[list[int]] = []
+    for cluster in _clusters(names, deps):
+        if costs_array[cluster].sum() <= share:
+            groups.append(cluster)
+            continue
+        current, current_cost = [], 0.0
+        for i in cluster:
+            if current and current_cost + costs_array[i] > share:
+                groups.append(current)
+                current, current_cost = [], 0.0
+            current.append(i)
+            current_cost += costs_array[i]
+        groups.append(current)
+
+    # Largest-first onto the cheapest sensor; ties broken by position for a stable layout
+    groups.sort(key=lambda group: (-costs_array[group].sum(), group[0]))
+    loads = np.zeros(len(sensor_indexes))
+    assignment = {}
+    for group in groups:
+        target = int(np.argmin(loads))
+        loads[target] += costs_array[group].sum()
+        for i in group:
+            assignment[names[i]] = sensor_indexes[target]
+    return assignment
+
+
+def shard_report(
+    location: int, sensor_indexes: range, assets: list, n_days: float
+) -> ShardReport:
+    """
+    Estimated cost per sensor for a location's planned assets.
+
+    :param location: Location number.
+    :param sensor_indexes: Sensor indexes owned by the location.
+    :param assets: ``SourceAssetPlan`` / ``ManagedAssetPlan`` objects of the location.
+    :param n_days: Length of the partition window in days.
+    :return: The per-shard report.
+    """
+    costs = dict.fromkeys(sensor_indexes, 0.0)
+    counts = dict.fromkeys(sensor_indexes, 0)
+    for asset in assets:
+        index = int(asset.tags[SENSOR_INDEX_TAG])
+        costs[index] = costs.get(index, 0.0) + estimate_evaluation_cost(
+            asset.partition_seconds, len(getattr(asset, "deps", ())), n_days
+        )
+        counts[index] = counts.get(index, 0) + 1
+    return ShardReport(location=location, costs=costs, asset_counts=counts)
+
+
+def apply_cost_sharding(plans: dict, n_days: float) -> dict:
+    """
+    Re-tag every planned asset with a cost-balanced sensor index from its location's sensor range.
+
+    :param plans: Mapping of location number to ``LocationPlan``.
+    :param n_days: Length of the partition window in days.
+    :return: New plans with updated ``evaluation_trigger_sensor_index`` tags.
+    """
+    sharded = {}
+    for location, plan in plans.items():
+        assets = [*plan.source_assets, *plan.managed_assets]
+        names = [asset.name for asset in assets]
+        deps = [tuple(getattr(asset, "deps", ())) for asset in assets]
+        costs = [
+            estimate_evaluation_cost(asset.partition_seconds, len(asset_deps), n_days)
+            for asset, asset_deps in zip(assets, deps)
+        ]
+        assignment = shard_by_cost(names, deps, costs, plan.sensor_indexes)
+
+        def retag(asset):
+            return dataclasses.replace(
+                asset, tags={**asset.tags, SENSOR_INDEX_TAG: str(assignment[asset.name])}
+            )
+
+        sharded[location] = dataclasses.replace(
+            plan,
+            source_assets=tuple(retag(asset) for asset in plan.source_assets),
+            managed_assets=tuple(retag(asset) for asset in plan.managed_assets),
+        )
+    return sharded
+
+
+def main() -> None:
+    from deep_purple_shared.utils.asset_planner import plan_locations
+    from deep_purple_shared.utils.dag_snapshot import load_dag
+    from deep_purple_shared.utils.performance_config import PERF_CONFIG
+
+    parser = argparse.ArgumentParser(description="Compare sensor sharding layouts.")
+    parser.add_argument("--n-days", type=int, default=PERF_CONFIG.n_days)
+    args = parser.parse_args()
+
+    plans = plan_locations(
+        load_dag(PERF_CONFIG.dag_path),
+        PERF_CONFIG.location_assignment,
+        PERF_CONFIG.planner_mode,
+        sensor_layout=PERF_CONFIG.sensor_layout,
+    )
+    for sharding, sharded in (
+        (SensorSharding.ROUND_ROBIN, plans),
+        (SensorSharding.COST, apply_cost_sharding(plans, args.n_days)),
+    ):
+        print(f"== {sharding.value}")
+        for location, plan in sharded.items():
+            report = shard_report(
+                location,
+                plan.sensor_indexes,
+                [*plan.source_assets, *plan.managed_assets],
+                args.n_days,
+            )
+            print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
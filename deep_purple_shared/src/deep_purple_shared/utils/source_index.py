@@ -0,0 +1,98 @@
+"""
+Index of the source assets planned so far and the location that owns each of them.
+
+A source dataset is referenced by many managed datasets but becomes exactly one asset, created by the
+first dataset that references it. The original generators de-duplicated sources with a Python list
+searched with ``not in`` for every parent of every dataset, which is quadratic in the number of
+sources. This index is keyed by the snapshot's interned name ids: de-duplication is an array lookup,
+queries by asset name go through a hash map, and one index can be shared by every planner run over
+the same snapshot.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+from deep_purple_shared.utils.dag_snapshot import DagSnapshot
+
+
+@dataclass
+class SourceAssetIndex:
+    """
+    Owning location per source, keyed by interned name id.
+
+    :param names: Interned dataset names, as ``DagSnapshot.decoded_names``.
+    :param owners: Owning location per interned name; 0 while the name hasn't been planned as a source.
+    """
+
+    names: Sequence[str]
+    owners: np.ndarray
+
+    @classmethod
+    def empty(cls, dag: DagSnapshot) -> "SourceAssetIndex":
+        """
+        :param dag: The DAG snapshot the index is keyed by.
+        :return: An index with no sources planned.
+        """
+        return cls(names=dag.decoded_names, owners=np.zeros(len(dag.names), dtype=np.int16))
+
+    @cached_property
+    def _ids_by_asset_name(self) -> dict[str, int]:
+        return {name.replace(".", "_"): i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.owners))
+
+    def __contains__(self, asset_name: str) -> bool:
+        return self.location_of(asset_name) is not None
+
+    def id_of(self, asset_name: str) -> int | None:
+        """
+        :param asset_name: Asset name (dots replaced with underscores).
+        :return: Interned name id, or None if the name isn't part of the snapshot.
+        """
+        return self._ids_by_asset_name.get(asset_name)
+
+    def is_planned(self, name_ids: np.ndarray) -> np.ndarray:
+        """
+        :param name_ids: Interned name ids.
+        :return: Whether each name has already been planned as a source.
+        """
+        return self.owners[name_ids] > 0
+
+    def add(self, name_ids: np.ndarray | int, locations: np.ndarray | int) -> None:
+        """
+        Record the owning location of newly planned sources.
+
+        :param name_ids: Interned name ids.
+        :param locations: Owning location per id.
+        """
+        self.owners[name_ids] = locations
+
+    def location_of(self, asset_name: str) -> int | None:
+        """
+        :param asset_name: Asset name (dots replaced with underscores).
+        :return: Location owning the source asset, or None if it isn't a planned source.
+        """
+        name_id = self.id_of(asset_name)
+        if name_id is None or not self.owners[name_id]:
+            return None
+        return int(self.owners[name_id])
+
+    def sources_in(self, location: int) -> list[str]:
+        """
+        :param location: Location number.
+        :return: Asset names of the sources owned by the location, in interned name order.
+        """
+        return [
+            self.names[i].replace(".", "_") for i in np.flatnonzero(self.owners == location).tolist()
+        ]
+
+    def counts(self) -> dict[int, int]:
+        """
+        :return: Number of sources owned per location.
+        """
+        locations, counts = np.unique(self.owners[self.owners > 0], return_counts=True)
+        return dict(zip(locations.tolist(), counts.tolist()))
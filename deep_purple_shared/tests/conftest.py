@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+
+from deep_purple_shared.utils.dag_generator import fit_profile, generate_dag, write_dag_csv
+from deep_purple_shared.utils.dag_snapshot import DagSnapshot, load_dag
+
+# The shared package reads the DAG copied next to it at deploy time; tests use the repository's copy
+DAG_CSV_PATH = Path(__file__).parents[2] / "dag.csv.gz"
+
+
+@pytest.fixture(scope="session")
+def dag() -> DagSnapshot:
+    return load_dag(DAG_CSV_PATH)
+
+
+@pytest.fixture(scope="session")
+def small_dag_csv(dag, tmp_path_factory) -> Path:
+    # Planning one row at a time over the full DAG is slow; a generated DAG has the same shape
+    frame = generate_dag(fit_profile(dag), num_datasets=2000)
+    return write_dag_csv(frame, tmp_path_factory.mktemp("dag") / "dag.csv.gz")
@@ -0,0 +1,60 @@
+"""
+The reference, vectorized and streaming planners must split the DAG into identical location plans.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from deep_purple_shared.utils.asset_planner import iter_location_plan, plan_locations
+from deep_purple_shared.utils.dag_snapshot import DagSnapshot, load_dag
+from deep_purple_shared.utils.graph_partitioner import partition_dag, write_assignment_table
+from deep_purple_shared.utils.location_utils import AssignmentStrategy, LocationAssignment
+from deep_purple_shared.utils.performance_config import PerformanceConfig, PlannerMode
+
+
+def _assignment(
+    dag: DagSnapshot, strategy: AssignmentStrategy, num_locations: int, table_dir: Path
+) -> LocationAssignment:
+    if strategy != AssignmentStrategy.TABLE:
+        return LocationAssignment(num_locations=num_locations, strategy=strategy)
+    table_path = write_assignment_table(
+        partition_dag(dag, num_locations), table_dir / "dag.assignment.npz", num_locations
+    )
+    return LocationAssignment(num_locations=num_locations, strategy=strategy, table_path=table_path)
+
+
+@pytest.mark.parametrize("num_locations", [3, 5, 7])
+@pytest.mark.parametrize("strategy", list(AssignmentStrategy))
+def test_reference_and_vectorized_plans_match(dag, strategy, num_locations, tmp_path):
+    assignment = _assignment(dag, strategy, num_locations, tmp_path)
+
+    reference = plan_locations(dag, assignment, PlannerMode.REFERENCE)
+    vectorized = plan_locations(dag, assignment, PlannerMode.VECTORIZED)
+
+    assert list(reference) == list(range(1, num_locations + 1))
+    assert list(vectorized) == list(reference)
+    assert sum(len(plan.managed_assets) for plan in reference.values()) > 0
+    for location, plan in reference.items():
+        # Missing MAX_CONTIGUOUS_SECONDS are NaN, so plans are compared through their JSON
+        assert vectorized[location].to_json() == plan.to_json()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 777, 5000])
+def test_streaming_and_batch_plans_match(small_dag_csv, chunk_size):
+    config = PerformanceConfig(DEEP_PURPLE_DAG_PATH=small_dag_csv, DEEP_PURPLE_PLAN_CACHE=False)
+    plans = plan_locations(load_dag(small_dag_csv), config.location_assignment, config.planner_mode)
+    assert sum(len(plan.managed_assets) for plan in plans.values()) > 0
+
+    for location, plan in plans.items():
+        streamed = [
+            asset
+            for chunk in iter_location_plan(location, chunk_size, small_dag_csv, config)
+            for asset in chunk
+        ]
+        expected = {asset.name: asset for asset in (*plan.source_assets, *plan.managed_assets)}
+        assert len(streamed) == len(expected)
+        # Missing MAX_CONTIGUOUS_SECONDS are NaN, so assets are compared through their repr
+        assert {asset.name: repr(asset) for asset in streamed} == {
+            name: repr(asset) for name, asset in expected.items()
+        }
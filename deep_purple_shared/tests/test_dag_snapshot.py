@@ -0,0 +1,67 @@
+"""
+Snapshots must round-trip the compiled DAG and be rebuilt when they no longer match the CSV.
+"""
+
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from deep_purple_shared.utils.dag_generator import fit_profile, generate_dag, write_dag_csv
+from deep_purple_shared.utils.dag_snapshot import (
+    MANIFEST_FILE,
+    build_snapshot,
+    compile_dag_csv,
+    file_sha256,
+    load_dag,
+    read_snapshot,
+    snapshot_path_for,
+)
+
+
+def _assert_same_dag(actual, expected):
+    for name in ("names", "parent_indptr", "parent_indices", "partition_seconds", "queue_binding"):
+        np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+    np.testing.assert_array_equal(actual.max_contiguous_seconds, expected.max_contiguous_seconds)
+    np.testing.assert_array_equal(actual.start_date, expected.start_date)
+    assert actual.queue_bindings == expected.queue_bindings
+    assert actual.source_sha256 == expected.source_sha256
+
+
+@pytest.mark.parametrize(
+    ("file_name", "snapshot_name"),
+    [
+        ("dag.csv", "dag.snapshot"),
+        ("dag.csv.gz", "dag.snapshot"),
+        ("dag.v2.csv.gz", "dag.v2.snapshot"),
+    ],
+)
+def test_snapshot_round_trip(small_dag_csv, file_name, snapshot_name, tmp_path):
+    csv_path = tmp_path / file_name
+    data = small_dag_csv.read_bytes()
+    csv_path.write_bytes(data if file_name.endswith(".gz") else gzip.decompress(data))
+    compiled = compile_dag_csv(csv_path)
+
+    snapshot_path = build_snapshot(csv_path)
+
+    assert snapshot_path == snapshot_path_for(csv_path) == tmp_path / snapshot_name
+    _assert_same_dag(read_snapshot(snapshot_path), compiled)
+    _assert_same_dag(load_dag(csv_path), compiled)
+
+
+@pytest.mark.parametrize("change", ["csv", "format_version"])
+def test_stale_snapshot_is_rebuilt(dag, small_dag_csv, change, tmp_path):
+    csv_path = tmp_path / "dag.csv.gz"
+    csv_path.write_bytes(small_dag_csv.read_bytes())
+    snapshot_path = build_snapshot(csv_path)
+    if change == "csv":
+        write_dag_csv(generate_dag(fit_profile(dag), num_datasets=500, seed=1), csv_path)
+    else:
+        manifest = json.loads((snapshot_path / MANIFEST_FILE).read_text())
+        (snapshot_path / MANIFEST_FILE).write_text(json.dumps({**manifest, "format_version": 0}))
+
+    loaded = load_dag(csv_path)
+
+    _assert_same_dag(loaded, compile_dag_csv(csv_path))
+    assert read_snapshot(snapshot_path).source_sha256 == file_sha256(csv_path)
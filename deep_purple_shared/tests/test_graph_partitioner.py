@@ -0,0 +1,26 @@
+"""
+Graph-aware partitions must cut fewer dependency edges than hashing while keeping locations balanced.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from deep_purple_shared.utils.graph_partitioner import (
+    build_asset_graph,
+    count_cut_edges,
+    partition_dag,
+)
+
+
+@pytest.mark.parametrize("num_locations", [3, 5, 7])
+def test_partition_cuts_fewer_edges_than_hashing(dag, num_locations):
+    result = partition_dag(dag, num_locations, imbalance=0.05)
+
+    sizes = np.bincount(result.locations, minlength=num_locations + 1)[1:]
+    target = len(result.asset_names) / num_locations
+    assert sizes.max() <= math.ceil(target * 1.05)
+    assert sizes.min() >= math.floor(target * 0.95)
+    assert result.cut_edges < result.hash_cut_edges
+    assert result.cut_edges == count_cut_edges(build_asset_graph(dag), result.locations)
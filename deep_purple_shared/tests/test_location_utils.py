@@ -0,0 +1,73 @@
+"""
+Location assignments must agree between their batch and per-name lookups, and adding a location
+must only move the assets each strategy promises to move.
+"""
+
+import pytest
+
+from deep_purple_shared.utils.graph_partitioner import partition_dag, write_assignment_table
+from deep_purple_shared.utils.location_utils import (
+    AssignmentStrategy,
+    LocationAssignment,
+    get_asset_location,
+    get_asset_locations,
+    plan_rebalance,
+)
+
+
+@pytest.fixture(scope="module")
+def asset_names(dag) -> list[str]:
+    return list(dag.decoded_names)
+
+
+@pytest.mark.parametrize("num_locations", [1, 3, 5, 6, 7])
+def test_batch_and_single_locations_match(asset_names, num_locations):
+    batch = get_asset_locations(asset_names, num_locations)
+
+    assert len(batch) == len(asset_names)
+    assert batch.tolist() == [get_asset_location(name, num_locations) for name in asset_names]
+
+
+@pytest.mark.parametrize("num_locations", [3, 5])
+@pytest.mark.parametrize("strategy", [AssignmentStrategy.CONSISTENT, AssignmentStrategy.TABLE])
+def test_assignment_batch_and_single_locations_match(
+    dag, asset_names, strategy, num_locations, tmp_path
+):
+    table_path = None
+    if strategy == AssignmentStrategy.TABLE:
+        partition = partition_dag(dag, num_locations)
+        table_path = write_assignment_table(partition, tmp_path / "dag.assignment.npz", num_locations)
+    assignment = LocationAssignment(
+        num_locations=num_locations, strategy=strategy, table_path=table_path
+    )
+
+    batch = assignment.locations(asset_names)
+
+    assert batch.tolist() == [assignment.location(name) for name in asset_names]
+    assert set(batch.tolist()) == set(range(1, num_locations + 1))
+    if strategy == AssignmentStrategy.TABLE:
+        assert assignment.locations(partition.asset_names).tolist() == partition.locations.tolist()
+
+
+@pytest.mark.parametrize(
+    ("strategy", "min_moved", "max_moved"),
+    [
+        # Hashing modulo the count moves 5 in 6 assets; the ring only moves the new location's share
+        (AssignmentStrategy.MODULO, 0.75, 0.9),
+        (AssignmentStrategy.CONSISTENT, 0.1, 0.25),
+    ],
+)
+def test_rebalance_adding_a_location(asset_names, strategy, min_moved, max_moved):
+    current = LocationAssignment(num_locations=5, strategy=strategy)
+    proposed = LocationAssignment(num_locations=6, strategy=strategy)
+
+    report = plan_rebalance(asset_names, current, proposed)
+
+    assert min_moved < report.moved_fraction < max_moved
+    assert sum(report.current_counts.values()) == sum(report.proposed_counts.values()) == len(
+        asset_names
+    )
+    for name, before, after in report.moves[:100]:
+        assert (current.location(name), proposed.location(name)) == (before, after)
+        if strategy == AssignmentStrategy.CONSISTENT:
+            assert after == 6
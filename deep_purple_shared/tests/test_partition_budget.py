@@ -0,0 +1,57 @@
+"""
+The partition budget must coarsen the finest assets until the DAG fits, and never refine an asset.
+"""
+
+import math
+
+import pytest
+
+from deep_purple_shared.utils.asset_planner import plan_locations
+from deep_purple_shared.utils.location_utils import LocationAssignment
+from deep_purple_shared.utils.partition_budget import (
+    GRANULARITIES,
+    apply_partition_budget,
+    effective_partition_seconds,
+    partition_count,
+)
+from deep_purple_shared.utils.sensor_sharding import SECONDS_PER_DAY
+
+WINDOW_SECONDS = 3 * SECONDS_PER_DAY
+
+
+def _assets(plans: dict) -> list:
+    return [
+        asset
+        for location in sorted(plans)
+        for asset in (*plans[location].source_assets, *plans[location].managed_assets)
+    ]
+
+
+@pytest.fixture(scope="module")
+def plans(dag) -> dict:
+    return plan_locations(dag, LocationAssignment(num_locations=5))
+
+
+@pytest.mark.parametrize("budget", [10**9, 500_000, 100_000, 10])
+def test_budget_coarsens_to_fit(plans, budget):
+    budgeted, report = apply_partition_budget(plans, budget, WINDOW_SECONDS)
+
+    before, after = _assets(plans), _assets(budgeted)
+    assert [asset.name for asset in after] == [asset.name for asset in before]
+    assert report.partitions_after == sum(
+        partition_count(asset.partition_seconds, WINDOW_SECONDS) for asset in after
+    )
+    if report.partitions_before <= budget:
+        assert after == before
+    elif report.within_budget:
+        assert report.partitions_after <= budget
+    else:
+        assert set(report.assets_after) == {GRANULARITIES[-1]}
+
+    for old, new in zip(before, after):
+        assert new.partition_seconds >= effective_partition_seconds(old.partition_seconds)
+        max_contiguous_seconds = getattr(new, "max_contiguous_seconds", math.nan)
+        if new.partition_seconds != old.partition_seconds and not math.isnan(max_contiguous_seconds):
+            assert new.max_partitions_per_run == max(
+                1, int(max_contiguous_seconds / new.partition_seconds)
+            )
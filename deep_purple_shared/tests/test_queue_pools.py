@@ -0,0 +1,44 @@
+"""
+Every queue gets its own concurrency pool, sized and loaded from the planned managed assets.
+"""
+
+import pytest
+
+from deep_purple_shared.utils.asset_planner import plan_locations
+from deep_purple_shared.utils.constants import QUEUE_BINDING_TAG
+from deep_purple_shared.utils.location_utils import LocationAssignment
+from deep_purple_shared.utils.performance_config import PartitionMode, PerformanceConfig
+from deep_purple_shared.utils.queue_pools import plan_queue_load, pool_for_queue
+from deep_purple_shared.utils.sensor_sharding import SECONDS_PER_DAY
+
+
+@pytest.mark.parametrize(
+    ("queue_binding", "pool"),
+    [("", None), ("etl", "deep_purple_etl"), ("etl-high.v2", "deep_purple_etl_high_v2")],
+)
+def test_pool_for_queue(queue_binding, pool):
+    assert pool_for_queue(queue_binding) == pool
+
+
+@pytest.mark.parametrize("partition_mode", [PartitionMode.DAILY, PartitionMode.TPS_EFFECTIVE])
+def test_plan_queue_load(dag, partition_mode):
+    plans = plan_locations(dag, LocationAssignment(num_locations=5))
+    queues = [
+        managed.tags.get(QUEUE_BINDING_TAG, "")
+        for plan in plans.values()
+        for managed in plan.managed_assets
+    ]
+    config = PerformanceConfig(
+        DEEP_PURPLE_PARTITION_MODE=partition_mode, DEEP_PURPLE_QUEUE_POOL_DEFAULT_LIMIT=2
+    )
+
+    load = plan_queue_load(plans, 3 * SECONDS_PER_DAY, config)
+
+    assert set(load) == set(filter(None, queues))
+    for queue, stats in load.items():
+        assert stats["assets"] == queues.count(queue)
+        assert (stats["pool"], stats["limit"]) == (pool_for_queue(queue), 2)
+        if partition_mode == PartitionMode.DAILY:
+            assert stats["partitions"] == 3 * stats["assets"]
+        else:
+            assert stats["partitions"] >= 3 * stats["assets"]
@@ -0,0 +1,59 @@
+"""
+Sensor ranges must be contiguous, cover every sensor once, and follow each location's asset count
+when sized by assets.
+"""
+
+import pytest
+
+from deep_purple_shared.utils.sensor_layout import SensorLayout, round_robin_index
+
+
+def _assert_contiguous(ranges: dict[int, range], num_locations: int) -> None:
+    assert list(ranges) == list(range(1, num_locations + 1))
+    start = 0
+    for sensor_indexes in ranges.values():
+        assert sensor_indexes.start == start and len(sensor_indexes) >= 1
+        start = sensor_indexes.stop
+
+
+@pytest.mark.parametrize(
+    ("num_locations", "sensor_count", "sizes"),
+    [(5, 50, [10] * 5), (5, 7, [2, 2, 1, 1, 1]), (3, 3, [1, 1, 1]), (7, 64, [10] + [9] * 6)],
+)
+def test_fixed_sensor_count(num_locations, sensor_count, sizes):
+    ranges = SensorLayout(num_locations=num_locations, sensor_count=sensor_count).ranges()
+
+    _assert_contiguous(ranges, num_locations)
+    assert [len(sensor_indexes) for sensor_indexes in ranges.values()] == sizes
+    assert ranges[num_locations].stop == sensor_count
+
+
+@pytest.mark.parametrize(
+    ("asset_counts", "sizes"),
+    [({1: 1000, 2: 1001, 3: 0}, [1, 2, 1]), ({1: 5000, 2: 250, 3: 2999}, [5, 1, 3])],
+)
+def test_sensor_count_scales_with_assets(asset_counts, sizes):
+    layout = SensorLayout(num_locations=3, assets_per_sensor=1000)
+
+    ranges = layout.ranges(asset_counts)
+
+    assert layout.scales_with_assets
+    _assert_contiguous(ranges, 3)
+    assert [len(sensor_indexes) for sensor_indexes in ranges.values()] == sizes
+    with pytest.raises(ValueError):
+        layout.ranges()
+
+
+def test_fewer_sensors_than_locations_is_rejected():
+    with pytest.raises(ValueError):
+        SensorLayout(num_locations=5, sensor_count=4)
+
+
+@pytest.mark.parametrize("sensor_indexes", [range(0, 1), range(10, 20), range(3, 5)])
+def test_round_robin_cycles_through_the_range(sensor_indexes):
+    ordinals = range(1, 3 * len(sensor_indexes) + 1)
+
+    indexes = [round_robin_index(sensor_indexes, ordinal) for ordinal in ordinals]
+
+    assert set(indexes) == set(sensor_indexes)
+    assert all(indexes.count(index) == 3 for index in sensor_indexes)
@@ -0,0 +1,49 @@
+"""
+Cost-based sharding must keep every asset in its location's sensor range and balance the estimated
+cost across sensors at least as well as round-robin.
+"""
+
+import pytest
+
+from deep_purple_shared.utils.asset_planner import plan_locations
+from deep_purple_shared.utils.constants import SENSOR_INDEX_TAG
+from deep_purple_shared.utils.location_utils import LocationAssignment
+from deep_purple_shared.utils.sensor_sharding import apply_cost_sharding, shard_by_cost, shard_report
+
+
+@pytest.fixture(scope="module")
+def plans(dag) -> dict:
+    return plan_locations(dag, LocationAssignment(num_locations=5))
+
+
+@pytest.mark.parametrize("num_sensors", [1, 3, 10])
+def test_independent_assets_are_spread_evenly(num_sensors):
+    names = [f"managed_{i}" for i in range(100)]
+
+    assignment = shard_by_cost(names, [()] * len(names), [1.0] * len(names), range(num_sensors))
+
+    counts = [list(assignment.values()).count(index) for index in range(num_sensors)]
+    assert max(counts) - min(counts) <= 1
+
+
+def test_cheap_dependency_clusters_stay_together():
+    names = ["a", "b", "c", "d"]
+    deps = [(), ("a",), (), ("c",)]
+
+    assignment = shard_by_cost(names, deps, [1.0, 1.0, 1.0, 1.0], range(2))
+
+    assert assignment["a"] == assignment["b"] != assignment["c"] == assignment["d"]
+
+
+@pytest.mark.parametrize("n_days", [1, 3, 7.5])
+def test_cost_sharding_balances_plans(plans, n_days):
+    sharded = apply_cost_sharding(plans, n_days)
+
+    for location, plan in sharded.items():
+        assets = [*plan.source_assets, *plan.managed_assets]
+        original = [*plans[location].source_assets, *plans[location].managed_assets]
+        assert [asset.name for asset in assets] == [asset.name for asset in original]
+        assert all(int(asset.tags[SENSOR_INDEX_TAG]) in plan.sensor_indexes for asset in assets)
+        cost = shard_report(location, plan.sensor_indexes, assets, n_days)
+        round_robin = shard_report(location, plan.sensor_indexes, original, n_days)
+        assert cost.imbalance <= round_robin.imbalance